@@ -3,13 +3,63 @@ Main application module for the Todo List app.
 """
 
 import tkinter as tk
-from tkinter import messagebox, Toplevel
-from typing import List
-from datetime import datetime
+from tkinter import messagebox
+from dataclasses import replace
+from datetime import date, datetime, timedelta
+from typing import List, Optional
+import queue
 import re
+import threading
+import time
+import uuid
 
-from models import Task
-from storage import load_tasks, save_tasks
+from models import (INSERT, INSERT_MANY, REMOVE, REMOVE_MANY, RESET, UPDATE,
+                    UPDATE_MANY, ObservableTaskList, Task, TaskChange,
+                    parse_date_ordinal)
+from bulk_add import MAX_REPORTED_ERRORS, BulkAddDialog, parse_lines
+from calendar_view import MonthCalendar
+from history import DELETE_EDIT, INSERT_EDIT, UPDATE_EDIT, CommandHistory, Edit
+from search import TaskSearchIndex
+from storage import CorruptTaskFileError, iter_tasks
+import sync
+from virtual_list import VirtualTaskList
+from writer import BackgroundWriter
+
+
+# Task file; use a .db path (see sqlite_storage.py) for the SQLite backend
+TASKS_FILE = "tareas.json"
+
+# How often (ms) the UI checks the background writer for save errors
+WRITER_POLL_MS = 250
+
+# Tasks handed from the loader thread to the UI at a time
+LOAD_CHUNK_SIZE = 2000
+
+# How often (ms) the UI picks up loaded tasks, and the time (s) it may
+# spend adding them per pass before yielding to the event loop
+LOAD_POLL_MS = 20
+LOAD_BUDGET_S = 0.015
+
+# How often (ms) the UI checks whether a running sync has finished
+SYNC_POLL_MS = 200
+
+# Shift bit of a Tk key event's state (Caps Lock is a different bit)
+SHIFT_MASK = 0x1
+
+# Accepted due date input
+DATE_PATTERN = re.compile(r'^\d{2}/\d{2}/\d{4}$')
+
+# Quick filters of the task list
+FILTER_ALL = "todas"
+FILTER_PENDING = "pendientes"
+FILTER_COMPLETED = "completadas"
+FILTER_OVERDUE = "vencidas"
+QUICK_FILTERS = [
+    (FILTER_ALL, "Todas"),
+    (FILTER_PENDING, "Pendientes"),
+    (FILTER_COMPLETED, "Hechas"),
+    (FILTER_OVERDUE, "Vencidas"),
+]
 
 
 class TodoApp:
@@ -24,18 +74,44 @@ class TodoApp:
         """
         self.root = root
         self.root.title("📝 Mi Lista de Tareas")
-        self.root.geometry("500x400")
+        self.root.geometry("560x520")
         self.root.configure(bg='#f0f0f0')
         
         # Task storage
-        self.tasks: List[Task] = []
-        
-        # Create UI components
+        self.tasks = ObservableTaskList()
+        self.search_index = TaskSearchIndex(self.tasks)
+        self.history = CommandHistory()
+        # Task index of each visible row, or None when nothing is filtered
+        self.view: Optional[List[int]] = None
+        self.today = date.today().toordinal()
+        self.writer = BackgroundWriter(TASKS_FILE)
+        self.loading = False
+        # Supabase sync, when configured (see sync.py); local changes are
+        # queued from the start and pushed on the next sync
+        self.sync_config = (sync.config_from_env()
+                            if sync.sync_supported(TASKS_FILE) else None)
+        self.sync = sync.TaskSync(TASKS_FILE) if self.sync_config else None
+        self.syncing = False
+        
+        # Create UI components; the list view follows changes to the tasks
         self._create_widgets()
+        self.tasks.subscribe(self._on_tasks_changed)
+        if self.sync:
+            self.sync.track(self.tasks)
         
-        # Load existing tasks
+        # Load existing tasks in the background; the window shows right away
         self._load_tasks()
-        self._update_display()
+        
+        # Surface background save errors and flush pending writes on exit
+        self.root.protocol("WM_DELETE_WINDOW", self._on_close)
+        
+        # Undo / redo
+        self.root.bind('<Control-z>', self._on_undo_key)
+        self.root.bind('<Control-Z>', self._on_undo_key)
+        self.root.bind('<Control-y>', self._on_redo_key)
+        self.root.bind('<Control-Y>', self._on_redo_key)
+        self._poll_writer_errors()
+        self._schedule_day_change()
     
     def _create_widgets(self) -> None:
         """Create and configure all UI widgets."""
@@ -109,9 +185,12 @@ class TodoApp:
         )
         calendar_button.pack(side='left', padx=5)
         
-        # Add button
-        add_button = tk.Button(
-            input_frame, 
+        # Add buttons
+        add_frame = tk.Frame(input_frame, bg='#f0f0f0')
+        add_frame.pack(pady=10)
+        
+        self.add_button = tk.Button(
+            add_frame, 
             text="➕ Agregar", 
             command=self._add_task,
             bg='#27ae60',
@@ -122,45 +201,125 @@ class TodoApp:
             padx=20,
             pady=5
         )
-        add_button.pack(pady=10)
+        self.add_button.pack(side='left', padx=5)
+        
+        self.paste_button = tk.Button(
+            add_frame, 
+            text="📋 Pegar varias", 
+            command=self._open_bulk_add,
+            bg='#16a085',
+            fg='white',
+            font=("Arial", 11, "bold"),
+            relief='raised',
+            borderwidth=2,
+            padx=20,
+            pady=5
+        )
+        self.paste_button.pack(side='left', padx=5)
         
-        # Tasks listbox
+        # Search entry and quick filters
+        search_frame = tk.Frame(self.root, bg='#f0f0f0')
+        search_frame.pack(padx=20, fill='x')
+        
+        tk.Label(
+            search_frame, 
+            text="🔍 Buscar:", 
+            font=("Arial", 10, "bold"),
+            bg='#f0f0f0',
+            fg='#2c3e50'
+        ).pack(side='left')
+        
+        self.search_var = tk.StringVar()
+        self.search_var.trace_add('write', lambda *args: self._on_filter_changed())
+        tk.Entry(
+            search_frame, 
+            textvariable=self.search_var,
+            width=20, 
+            font=("Arial", 10),
+            relief='solid',
+            borderwidth=2
+        ).pack(side='left', padx=5, fill='x', expand=True)
+        
+        self.filter_var = tk.StringVar(value=FILTER_ALL)
+        for value, label in QUICK_FILTERS:
+            tk.Radiobutton(
+                search_frame,
+                text=label,
+                value=value,
+                variable=self.filter_var,
+                command=self._on_filter_changed,
+                indicatoron=0,
+                font=("Arial", 9),
+                bg='#f0f0f0',
+                selectcolor='#bbdefb',
+                padx=6
+            ).pack(side='left', padx=1)
+        
+        # Tasks list
         list_frame = tk.Frame(self.root, bg='#f0f0f0')
         list_frame.pack(pady=10, padx=20, fill='both', expand=True)
         
-        tk.Label(
+        self.count_label = tk.Label(
             list_frame, 
             text="Tareas:", 
             font=("Arial", 10, "bold"),
             bg='#f0f0f0',
             fg='#2c3e50'
-        ).pack(anchor='w')
-        
-        # Listbox with scrollbar
-        scrollbar = tk.Scrollbar(list_frame)
-        scrollbar.pack(side='right', fill='y')
+        )
+        self.count_label.pack(anchor='w')
         
-        self.tasks_listbox = tk.Listbox(
-            list_frame, 
-            yscrollcommand=scrollbar.set,
+        # Virtualized list: only the visible rows are drawn
+        self.task_list = VirtualTaskList(
+            list_frame,
+            render=self._render_row,
             height=12,
             font=("Arial", 10),
+            selectmode='extended',
             relief='solid',
             borderwidth=2
         )
-        self.tasks_listbox.pack(side='left', fill='both', expand=True)
-        scrollbar.config(command=self.tasks_listbox.yview)
+        self.task_list.pack(fill='both', expand=True)
         
-        # Bind double-click to toggle task status
-        self.tasks_listbox.bind('<Double-Button-1>', 
-                               lambda e: self._toggle_task())
+        # Double-click (or Return) toggles task status; Ctrl/Shift+click
+        # select several tasks for the bulk actions below
+        self.task_list.bind('<<RowActivated>>', 
+                            lambda e: self._toggle_task())
         
         # Control buttons frame
         control_frame = tk.Frame(self.root, bg='#f0f0f0')
         control_frame.pack(pady=10)
         
+        # Bulk complete / reopen buttons
+        self.complete_button = tk.Button(
+            control_frame, 
+            text="✅ Completar", 
+            command=lambda: self._set_selected_status(True),
+            bg='#27ae60',
+            fg='white',
+            font=("Arial", 10, "bold"),
+            relief='raised',
+            borderwidth=2,
+            padx=15,
+            pady=5
+        )
+        self.complete_button.pack(side='left', padx=5)
+        
+        self.reopen_button = tk.Button(
+            control_frame, 
+            text="↩️ Reabrir", 
+            command=lambda: self._set_selected_status(False),
+            bg='#1976D2',
+            fg='white',
+            font=("Arial", 10, "bold"),
+            relief='raised',
+            borderwidth=2,
+            padx=15,
+            pady=5
+        )
+        self.reopen_button.pack(side='left', padx=5)
+        
         # Delete button
-        delete_button = tk.Button(
+        self.delete_button = tk.Button(
             control_frame, 
             text="🗑️ Eliminar", 
             command=self._delete_task,
@@ -172,33 +331,43 @@ class TodoApp:
             padx=15,
             pady=5
         )
-        delete_button.pack(side='left', padx=5)
+        self.delete_button.pack(side='left', padx=5)
+        
+        # Sync button, only when Supabase is configured
+        self.sync_button = tk.Button(
+            control_frame, 
+            text="🔄 Sincronizar", 
+            command=self._start_sync,
+            bg='#8e44ad',
+            fg='white',
+            font=("Arial", 10, "bold"),
+            relief='raised',
+            borderwidth=2,
+            padx=15,
+            pady=5
+        )
+        if self.sync_config:
+            self.sync_button.pack(side='left', padx=5)
     
-    def _validate_date(self, date_str: str) -> bool:
+    def _parse_date(self, date_str: str) -> Optional[int]:
         """
-        Validate date format DD/MM/YYYY.
+        Validate a DD/MM/YYYY date and parse it into an ordinal.
         
         Args:
             date_str: Date string to validate
             
         Returns:
-            True if valid, False otherwise
+            The date ordinal, or None if invalid
         """
-        if not date_str.strip():
-            return True  # Empty date is allowed
-            
-        pattern = r'^\d{2}/\d{2}/\d{4}$'
-        if not re.match(pattern, date_str):
-            return False
-            
-        try:
-            datetime.strptime(date_str, "%d/%m/%Y")
-            return True
-        except ValueError:
-            return False
+        if not DATE_PATTERN.match(date_str):
+            return None
+        return parse_date_ordinal(date_str)
     
     def _add_task(self) -> None:
         """Add a new task to the list with overdue detection."""
+        if self.loading:
+            return
+        
         task_text = self.task_entry.get().strip()
         date_str = self.date_entry.get().strip()
         
@@ -207,35 +376,29 @@ class TodoApp:
             messagebox.showwarning("Advertencia", "Por favor ingresa una tarea.")
             return
         
-        # Validate date format
-        if date_str and not self._validate_date(date_str):
-            messagebox.showerror("Error", 
-                               "Formato de fecha inválido. Usa DD/MM/YYYY")
-            return
+        # Validate date format (parsed once, reused for the overdue check)
+        due = None
+        if date_str:
+            due = self._parse_date(date_str)
+            if due is None:
+                messagebox.showerror("Error", 
+                                   "Formato de fecha inválido. Usa DD/MM/YYYY")
+                return
         
         # Check if task is overdue
-        is_overdue = False
-        if date_str:
-            try:
-                from datetime import timedelta
-                fecha_tarea = datetime.strptime(date_str, "%d/%m/%Y").date()
-                hoy = datetime.now().date()
-                is_overdue = fecha_tarea < hoy
-            except ValueError:
-                # If date parsing fails, continue without overdue check
-                pass
+        is_overdue = due is not None and due < self.today
         
         # Create new task
         new_task = Task(
             text=task_text,
             date_str=date_str if date_str else None,
-            status=False
+            status=False,
+            id=str(uuid.uuid4()) if self.sync else None
         )
         
         # Add to list and save
-        self.tasks.append(new_task)
-        self._save_tasks()
-        self._update_display()
+        self._execute(Edit(INSERT_EDIT, [len(self.tasks)], [new_task], [due]),
+                      "agregar tarea")
         
         # Clear inputs
         self.task_entry.delete(0, tk.END)
@@ -249,81 +412,117 @@ class TodoApp:
         else:
             messagebox.showinfo("Éxito", f"Tarea agregada: {task_text}")
     
-    def _delete_task(self) -> None:
-        """Delete the selected task with confirmation."""
-        selection = self.tasks_listbox.curselection()
-        if not selection:
-            messagebox.showwarning("Advertencia", "Selecciona una tarea para eliminar.")
+    def _open_bulk_add(self) -> None:
+        """Open the dialog to paste several tasks at once."""
+        if self.loading:
             return
+        BulkAddDialog(self.root, on_submit=self._add_tasks_bulk)
+    
+    def _add_tasks_bulk(self, text: str) -> bool:
+        """
+        Add every task of a pasted text as one change.
         
-        index = selection[0]
-        task = self.tasks[index]
+        All lines are validated first; if any is invalid nothing is added.
+        Otherwise the tasks are appended with one edit, so they are saved
+        in one batch, redrawn once and undone in one step.
         
-        if messagebox.askyesno("Confirmar", f"¿Eliminar la tarea: '{task.text}'?"):
-            del self.tasks[index]
-            self._save_tasks()
-            self._update_display()
-            messagebox.showinfo("Éxito", "Tarea eliminada correctamente.")
+        Args:
+            text: Pasted lines (see bulk_add.parse_lines)
+            
+        Returns:
+            True if the tasks were added
+        """
+        if self.loading:
+            return False
+        
+        parsed = parse_lines(text)
+        if parsed.errors:
+            lines = "\n".join(f"Línea {number}: {message}"
+                              for number, message in parsed.errors[:MAX_REPORTED_ERRORS])
+            more = len(parsed.errors) - MAX_REPORTED_ERRORS
+            if more > 0:
+                lines += f"\n... y {more} más"
+            messagebox.showerror("Error", f"Corrige estas líneas:\n{lines}")
+            return False
+        if not parsed.tasks:
+            messagebox.showwarning("Advertencia", "Por favor ingresa al menos una tarea.")
+            return False
+        
+        tasks = parsed.tasks
+        if self.sync:
+            tasks = [replace(task, id=str(uuid.uuid4())) for task in tasks]
+        start = len(self.tasks)
+        self._execute(Edit(INSERT_EDIT, list(range(start, start + len(tasks))),
+                           tasks, parsed.dues),
+                      f"agregar {len(tasks)} tareas")
+        
+        overdue = sum(1 for due, task in zip(parsed.dues, tasks)
+                      if due is not None and due < self.today and not task.status)
+        message = f"{len(tasks)} tareas agregadas"
+        if overdue:
+            message += f" ({overdue} vencidas)"
+        messagebox.showinfo("Éxito", message)
+        return True
     
-    def _open_calendar(self) -> None:
-        """Open a calendar popup to select a date."""
-        def select_date():
-            selected_date = f"{day_var.get()}/{month_var.get()}/{year_var.get()}"
-            self.date_entry.delete(0, tk.END)
-            self.date_entry.insert(0, selected_date)
-            calendar_window.destroy()
-        
-        # Create calendar window
-        calendar_window = Toplevel(self.root)
-        calendar_window.title("Seleccionar Fecha")
-        calendar_window.geometry("300x200")
-        calendar_window.resizable(False, False)
-        calendar_window.configure(bg='#f0f0f0')
-        
-        # Center the calendar window
-        calendar_window.transient(self.root)
-        calendar_window.grab_set()
-        
-        # Get current date
-        today = datetime.now()
-        
-        # Create lists for selectors
-        days = [f"{i:02d}" for i in range(1, 32)]
-        months = [f"{i:02d}" for i in range(1, 13)]
-        years = [str(i) for i in range(2020, 2031)]
-        
-        # Variables for selectors
-        day_var = tk.StringVar(value=f"{today.day:02d}")
-        month_var = tk.StringVar(value=f"{today.month:02d}")
-        year_var = tk.StringVar(value=str(today.year))
+    def _selected_task_indices(self) -> List[int]:
+        """Task indexes of the selected rows, ascending."""
+        return [self._task_index(row) for row in self.task_list.curselection()]
+    
+    def _delete_task(self) -> None:
+        """Delete the selected tasks with a single confirmation."""
+        if self.loading:
+            return
         
-        # Title
-        tk.Label(calendar_window, text="Selecciona una fecha:", 
-                 font=("Arial", 12, "bold"), bg='#f0f0f0', fg='#2c3e50').pack(pady=10)
+        indices = self._selected_task_indices()
+        if not indices:
+            messagebox.showwarning("Advertencia", "Selecciona una tarea para eliminar.")
+            return
         
-        # Frame for selectors
-        selector_frame = tk.Frame(calendar_window, bg='#f0f0f0')
-        selector_frame.pack(pady=10)
+        if len(indices) == 1:
+            question = f"¿Eliminar la tarea: '{self.tasks[indices[0]].text}'?"
+        else:
+            question = f"¿Eliminar las {len(indices)} tareas seleccionadas?"
         
-        # Selectors
-        tk.Label(selector_frame, text="Día:", bg='#f0f0f0', fg='#2c3e50').grid(row=0, column=0, padx=5)
-        tk.Label(selector_frame, text="Mes:", bg='#f0f0f0', fg='#2c3e50').grid(row=0, column=1, padx=5)
-        tk.Label(selector_frame, text="Año:", bg='#f0f0f0', fg='#2c3e50').grid(row=0, column=2, padx=5)
+        if messagebox.askyesno("Confirmar", question):
+            label = "eliminar tarea" if len(indices) == 1 else f"eliminar {len(indices)} tareas"
+            self._execute(Edit(DELETE_EDIT, indices), label)
+    
+    def _set_selected_status(self, status: bool) -> None:
+        """
+        Mark every selected task as completed or pending in one pass.
         
-        tk.OptionMenu(selector_frame, day_var, *days).grid(row=1, column=0, padx=5)
-        tk.OptionMenu(selector_frame, month_var, *months).grid(row=1, column=1, padx=5)
-        tk.OptionMenu(selector_frame, year_var, *years).grid(row=1, column=2, padx=5)
+        Args:
+            status: True to complete, False to reopen
+        """
+        if self.loading:
+            return
         
-        # Buttons
-        button_frame = tk.Frame(calendar_window, bg='#f0f0f0')
-        button_frame.pack(pady=20)
+        indices = self._selected_task_indices()
+        if not indices:
+            messagebox.showwarning("Advertencia", "Selecciona al menos una tarea.")
+            return
         
-        tk.Button(button_frame, text="Seleccionar", command=select_date,
-                  bg="#27ae60", fg="white", font=("Arial", 10, "bold"),
-                  relief='raised', borderwidth=2, padx=15, pady=5).pack(side=tk.LEFT, padx=5)
-        tk.Button(button_frame, text="Cancelar", command=calendar_window.destroy,
-                  bg="#D32F2F", fg="white", font=("Arial", 10, "bold"),
-                  relief='raised', borderwidth=2, padx=15, pady=5).pack(side=tk.LEFT, padx=5)
+        changed = [i for i in indices if self.tasks[i].status != status]
+        if not changed:
+            return
+        updated = [replace(self.tasks[i], status=status) for i in changed]
+        action = "completar" if status else "reabrir"
+        self._execute(Edit(UPDATE_EDIT, changed, updated), f"{action} {len(changed)} tareas")
+    
+    def _open_calendar(self) -> None:
+        """Open a month calendar with task counts to select a date."""
+        MonthCalendar(
+            self.root,
+            self.tasks,
+            self.today,
+            on_select=self._set_date,
+            initial=self._parse_date(self.date_entry.get().strip())
+        )
+    
+    def _set_date(self, date_str: str) -> None:
+        """Put a date chosen in the calendar into the date entry."""
+        self.date_entry.delete(0, tk.END)
+        self.date_entry.insert(0, date_str)
     
     def _edit_task(self) -> None:
         """
@@ -332,7 +531,7 @@ class TodoApp:
         TODO: Implement edit functionality with dialog window
         """
         # TODO: Add edit task functionality
-        # selection = self.tasks_listbox.curselection()
+        # selection = self.task_list.curselection()
         # if selection:
         #     index = selection[0]
         #     task = self.tasks[index]
@@ -342,70 +541,403 @@ class TodoApp:
     
     def _toggle_task(self) -> None:
         """Toggle the status of the selected task."""
-        selection = self.tasks_listbox.curselection()
+        if self.loading:
+            return
+        
+        selection = self.task_list.curselection()
         if not selection:
             messagebox.showwarning("Advertencia", "Selecciona una tarea.")
             return
         
-        index = selection[0]
-        self.tasks[index].status = not self.tasks[index].status
-        self._save_tasks()
-        self._update_display()
+        index = self._task_index(selection[0])
+        task = self.tasks[index]
+        self._execute(Edit(UPDATE_EDIT, [index], [replace(task, status=not task.status)]),
+                      "cambiar estado")
     
     def _update_display(self) -> None:
-        """Update the listbox display with current tasks and color coding."""
-        self.tasks_listbox.delete(0, tk.END)
-        
-        for task in self.tasks:
-            # Check if task is overdue
-            is_overdue = False
-            if task.date_str and not task.status:
-                try:
-                    fecha_tarea = datetime.strptime(task.date_str, "%d/%m/%Y").date()
-                    hoy = datetime.now().date()
-                    is_overdue = fecha_tarea < hoy
-                except ValueError:
-                    # If date parsing fails, continue without overdue check
-                    pass
-            
-            # Format task display with appropriate icons
-            if task.status:
-                status_icon = "✅"
-            elif is_overdue:
-                status_icon = "🔴"
-            else:
-                status_icon = "🟢"
-            
-            display_text = f"{status_icon} {task.text}"
-            
-            if task.date_str:
-                if is_overdue:
-                    display_text += f" | 📅 {task.date_str} (VENCIDA)"
-                else:
-                    display_text += f" | 📅 {task.date_str}"
-            
-            self.tasks_listbox.insert(tk.END, display_text)
+        """Recompute the filtered rows and redraw the visible ones."""
+        self.view = self._filtered_rows()
+        self.task_list.set_count(len(self.tasks) if self.view is None else len(self.view))
+        self._update_counts()
+    
+    def _filtered_rows(self) -> Optional[List[int]]:
+        """
+        Apply the search text and the quick filter.
+        
+        Returns:
+            Matching task indexes in list order, or None if nothing is
+            filtered
+        """
+        query = self.search_var.get()
+        quick = self.filter_var.get()
+        if quick == FILTER_PENDING:
+            return self.search_index.search(query, completed=False)
+        if quick == FILTER_COMPLETED:
+            return self.search_index.search(query, completed=True)
+        if quick == FILTER_OVERDUE:
+            return self.search_index.search(query, overdue_before=self.today)
+        return self.search_index.search(query)
+    
+    def _on_filter_changed(self) -> None:
+        """Refilter the list after the search text or quick filter changed."""
+        self.task_list.selection_clear()
+        self._update_display()
+    
+    def _task_index(self, row: int) -> int:
+        """Task index shown at a row of the (possibly filtered) list."""
+        return row if self.view is None else self.view[row]
+    
+    def _update_counts(self) -> None:
+        """Show the number of tasks and of overdue tasks."""
+        if self.loading:
+            self.count_label.config(text=f"⏳ Cargando tareas... {len(self.tasks)}")
+            return
+        overdue = self.tasks.overdue_count(self.today)
+        text = f"Tareas: {len(self.tasks)}"
+        if overdue:
+            text += f" ({overdue} vencidas)"
+        if self.view is not None:
+            text += f" · mostrando {len(self.view)}"
+        self.count_label.config(text=text)
+    
+    def _on_tasks_changed(self, change: TaskChange) -> None:
+        """
+        Apply a task change to the affected rows only.
+        
+        While a search or quick filter is active the filter is re-run
+        instead, since the change may add or remove matches.
+        
+        Args:
+            change: Change reported by the task list
+        """
+        if self.view is not None or change.kind in (INSERT_MANY, REMOVE_MANY, RESET):
+            self._on_filter_changed()
+            return
+        if change.kind == UPDATE:
+            self.task_list.refresh_row(change.index)
+        elif change.kind == UPDATE_MANY:
+            self.task_list.refresh()
+        elif change.kind == INSERT:
+            self.task_list.rows_inserted(change.index, change.count)
+        elif change.kind == REMOVE:
+            self.task_list.rows_removed(change.index, change.count)
+        self._update_counts()
+    
+    def _schedule_day_change(self) -> None:
+        """Re-evaluate overdue tasks right after the next midnight."""
+        now = datetime.now()
+        midnight = datetime.combine(now.date() + timedelta(days=1), datetime.min.time())
+        delay_ms = int((midnight - now).total_seconds() * 1000) + 1000
+        self.root.after(delay_ms, self._on_day_change)
+    
+    def _on_day_change(self) -> None:
+        """Move the overdue cutoff to the new day and redraw."""
+        today = date.today().toordinal()
+        if today != self.today:
+            self.today = today
+            self._update_display()
+        self._schedule_day_change()
+    
+    def _render_row(self, row: int) -> tuple:
+        """
+        Build the text and colors of one task row.
+        
+        Args:
+            row: Row of the (possibly filtered) list
             
-            # Color coding based on status and overdue state
-            if task.status:
-                # Completed tasks in light green
-                self.tasks_listbox.itemconfig(tk.END, {'bg': '#d5f4e6', 'fg': '#27ae60'})
-            elif is_overdue:
-                # Overdue tasks in light red
-                self.tasks_listbox.itemconfig(tk.END, {'bg': '#ffebee', 'fg': '#d32f2f'})
+        Returns:
+            (text, background, foreground) of the row
+        """
+        index = self._task_index(row)
+        task = self.tasks[index]
+        
+        # Overdue state comes from the pre-parsed due date
+        is_overdue = self.tasks.is_overdue(index, self.today)
+        
+        # Format task display with appropriate icons
+        if task.status:
+            status_icon = "✅"
+        elif is_overdue:
+            status_icon = "🔴"
+        else:
+            status_icon = "🟢"
+        
+        display_text = f"{status_icon} {task.text}"
+        
+        if task.date_str:
+            if is_overdue:
+                display_text += f" | 📅 {task.date_str} (VENCIDA)"
             else:
-                # Pending tasks in light green
-                self.tasks_listbox.itemconfig(tk.END, {'bg': '#e8f5e8', 'fg': '#2e7d32'})
+                display_text += f" | 📅 {task.date_str}"
+        
+        # Color coding based on status and overdue state
+        if task.status:
+            # Completed tasks in light green
+            return display_text, '#d5f4e6', '#27ae60'
+        if is_overdue:
+            # Overdue tasks in light red
+            return display_text, '#ffebee', '#d32f2f'
+        # Pending tasks in light green
+        return display_text, '#e8f5e8', '#2e7d32'
     
     def _load_tasks(self) -> None:
-        """Load tasks from storage."""
-        self.tasks = load_tasks()
-    
-    def _save_tasks(self) -> None:
-        """Save tasks to storage."""
-        if not save_tasks(self.tasks):
-            messagebox.showerror("Error", 
-                               "No se pudieron guardar las tareas.")
+        """
+        Load tasks from storage on a worker thread.
+        
+        The worker reads and parses the file and hands tasks over in chunks
+        through a queue; the UI adds them to the list from the event loop,
+        so the window stays responsive. Changes are disabled until the
+        whole list is loaded, since journal positions refer to it.
+        """
+        self.loading = True
+        self._set_editing_enabled(False)
+        if self.sync:
+            # Loaded tasks are not local changes
+            self.sync.tracking = False
+        self.tasks.reset([])
+        self.history.clear()
+        
+        self._load_queue: queue.Queue = queue.Queue()
+        self._load_error: Optional[Exception] = None
+        threading.Thread(target=self._load_worker, name="task-loader",
+                         daemon=True).start()
+        self._poll_loaded_tasks()
+    
+    def _load_worker(self) -> None:
+        """Stream tasks from storage into the load queue (worker thread)."""
+        chunk, dues = [], []
+        try:
+            for task in iter_tasks(TASKS_FILE, strict=True):
+                chunk.append(task)
+                dues.append(parse_date_ordinal(task.date_str))
+                if len(chunk) >= LOAD_CHUNK_SIZE:
+                    self._load_queue.put((chunk, dues))
+                    chunk, dues = [], []
+            if chunk:
+                self._load_queue.put((chunk, dues))
+        except CorruptTaskFileError as e:
+            print(f"Error: Cannot load {TASKS_FILE}: {e.cause}")
+            self._load_error = e
+        except Exception as e:
+            print(f"Unexpected error loading {TASKS_FILE}: {e}")
+            self._load_error = e
+        finally:
+            # End of load marker
+            self._load_queue.put(None)
+    
+    def _poll_loaded_tasks(self) -> None:
+        """Add loaded chunks to the list within a small time budget."""
+        deadline = time.perf_counter() + LOAD_BUDGET_S
+        while time.perf_counter() < deadline:
+            try:
+                item = self._load_queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is None:
+                self._finish_loading()
+                return
+            self.tasks.extend(*item)
+        self.root.after(LOAD_POLL_MS, self._poll_loaded_tasks)
+    
+    def _finish_loading(self) -> None:
+        """
+        Enable changes once every task is in the list.
+        
+        If the file could not be read completely, the tasks read so far are
+        shown but changes stay disabled: saving them would replace the file
+        with that partial list.
+        """
+        if self._load_error is not None:
+            messagebox.showerror(
+                "Error",
+                f"No se pudo leer {TASKS_FILE} completo ({self._load_error}).\n"
+                "Se muestran las tareas que se pudieron leer, pero los cambios "
+                "quedan desactivados para no sobrescribir el archivo.")
+            self.count_label.config(text=f"⚠ Solo lectura: {len(self.tasks)} tareas leídas")
+            return
+        self.loading = False
+        self._set_editing_enabled(True)
+        if self.sync:
+            self.sync.tracking = True
+        self._update_counts()
+    
+    def _set_editing_enabled(self, enabled: bool) -> None:
+        """Enable or disable the buttons that change tasks."""
+        state = 'normal' if enabled else 'disabled'
+        for button in (self.add_button, self.paste_button, self.complete_button,
+                       self.reopen_button, self.delete_button, self.sync_button):
+            button.config(state=state)
+    
+    def _record(self, operations: List[dict]) -> None:
+        """
+        Persist a change through the background writer as one batch.
+        
+        Args:
+            operations: Journal operations, in the order to apply them
+        """
+        self.writer.submit_many(operations)
+    
+    def _execute(self, edit: Edit, label: str) -> None:
+        """
+        Apply an undoable change to the tasks and persist it.
+        
+        Args:
+            edit: Change to apply
+            label: Description for the undo history
+        """
+        self._record(self.history.execute(self.tasks, edit, label))
+    
+    def _typing(self) -> bool:
+        """Whether the focus is in a Text widget, which has its own undo."""
+        # Entry widgets have no undo, so there Ctrl+Z undoes task changes
+        return isinstance(self.root.focus_get(), tk.Text)
+    
+    def _on_undo_key(self, event: tk.Event) -> None:
+        """Ctrl+Z undoes and Ctrl+Shift+Z redoes, with or without Caps Lock."""
+        if self._typing():
+            return
+        if event.state & SHIFT_MASK:
+            self._redo()
+        else:
+            self._undo()
+    
+    def _on_redo_key(self, event: tk.Event) -> None:
+        """Ctrl+Y redoes."""
+        if not self._typing():
+            self._redo()
+    
+    def _undo(self) -> None:
+        """Undo the last change (Ctrl+Z)."""
+        if self.loading:
+            return
+        result = self.history.undo(self.tasks)
+        if result is None:
+            self.root.bell()
+            return
+        self._record(result[1])
+    
+    def _redo(self) -> None:
+        """Redo the last undone change (Ctrl+Y / Ctrl+Shift+Z)."""
+        if self.loading:
+            return
+        result = self.history.redo(self.tasks)
+        if result is None:
+            self.root.bell()
+            return
+        self._record(result[1])
+    
+    def _poll_writer_errors(self) -> None:
+        """Show save errors reported by the background writer."""
+        errors = self.writer.poll_errors()
+        if errors:
+            messagebox.showerror("Error", errors[-1])
+        self.root.after(WRITER_POLL_MS, self._poll_writer_errors)
+    
+    def _start_sync(self) -> None:
+        """
+        Sync the tasks with Supabase without blocking the UI.
+        
+        Network calls run on a worker thread; merging the pulled changes
+        and capturing the ones to push happen here, between them.
+        """
+        if self.loading or self.syncing or not self.sync:
+            return
+        self.syncing = True
+        self.sync_button.config(state='disabled', text="🔄 Sincronizando...")
+        
+        try:
+            # Tasks from before sync was set up need an id to be pushed
+            operations = self.sync.ensure_ids(self.tasks)
+        except Exception as e:
+            self._end_sync(e)
+            return
+        if operations:
+            self._record(operations)
+            self.history.clear()
+        
+        self._sync_queue: queue.Queue = queue.Queue()
+        threading.Thread(target=self._sync_fetch_worker, name="task-sync",
+                         daemon=True).start()
+        self._poll_sync()
+    
+    def _sync_fetch_worker(self) -> None:
+        """Sign in if needed and pull remote changes (worker thread)."""
+        try:
+            if self.sync.client is None:
+                client, user_id = sync.connect(**self.sync_config)
+                self.sync.attach(client, user_id)
+            self._sync_queue.put(('fetched', self.sync.fetch()))
+        except Exception as e:
+            self._sync_queue.put(('error', e))
+    
+    def _sync_send_worker(self, batch: sync.PushBatch, result: sync.SyncResult) -> None:
+        """Push local changes (worker thread)."""
+        try:
+            self.sync.send(batch)
+            self._sync_queue.put(('sent', batch, result))
+        except Exception as e:
+            self._sync_queue.put(('error', e))
+    
+    def _poll_sync(self) -> None:
+        """Continue a running sync when its worker step has finished."""
+        try:
+            step, *args = self._sync_queue.get_nowait()
+        except queue.Empty:
+            self.root.after(SYNC_POLL_MS, self._poll_sync)
+            return
+        
+        if step == 'fetched':
+            try:
+                result = self.sync.apply(self.tasks, args[0])
+            except Exception as e:
+                self._end_sync(e)
+                return
+            if result.operations:
+                self._record(result.operations)
+                # Remote changes moved tasks under the recorded edits
+                self.history.clear()
+            try:
+                batch = self.sync.prepare_push(self.tasks)
+            except Exception as e:
+                self._end_sync(e)
+                return
+            threading.Thread(target=self._sync_send_worker, args=(batch, result),
+                             name="task-sync", daemon=True).start()
+            self.root.after(SYNC_POLL_MS, self._poll_sync)
+            return
+        
+        if step == 'error':
+            self._end_sync(args[0])
+            return
+        batch, result = args
+        try:
+            self.sync.commit(batch)
+        except Exception as e:
+            self._end_sync(e)
+            return
+        self._end_sync()
+        messagebox.showinfo(
+            "Sincronización",
+            f"Recibidas: {result.pulled}  Enviadas: {len(batch.rows) + len(batch.deleted)}"
+            + (f"  Conflictos (gana el cambio local): {result.conflicts}"
+               if result.conflicts else ""))
+    
+    def _end_sync(self, error: Optional[Exception] = None) -> None:
+        """Re-enable the sync button, reporting the error a sync stopped on."""
+        self.syncing = False
+        self.sync_button.config(state='normal', text="🔄 Sincronizar")
+        if error is not None:
+            messagebox.showerror("Error", f"No se pudo sincronizar: {error}")
+    
+    def _on_close(self) -> None:
+        """Flush pending writes before closing the window."""
+        if not self.writer.flush(timeout=5):
+            if not messagebox.askyesno(
+                    "Error",
+                    "No se pudieron guardar todos los cambios. ¿Salir de todos modos?"):
+                return
+        self.writer.close(timeout=1)
+        self.root.destroy()
     
     def run(self) -> None:
         """Start the application main loop."""
@@ -1,6 +1,8 @@
 import streamlit as st
 from datetime import datetime, date, timedelta, time
 import calendar
+from bisect import insort
+from time import monotonic
 from supabase import create_client, Client
 import plotly.express as px
 import plotly.graph_objects as go
@@ -548,21 +550,118 @@ def iniciar_sesion(email, password):
 
 def cerrar_sesion():
     supabase.auth.sign_out()
-    for key in ['logged_in', 'user_id', 'user_email', 'user_nombre', 'mostrar_popup', 'tarea_seleccionada', 'editar_tarea_id']:
+    for key in ['logged_in', 'user_id', 'user_email', 'user_nombre', 'mostrar_popup', 'tarea_seleccionada', 'editar_tarea_id', 'tareas_cache', 'lista_tareas', 'resumen_cache']:
         if key in st.session_state:
             del st.session_state[key]
 
+# Repositorio de tareas por sesión
+# Las tareas se descargan una vez y todas las vistas (barra lateral, lista,
+# calendario, estadísticas) leen de memoria. agregar/actualizar/eliminar
+# parchean la copia local con la fila que devuelve Supabase, y tras
+# TAREAS_CACHE_TTL segundos se vuelve a descargar para ver los cambios
+# hechos desde otros dispositivos.
+TAREAS_CACHE_TTL = 60
+
+# Columnas que usa cada vista. Las vistas que leen de obtener_tareas
+# comparten una sola descarga con la unión de sus columnas (más id y fecha,
+# que usa el caché); la lista paginada pide solo las suyas.
+COLUMNAS_VISTA = {
+    'calendario': {'fecha', 'categoria'},
+    'lista': {'id', 'texto', 'categoria', 'fecha', 'hora', 'zona_horaria', 'urgente', 'completada'},
+}
+VISTAS_CACHE = ['calendario']
+COLUMNAS_CACHE = {'id', 'fecha'}.union(*(COLUMNAS_VISTA[v] for v in VISTAS_CACHE))
+
+def _select_columnas(columnas):
+    """Lista de columnas para select(), en orden fijo"""
+    return ",".join(sorted(columnas))
+
+def _clave_fecha(tarea):
+    """Orden de obtener_tareas: por fecha ascendente, sin fecha al final"""
+    return (tarea.get('fecha') is None, tarea.get('fecha') or '')
+
+def _cache_tareas():
+    """Retorna el caché de la sesión si sigue vigente, o None"""
+    cache = st.session_state.get('tareas_cache')
+    if (cache is None or cache['user_id'] != st.session_state.get('user_id')
+            or monotonic() - cache['cargado_en'] > TAREAS_CACHE_TTL):
+        return None
+    return cache
+
+def invalidar_cache_tareas():
+    """Fuerza a descargar las tareas y el resumen en la próxima lectura"""
+    st.session_state.pop('tareas_cache', None)
+    st.session_state.pop('resumen_cache', None)
+
+def obtener_resumen():
+    """Retorna los contadores y estadísticas de las tareas del usuario
+    
+    Los calcula Postgres con la función resumen_tareas (ver
+    estadisticas_tareas.sql), así la barra lateral y el dashboard reciben
+    una respuesta pequeña en lugar de todas las tareas. Se guarda en la
+    sesión como las tareas, y cualquier cambio lo descarta.
+    """
+    hoy = today_scl()
+    clave = (st.session_state['user_id'], hoy)
+    cache = st.session_state.get('resumen_cache')
+    if (cache is not None and cache['clave'] == clave
+            and monotonic() - cache['cargado_en'] <= TAREAS_CACHE_TTL):
+        return cache['datos']
+    inicio_semana = hoy - timedelta(days=hoy.weekday())
+    try:
+        datos = supabase.rpc('resumen_tareas', {
+            'p_desde': inicio_semana.isoformat(),
+            'p_hasta': (inicio_semana + timedelta(days=6)).isoformat(),
+            'p_hoy': hoy.isoformat()
+        }).execute().data
+    except Exception as e:
+        st.error(f"No se pudo calcular el resumen de tareas: {e}. "
+                 "Verifica que ejecutaste estadisticas_tareas.sql en el SQL Editor de Supabase.")
+        return None
+    st.session_state['resumen_cache'] = {'clave': clave, 'datos': datos, 'cargado_en': monotonic()}
+    return datos
+
 # CRUD de tareas
-def obtener_tareas():
+def obtener_tareas(vista):
+    """Retorna las tareas del usuario con las columnas de una vista
+    
+    Se sirven desde el caché de la sesión si está vigente; si no, se
+    descargan una vez con las columnas de todas las vistas del caché.
+    """
+    if vista not in VISTAS_CACHE:
+        raise ValueError(f"Vista sin caché: {vista}")
+    cache = _cache_tareas()
+    if cache is not None:
+        return list(cache['datos'])
     try:
         response = supabase.table('tareas')\
-            .select("*")\
+            .select(_select_columnas(COLUMNAS_CACHE))\
             .eq('user_id', st.session_state['user_id'])\
             .order('fecha', desc=False)\
             .execute()
-        return response.data
     except:
         return []
+    st.session_state['tareas_cache'] = {
+        'user_id': st.session_state['user_id'],
+        'datos': response.data,
+        'cargado_en': monotonic()
+    }
+    return list(response.data)
+
+def _reemplazar_en_cache(tarea_id, fila=None):
+    """Quita una tarea del caché y, si se da, inserta su versión nueva en orden
+    
+    El resumen no se puede parchear así, se descarta.
+    """
+    st.session_state.pop('resumen_cache', None)
+    cache = _cache_tareas()
+    if cache is None:
+        return
+    datos = [t for t in cache['datos'] if t['id'] != tarea_id]
+    if fila is not None:
+        fila = {columna: fila.get(columna) for columna in COLUMNAS_CACHE}
+        insort(datos, fila, key=_clave_fecha)
+    cache['datos'] = datos
 
 def agregar_tarea(texto, categoria, fecha, urgente, hora=None, zona_horaria=None):
     try:
@@ -576,6 +675,10 @@ def agregar_tarea(texto, categoria, fecha, urgente, hora=None, zona_horaria=None
             'urgente': urgente,
             'completada': False
         }).execute()
+        for fila in response.data:
+            _reemplazar_en_cache(fila['id'], fila)
+        # Su posición en la lista depende del orden; se recarga la primera página
+        st.session_state.pop('lista_tareas', None)
         return True
     except Exception as e:
         st.error(f"Error: {e}")
@@ -588,8 +691,12 @@ def actualizar_tarea(tarea_id, updates):
             .eq('id', tarea_id)\
             .eq('user_id', st.session_state['user_id'])\
             .execute()
+        for fila in response.data:
+            _reemplazar_en_cache(fila['id'], fila)
+            _actualizar_en_lista(fila['id'], fila)
         return True
     except:
+        invalidar_cache_tareas()
         return False
 
 def eliminar_tarea(tarea_id):
@@ -599,95 +706,207 @@ def eliminar_tarea(tarea_id):
             .eq('id', tarea_id)\
             .eq('user_id', st.session_state['user_id'])\
             .execute()
+        _reemplazar_en_cache(tarea_id)
+        _actualizar_en_lista(tarea_id)
         return True
     except:
+        invalidar_cache_tareas()
         return False
 
-def buscar_tareas(termino_busqueda, categoria_filtro=None, estado_filtro=None, fecha_filtro=None):
-    """Busca tareas basado en criterios múltiples"""
-    tareas = obtener_tareas()
+def _escapar_like(termino):
+    """Escapa los comodines de LIKE para buscar el texto tal cual"""
+    return termino.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+
+# Orden de la lista: criterio -> columnas (columna, descendente). El id
+# desempata en el mismo sentido, así cada tarea tiene una posición fija, la
+# paginación por cursor no repite ni salta tareas y los índices de
+# paginacion_tareas.sql sirven en ambos sentidos. Como en Postgres, los
+# nulos van al final en orden ascendente y al principio en descendente.
+ORDENES_TAREAS = {
+    "Fecha (Más reciente)": [('fecha', True)],
+    "Fecha (Más antigua)": [('fecha', False)],
+    "Alfabético (A-Z)": [('texto_lower', False)],
+    "Alfabético (Z-A)": [('texto_lower', True)],
+    "Estado (Pendientes primero)": [('completada', False)],
+    "Estado (Completadas primero)": [('completada', True)],
+    "Urgentes primero": [('urgente', True)],
+}
+ORDEN_POR_DEFECTO = "Fecha (Más antigua)"
+
+# Tareas por página de la lista
+TAMANOS_PAGINA = [25, 50, 100, 200]
+
+def _claves_orden(criterio_ordenamiento):
+    """Columnas de orden de un criterio, con el id como desempate"""
+    claves = ORDENES_TAREAS.get(criterio_ordenamiento, ORDENES_TAREAS[ORDEN_POR_DEFECTO])
+    return claves + [('id', claves[0][1])]
+
+def _valor_postgrest(valor):
+    """Formatea un valor para un filtro lógico (or/and) de PostgREST"""
+    if isinstance(valor, bool):
+        return 'true' if valor else 'false'
+    texto = str(valor).replace('\\', '\\\\').replace('"', '\\"')
+    return f'"{texto}"'
+
+def _filtro_despues_de(claves, cursor):
+    """Condición para las filas que van después del cursor en el orden dado
     
-    if not tareas:
-        return []
+    Compara la tupla de columnas de orden como lo hace ORDER BY, incluidos
+    los nulos: (a, b) > (x, y) equivale a a > x o (a = x y b > y).
+    """
+    terminos = []
+    iguales = []
+    for columna, descendente in claves:
+        valor = cursor[columna]
+        if valor is None:
+            # Nulos al final en ascendente: nada va después de ellos
+            posterior = f"{columna}.not.is.null" if descendente else None
+            igual = f"{columna}.is.null"
+        else:
+            valor = _valor_postgrest(valor)
+            if descendente:
+                posterior = f"{columna}.lt.{valor}"
+            else:
+                posterior = f"or({columna}.gt.{valor},{columna}.is.null)"
+            igual = f"{columna}.eq.{valor}"
+        if posterior:
+            terminos.append(f"and({','.join(iguales + [posterior])})" if iguales else posterior)
+        iguales.append(igual)
+    return ",".join(terminos)
+
+def _consultar_tareas(termino, categoria_filtro, estado_filtro, fecha_filtro,
+                      criterio_ordenamiento, limite=None, despues_de=None):
+    """Filtra, ordena y pagina las tareas en Supabase
+    
+    Los filtros se traducen a la consulta (ilike, eq, gte/lte, lt), así solo
+    viajan las tareas que coinciden y se usan los índices en lugar de
+    filtrar todas las tareas en Python.
+    """
+    claves = _claves_orden(criterio_ordenamiento)
+    columnas = COLUMNAS_VISTA['lista'] | {columna for columna, _ in claves}
+    consulta = supabase.table('tareas')\
+        .select(_select_columnas(columnas))\
+        .eq('user_id', st.session_state['user_id'])
     
-    resultados = []
-    termino_lower = termino_busqueda.lower() if termino_busqueda else ""
+    # Búsqueda por texto, sin distinguir mayúsculas
+    if termino:
+        # PostgREST trata '*' como '%'; se pide con '_' y se confirma después
+        consulta = consulta.ilike('texto', f"%{_escapar_like(termino).replace('*', '_')}%")
     
-    for tarea in tareas:
-        # Búsqueda por texto (título y descripción)
-        texto_match = True
-        if termino_lower:
-            texto_tarea = f"{tarea.get('texto', '')} {tarea.get('descripcion', '')}".lower()
-            texto_match = termino_lower in texto_tarea
-        
-        # Filtro por categoría
-        categoria_match = True
-        if categoria_filtro and categoria_filtro != "Todas":
-            categoria_match = tarea.get('categoria') == categoria_filtro
-        
-        # Filtro por estado
-        estado_match = True
-        if estado_filtro is not None:
-            estado_match = tarea.get('completada', False) == estado_filtro
-        
-        # Filtro por fecha
-        fecha_match = True
-        if fecha_filtro:
-            if fecha_filtro == "Hoy":
-                hoy = today_scl().isoformat()
-                fecha_match = tarea.get('fecha') == hoy
-            elif fecha_filtro == "Esta semana":
-                hoy = today_scl()
-                inicio_semana = hoy - timedelta(days=hoy.weekday())
-                fin_semana = inicio_semana + timedelta(days=6)
-                fecha_tarea = datetime.fromisoformat(tarea.get('fecha', '1900-01-01')).date()
-                fecha_match = inicio_semana <= fecha_tarea <= fin_semana
-            elif fecha_filtro == "Vencidas":
-                hoy = today_scl().isoformat()
-                fecha_match = tarea.get('fecha') and tarea.get('fecha') < hoy and not tarea.get('completada', False)
-        
-        if texto_match and categoria_match and estado_match and fecha_match:
-            resultados.append(tarea)
+    # Filtro por categoría
+    if categoria_filtro and categoria_filtro != "Todas":
+        consulta = consulta.eq('categoria', categoria_filtro)
     
-    return resultados
+    # Filtro por estado
+    if estado_filtro is not None:
+        consulta = consulta.eq('completada', estado_filtro)
+    
+    # Filtro por fecha
+    if fecha_filtro:
+        hoy = today_scl()
+        if fecha_filtro == "Hoy":
+            consulta = consulta.eq('fecha', hoy.isoformat())
+        elif fecha_filtro == "Esta semana":
+            inicio_semana = hoy - timedelta(days=hoy.weekday())
+            fin_semana = inicio_semana + timedelta(days=6)
+            consulta = consulta.gte('fecha', inicio_semana.isoformat())\
+                .lte('fecha', fin_semana.isoformat())
+        elif fecha_filtro == "Vencidas":
+            consulta = consulta.lt('fecha', hoy.isoformat()).eq('completada', False)
+    
+    # Orden estable y cursor (keyset) en lugar de OFFSET
+    if despues_de:
+        consulta = consulta.or_(_filtro_despues_de(claves, despues_de))
+    for columna, descendente in claves:
+        consulta = consulta.order(columna, desc=descendente)
+    if limite:
+        consulta = consulta.limit(limite)
+    return consulta.execute().data
 
-def ordenar_tareas(tareas, criterio_ordenamiento):
-    """Ordena las tareas según el criterio especificado"""
-    if not tareas:
+def _confirmar_termino(tareas, termino):
+    """Descarta las coincidencias de '_' que no tienen '*' en el texto"""
+    if '*' not in termino:
         return tareas
+    termino_lower = termino.lower()
+    return [t for t in tareas if termino_lower in t.get('texto', '').lower()]
+
+def _cargar_pagina(lista, tamano, despues_de=None):
+    """Descarga la página que sigue al cursor y la agrega a la lista"""
+    filtros = lista['filtros']
+    claves = _claves_orden(lista['criterio'])
+    try:
+        filas = _consultar_tareas(*filtros, lista['criterio'], limite=tamano + 1,
+                                  despues_de=despues_de)
+    except Exception as e:
+        st.error(f"Error: {e}")
+        lista['hay_mas'] = False
+        return
+    lista['hay_mas'] = len(filas) > tamano
+    filas = filas[:tamano]
+    if filas:
+        lista['cursor'] = {columna: filas[-1].get(columna) for columna, _ in claves}
+    # Una tarea cambiada después de cargarla puede volver a aparecer más adelante
+    ids = {t['id'] for t in lista['tareas']}
+    lista['tareas'].extend(t for t in _confirmar_termino(filas, filtros[0]) if t['id'] not in ids)
+
+def lista_tareas_paginada(termino_busqueda, categoria_filtro, estado_filtro, fecha_filtro,
+                          criterio_ordenamiento, tamano):
+    """Retorna la lista paginada de la pestaña de tareas
     
-    if criterio_ordenamiento == "Fecha (Más reciente)":
-        return sorted(tareas, key=lambda x: x.get('fecha', ''), reverse=True)
-    elif criterio_ordenamiento == "Fecha (Más antigua)":
-        return sorted(tareas, key=lambda x: x.get('fecha', ''), reverse=False)
-    elif criterio_ordenamiento == "Alfabético (A-Z)":
-        return sorted(tareas, key=lambda x: x.get('texto', '').lower())
-    elif criterio_ordenamiento == "Alfabético (Z-A)":
-        return sorted(tareas, key=lambda x: x.get('texto', '').lower(), reverse=True)
-    elif criterio_ordenamiento == "Estado (Completadas primero)":
-        return sorted(tareas, key=lambda x: x.get('completada', False), reverse=True)
-    elif criterio_ordenamiento == "Estado (Pendientes primero)":
-        return sorted(tareas, key=lambda x: x.get('completada', False), reverse=False)
-    elif criterio_ordenamiento == "Urgentes primero":
-        return sorted(tareas, key=lambda x: x.get('urgente', False), reverse=True)
+    Las páginas ya cargadas se guardan en la sesión, así un rerun no
+    descarga nada mientras no cambien los filtros ni el orden; tras
+    TAREAS_CACHE_TTL segundos se recargan las mismas filas en una consulta.
+    """
+    termino = termino_busqueda.strip() if termino_busqueda else ""
+    filtros = (termino, categoria_filtro, estado_filtro, fecha_filtro)
+    lista = st.session_state.get('lista_tareas')
+    if (lista is None or lista['user_id'] != st.session_state['user_id']
+            or lista['filtros'] != filtros or lista['criterio'] != criterio_ordenamiento
+            or monotonic() - lista['cargada_en'] > TAREAS_CACHE_TTL):
+        cargadas = len(lista['tareas']) if lista and lista['filtros'] == filtros \
+            and lista['criterio'] == criterio_ordenamiento else 0
+        lista = {
+            'user_id': st.session_state['user_id'],
+            'filtros': filtros,
+            'criterio': criterio_ordenamiento,
+            'tareas': [],
+            'cursor': None,
+            'hay_mas': False,
+            'cargada_en': monotonic()
+        }
+        _cargar_pagina(lista, max(tamano, cargadas))
+        st.session_state['lista_tareas'] = lista
+    return lista
+
+def cargar_mas_tareas(tamano):
+    """Agrega a la lista la página siguiente"""
+    lista = st.session_state.get('lista_tareas')
+    if lista and lista['hay_mas']:
+        _cargar_pagina(lista, tamano, despues_de=lista['cursor'])
+
+def _actualizar_en_lista(tarea_id, fila=None):
+    """Reemplaza (o quita) una tarea de la lista paginada sin moverla
+    
+    El cursor no cambia, así las páginas siguientes siguen donde quedaron.
+    """
+    lista = st.session_state.get('lista_tareas')
+    if lista is None:
+        return
+    if fila is None:
+        lista['tareas'] = [t for t in lista['tareas'] if t['id'] != tarea_id]
     else:
-        return tareas
+        lista['tareas'] = [fila if t['id'] == tarea_id else t for t in lista['tareas']]
 
-def generar_estadisticas_avanzadas(tareas):
-    """Genera estadísticas avanzadas y gráficos para las tareas"""
-    if not tareas:
+def generar_estadisticas_avanzadas(resumen):
+    """Genera estadísticas avanzadas y gráficos a partir de obtener_resumen()"""
+    if not resumen or not resumen['total']:
         return None, None, None, None, None
     
-    # Convertir a DataFrame para análisis
-    df = pd.DataFrame(tareas)
-    df['fecha'] = pd.to_datetime(df['fecha'], errors='coerce')
-    df['completada'] = df['completada'].fillna(False)
-    
     # 1. Gráfico de tareas por categoría
-    categoria_counts = df['categoria'].value_counts()
+    por_categoria = resumen['por_categoria']
     fig_categorias = px.pie(
-        values=categoria_counts.values,
-        names=categoria_counts.index,
+        values=[c['total'] for c in por_categoria],
+        names=[c['categoria'] for c in por_categoria],
         title="📊 Distribución por Categorías",
         color_discrete_sequence=px.colors.qualitative.Set3
     )
@@ -704,12 +923,11 @@ def generar_estadisticas_avanzadas(tareas):
     dias_semana = [inicio_semana + timedelta(days=i) for i in range(7)]
     nombres_dias = ['Lun', 'Mar', 'Mié', 'Jue', 'Vie', 'Sáb', 'Dom']
     
+    por_dia = {d['fecha']: d for d in resumen['por_dia']}
     tareas_por_dia = []
     for dia in dias_semana:
-        tareas_dia = df[df['fecha'].dt.date == dia]
-        completadas = len(tareas_dia[tareas_dia['completada'] == True])
-        total = len(tareas_dia)
-        tareas_por_dia.append({'dia': dia, 'completadas': completadas, 'total': total})
+        conteo = por_dia.get(dia.isoformat(), {'completadas': 0, 'total': 0})
+        tareas_por_dia.append({'dia': dia, 'completadas': conteo['completadas'], 'total': conteo['total']})
     
     df_semana = pd.DataFrame(tareas_por_dia)
     df_semana['dia_nombre'] = nombres_dias
@@ -737,32 +955,13 @@ def generar_estadisticas_avanzadas(tareas):
     )
     
     # 3. Métricas de productividad
-    total_tareas = len(df)
-    tareas_completadas = len(df[df['completada'] == True])
-    tareas_pendientes = total_tareas - tareas_completadas
+    total_tareas = resumen['total']
+    tareas_completadas = resumen['completadas']
+    tareas_pendientes = resumen['pendientes']
     porcentaje_completado = (tareas_completadas / total_tareas * 100) if total_tareas > 0 else 0
     
-    # Tareas vencidas
-    hoy_str = today_scl().isoformat()
-    tareas_vencidas = len(df[(df['fecha'].dt.date < today_scl()) & (df['completada'] == False)])
-    
-    # Tareas urgentes
-    tareas_urgentes = len(df[df.get('urgente', False) == True])
-    
     # 4. Gráfico de tendencia mensual (simplificado)
-    df['mes_str'] = df['fecha'].dt.strftime('%Y-%m')  # Formato string simple
-    tendencia_data = []
-    
-    for mes in df['mes_str'].unique():
-        tareas_mes = df[df['mes_str'] == mes]
-        completadas = len(tareas_mes[tareas_mes['completada'] == True])
-        pendientes = len(tareas_mes[tareas_mes['completada'] == False])
-        
-        tendencia_data.append({
-            'mes': mes,
-            'completadas': completadas,
-            'pendientes': pendientes
-        })
+    tendencia_data = resumen['por_mes']
     
     if tendencia_data:
         df_tendencia = pd.DataFrame(tendencia_data)
@@ -795,8 +994,10 @@ def generar_estadisticas_avanzadas(tareas):
         'tareas_completadas': tareas_completadas,
         'tareas_pendientes': tareas_pendientes,
         'porcentaje_completado': porcentaje_completado,
-        'tareas_vencidas': tareas_vencidas,
-        'tareas_urgentes': tareas_urgentes
+        'tareas_vencidas': resumen['vencidas'],
+        'tareas_urgentes': resumen['urgentes'],
+        'tareas_urgentes_pendientes': resumen['urgentes_pendientes'],
+        'categoria_mas_comun': por_categoria[0]['categoria'] if por_categoria else "N/A"
     }
     
     return fig_categorias, fig_semana, fig_tendencia, metricas, df_semana
@@ -889,10 +1090,10 @@ else:
         st.markdown("---")
         
         # Estadísticas rápidas
-        tareas = obtener_tareas()
-        total = len(tareas)
-        completadas = sum(1 for t in tareas if t['completada'])
-        pendientes = total - completadas
+        resumen = obtener_resumen()
+        total = resumen['total'] if resumen else 0
+        completadas = resumen['completadas'] if resumen else 0
+        pendientes = resumen['pendientes'] if resumen else 0
         
         st.metric("📊 Total", total)
         col1, col2 = st.columns(2)
@@ -985,16 +1186,6 @@ else:
             if fecha_filtro == "Todas":
                 fecha_filtro = None
         
-        # Aplicar búsqueda y filtros
-        if termino_busqueda or categoria_filtro != "Todas" or estado_filtro is not None or fecha_filtro:
-            tareas = buscar_tareas(termino_busqueda, categoria_filtro, estado_filtro, fecha_filtro)
-            if tareas:
-                st.success(f"🔍 Encontradas {len(tareas)} tarea(s)")
-            else:
-                st.info("🔍 No se encontraron tareas con esos criterios")
-        else:
-            tareas = obtener_tareas()
-        
         # Botón para limpiar filtros y selector de ordenamiento
         col_clear1, col_clear2, col_clear3 = st.columns([1, 1, 1])
         
@@ -1006,23 +1197,28 @@ else:
         with col_clear2:
             criterio_ordenamiento = st.selectbox(
                 "🔄 Ordenar por:",
-                [
-                    "Fecha (Más reciente)",
-                    "Fecha (Más antigua)", 
-                    "Alfabético (A-Z)",
-                    "Alfabético (Z-A)",
-                    "Estado (Pendientes primero)",
-                    "Estado (Completadas primero)",
-                    "Urgentes primero"
-                ],
+                list(ORDENES_TAREAS.keys()),
                 help="Selecciona cómo ordenar las tareas"
             )
         
         with col_clear3:
-            st.write("")  # Espacio vacío para balance
+            tamano_pagina = st.selectbox(
+                "📄 Tareas por página",
+                TAMANOS_PAGINA,
+                index=TAMANOS_PAGINA.index(50),
+                help="Cuántas tareas cargar cada vez"
+            )
         
-        # Aplicar ordenamiento
-        tareas = ordenar_tareas(tareas, criterio_ordenamiento)
+        # Aplicar búsqueda, filtros y orden en Supabase, una página a la vez
+        lista = lista_tareas_paginada(termino_busqueda, categoria_filtro, estado_filtro,
+                                      fecha_filtro, criterio_ordenamiento, tamano_pagina)
+        tareas = lista['tareas']
+        if termino_busqueda or categoria_filtro != "Todas" or estado_filtro is not None or fecha_filtro:
+            if tareas:
+                mas = "+" if lista['hay_mas'] else ""
+                st.success(f"🔍 Encontradas {len(tareas)}{mas} tarea(s)")
+            else:
+                st.info("🔍 No se encontraron tareas con esos criterios")
         
         if tareas:
             st.markdown("### 📌 Tus tareas")
@@ -1085,6 +1281,11 @@ else:
                         if st.button("🗑️", key=f"del_{tarea['id']}"):
                             eliminar_tarea(tarea['id'])
                             st.rerun()
+            
+            if lista['hay_mas']:
+                if st.button(f"⬇️ Cargar {tamano_pagina} más", use_container_width=True):
+                    cargar_mas_tareas(tamano_pagina)
+                    st.rerun()
         else:
             st.info("No hay tareas. ¡Agrega una para empezar!")
     
@@ -1120,7 +1321,7 @@ else:
             </div>
             """, unsafe_allow_html=True)
         
-        tareas = obtener_tareas()
+        tareas = obtener_tareas('calendario')
         
         for semana in cal:
             cols = st.columns(7)
@@ -1149,11 +1350,11 @@ else:
     with tab3:
         st.header("📊 Dashboard de Productividad")
         
-        tareas = obtener_tareas()
+        resumen = obtener_resumen()
         
-        if tareas:
+        if resumen and resumen['total']:
             # Generar estadísticas avanzadas
-            fig_categorias, fig_semana, fig_tendencia, metricas, df_semana = generar_estadisticas_avanzadas(tareas)
+            fig_categorias, fig_semana, fig_tendencia, metricas, df_semana = generar_estadisticas_avanzadas(resumen)
             
             # Métricas principales
             st.subheader("🎯 Resumen General")
@@ -1197,8 +1398,8 @@ else:
             if metricas['tareas_vencidas'] > 0:
                 st.warning(f"⚠️ Tienes {metricas['tareas_vencidas']} tarea(s) vencida(s) que necesitan atención")
             
-            if metricas['tareas_urgentes'] > 0:
-                st.error(f"🚨 Tienes {metricas['tareas_urgentes']} tarea(s) urgente(s) pendientes")
+            if metricas['tareas_urgentes_pendientes'] > 0:
+                st.error(f"🚨 Tienes {metricas['tareas_urgentes_pendientes']} tarea(s) urgente(s) pendientes")
             
             st.markdown("---")
             
@@ -1234,12 +1435,7 @@ else:
                 st.info(f"📈 Tu día más productivo esta semana: **{dia_mas_productivo}**")
                 
                 # Categoría más común
-                if not tareas:
-                    categoria_mas_comun = "N/A"
-                else:
-                    categoria_counts = pd.DataFrame(tareas)['categoria'].value_counts()
-                    categoria_mas_comun = categoria_counts.index[0]
-                st.info(f"🏆 Categoría más activa: **{categoria_mas_comun}**")
+                st.info(f"🏆 Categoría más activa: **{metricas['categoria_mas_comun']}**")
             
             with col_insight2:
                 # Recomendación de productividad
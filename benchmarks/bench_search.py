@@ -0,0 +1,106 @@
+"""
+Benchmark suite for the desktop search box and quick filters.
+
+Builds an indexed ObservableTaskList of increasing size, then times what
+the app does on every keystroke or filter change: a text query combined
+with each quick filter (Todas, Pendientes, Hechas, Vencidas). Results use
+the same JSON report as bench_storage.py, so runs can be compared:
+
+    python benchmarks/bench_search.py --sizes 10000 100000 --output new.json
+    python benchmarks/bench_search.py --compare old.json new.json
+"""
+
+import argparse
+import json
+import os
+import platform
+import sys
+from datetime import date, datetime
+from typing import Dict, List
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bench_storage import compare, generate_tasks, measure  # noqa: E402
+from models import ObservableTaskList  # noqa: E402
+from search import TaskSearchIndex  # noqa: E402
+
+
+DEFAULT_SIZES = [1_000, 10_000, 100_000, 1_000_000]
+
+# Search box contents: empty, a common prefix, and two words
+QUERIES = {'all': "", 'prefix': "comp", 'words': "revisar informe"}
+
+# Synthetic due dates span 2020-2026, so about half are overdue
+TODAY = date(2023, 6, 1).toordinal()
+
+
+def bench_size(count: int, repeat: int) -> Dict[str, dict]:
+    """
+    Run every query and filter combination for one list size.
+
+    Args:
+        count: Number of tasks
+        repeat: Number of timed runs per benchmark
+
+    Returns:
+        Results keyed by "<query>_<filter>"
+    """
+    tasks = ObservableTaskList(generate_tasks(count))
+    index = TaskSearchIndex(tasks)
+    filters = {
+        'todas': {},
+        'pendientes': {'completed': False},
+        'hechas': {'completed': True},
+        'vencidas': {'overdue_before': TODAY},
+    }
+
+    results = {}
+    for query_name, query in QUERIES.items():
+        for filter_name, options in filters.items():
+            results[f"{query_name}_{filter_name}"] = measure(
+                lambda: index.search(query, **options), repeat)
+    return results
+
+
+def run(sizes: List[int], repeat: int) -> dict:
+    """Run the suite and return a JSON-serializable report."""
+    report = {
+        'created_at': datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'repeat': repeat,
+        'results': {},
+    }
+    for count in sizes:
+        print(f"Benchmarking search over {count} tasks...", file=sys.stderr)
+        report['results'][f"search/{count}"] = bench_size(count, repeat)
+    return report
+
+
+def main() -> None:
+    """Command line entry point."""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--sizes', type=int, nargs='+', default=DEFAULT_SIZES,
+                        help="task counts to benchmark")
+    parser.add_argument('--repeat', type=int, default=5,
+                        help="timed runs per benchmark")
+    parser.add_argument('--output', help="write the JSON report here instead of stdout")
+    parser.add_argument('--compare', nargs=2, metavar=('OLD', 'NEW'),
+                        help="compare two reports instead of running")
+    args = parser.parse_args()
+
+    if args.compare:
+        compare(*args.compare)
+        return
+
+    report = run(args.sizes, args.repeat)
+    data = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(data + "\n")
+    else:
+        print(data)
+
+
+if __name__ == "__main__":
+    main()
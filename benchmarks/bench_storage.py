@@ -0,0 +1,241 @@
+"""
+Benchmark suite for task storage load/save at scale.
+
+Generates synthetic task files of increasing size, then times full loads,
+full saves and single-mutation cycles (toggle one task, then persist it
+either with a full save or with a journal append), and records peak
+memory of each step. Results are written as JSON so runs can be compared:
+
+    python benchmarks/bench_storage.py --sizes 1000 10000 --output new.json
+    python benchmarks/bench_storage.py --compare old.json new.json
+
+Trees whose ``storage`` only has ``load_tasks``/``save_tasks`` (JSON) are
+detected, or forced with ``--basic``; only the benchmarks both trees share
+are run then, so a report from before and after a change compares.
+"""
+
+import argparse
+import inspect
+import json
+import os
+import platform
+import random
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import date, datetime, timedelta
+from typing import Callable, Dict, List
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from models import Task  # noqa: E402
+import storage  # noqa: E402
+
+
+# Task due date format (models.DATE_FORMAT, which older trees lack)
+DATE_FORMAT = "%d/%m/%Y"
+
+DEFAULT_SIZES = [1_000, 10_000, 100_000, 1_000_000]
+DEFAULT_FORMATS = ["json", "tskb", "db"]
+
+# Whether load_tasks keeps a cache that a cold load has to bypass
+HAS_LOAD_CACHE = 'use_cache' in inspect.signature(storage.load_tasks).parameters
+
+# Whether storage has more than load_tasks/save_tasks on JSON files
+FULL_API = (HAS_LOAD_CACHE and hasattr(storage, 'iter_tasks')
+            and hasattr(storage, 'append_operation'))
+
+
+def load_uncached(filename: str) -> list:
+    """Load a task file from disk, bypassing the load cache if there is one."""
+    if HAS_LOAD_CACHE:
+        return storage.load_tasks(filename, use_cache=False)
+    return storage.load_tasks(filename)
+
+WORDS = ["comprar", "llamar", "revisar", "enviar", "pagar", "preparar",
+         "leche", "informe", "correo", "factura", "reunión", "gimnasio",
+         "médico", "proyecto", "presentación", "cumpleaños"]
+
+
+def generate_tasks(count: int, seed: int = 42) -> List[Task]:
+    """
+    Build a reproducible list of synthetic tasks.
+
+    Args:
+        count: Number of tasks
+        seed: Random seed
+
+    Returns:
+        List of Task objects with mixed dates and statuses
+    """
+    rng = random.Random(seed)
+    start = date(2020, 1, 1)
+    tasks = []
+    for i in range(count):
+        text = " ".join(rng.choice(WORDS) for _ in range(rng.randint(2, 6)))
+        date_str = None
+        if rng.random() < 0.8:
+            date_str = (start + timedelta(days=rng.randint(0, 2500))).strftime(DATE_FORMAT)
+        tasks.append(Task(text=f"{text} #{i}", date_str=date_str,
+                          status=rng.random() < 0.6))
+    return tasks
+
+
+def measure(func: Callable[[], object], repeat: int) -> Dict[str, float]:
+    """
+    Time a function and record its peak traced memory.
+
+    Timing runs are done without tracemalloc, which would slow them down;
+    one extra traced run measures peak memory.
+
+    Args:
+        func: Benchmark body
+        repeat: Number of timed runs
+
+    Returns:
+        Timing statistics (seconds) and peak memory (bytes)
+    """
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+
+    tracemalloc.start()
+    try:
+        func()
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+    return {
+        'min_s': min(times),
+        'median_s': statistics.median(times),
+        'peak_bytes': peak,
+    }
+
+
+def bench_size(count: int, fmt: str, directory: str, repeat: int,
+               basic: bool = False) -> Dict[str, dict]:
+    """
+    Run every benchmark for one list size and file format.
+
+    Args:
+        count: Number of tasks
+        fmt: File extension of the storage format ('json', 'tskb' or 'db')
+        directory: Scratch directory for the task files
+        repeat: Number of timed runs per benchmark
+        basic: Only use load_tasks and save_tasks
+
+    Returns:
+        Results keyed by benchmark name
+    """
+    filename = os.path.join(directory, f"tareas_{count}.{fmt}")
+    tasks = generate_tasks(count)
+    storage.save_tasks(tasks, filename)
+    index = count // 2
+
+    def toggle_and_save() -> None:
+        tasks[index].status = not tasks[index].status
+        storage.save_tasks(tasks, filename)
+
+    results = {'file_bytes': os.path.getsize(filename)}
+    if basic:
+        results['load'] = measure(lambda: load_uncached(filename), repeat)
+        results['save'] = measure(lambda: storage.save_tasks(tasks, filename), repeat)
+        results['mutate_save'] = measure(toggle_and_save, repeat)
+        storage.save_tasks(tasks, filename)
+        return results
+
+    results['load'] = measure(lambda: load_uncached(filename), repeat)
+    storage.load_tasks(filename)  # warm the cache
+    results['load_cached'] = measure(lambda: storage.load_tasks(filename), repeat)
+    results['iter'] = measure(lambda: sum(1 for _ in storage.iter_tasks(filename)), repeat)
+    results['save'] = measure(lambda: storage.save_tasks(tasks, filename), repeat)
+
+    def toggle_and_append() -> None:
+        tasks[index].status = not tasks[index].status
+        storage.append_operation({'op': 'update', 'index': index,
+                                  'task': tasks[index].to_dict()}, filename)
+
+    results['mutate_save'] = measure(toggle_and_save, repeat)
+    results['mutate_append'] = measure(toggle_and_append, repeat)
+    storage.save_tasks(tasks, filename)
+    return results
+
+
+def run(sizes: List[int], formats: List[str], repeat: int, basic: bool = False) -> dict:
+    """Run the suite and return a JSON-serializable report."""
+    if basic and formats != ["json"]:
+        print("Warning: Only JSON files are benchmarked with the basic storage API.",
+              file=sys.stderr)
+        formats = ["json"]
+    report = {
+        'created_at': datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'repeat': repeat,
+        'basic': basic,
+        'results': {},
+    }
+    with tempfile.TemporaryDirectory(prefix="bench_storage_") as directory:
+        for fmt in formats:
+            for count in sizes:
+                print(f"Benchmarking {count} tasks ({fmt})...", file=sys.stderr)
+                key = f"{fmt}/{count}"
+                report['results'][key] = bench_size(count, fmt, directory, repeat, basic)
+    return report
+
+
+def compare(old_path: str, new_path: str) -> None:
+    """Print median time and peak memory ratios (new / old) of two reports."""
+    with open(old_path, 'r', encoding='utf-8') as f:
+        old = json.load(f)['results']
+    with open(new_path, 'r', encoding='utf-8') as f:
+        new = json.load(f)['results']
+
+    print(f"{'case':<16}{'benchmark':<16}{'time':>10}{'memory':>10}")
+    for case in sorted(set(old) & set(new), key=lambda k: (k.split('/')[0], int(k.split('/')[1]))):
+        for name, result in new[case].items():
+            if not isinstance(result, dict) or name not in old[case]:
+                continue
+            before = old[case][name]
+            time_ratio = result['median_s'] / before['median_s'] if before['median_s'] else float('nan')
+            memory_ratio = result['peak_bytes'] / before['peak_bytes'] if before['peak_bytes'] else float('nan')
+            print(f"{case:<16}{name:<16}{time_ratio:>9.2f}x{memory_ratio:>9.2f}x")
+
+
+def main() -> None:
+    """Command line entry point."""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--sizes', type=int, nargs='+', default=DEFAULT_SIZES,
+                        help="task counts to benchmark")
+    parser.add_argument('--formats', nargs='+', default=DEFAULT_FORMATS,
+                        choices=DEFAULT_FORMATS, help="storage formats to benchmark")
+    parser.add_argument('--repeat', type=int, default=3,
+                        help="timed runs per benchmark")
+    parser.add_argument('--basic', action='store_true',
+                        help="only use load_tasks/save_tasks on JSON (automatic on "
+                             "trees without the newer storage API)")
+    parser.add_argument('--output', help="write the JSON report here instead of stdout")
+    parser.add_argument('--compare', nargs=2, metavar=('OLD', 'NEW'),
+                        help="compare two reports instead of running")
+    args = parser.parse_args()
+
+    if args.compare:
+        compare(*args.compare)
+        return
+
+    report = run(args.sizes, args.formats, args.repeat, args.basic or not FULL_API)
+    data = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(data + "\n")
+    else:
+        print(data)
+
+
+if __name__ == "__main__":
+    main()
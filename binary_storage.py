@@ -0,0 +1,190 @@
+"""
+Binary snapshot format for tasks, read lazily through mmap.
+
+Layout (little endian)::
+
+    header   magic "TSKB" | version u16 | flags u16 | count u64
+    records  count x (status u8 | pad 3 | due i32 | text_offset u64
+                      | text_length u32 | date_length u32 | id_length u32)
+    heap     UTF-8 text of each task, immediately followed by its date and
+             its sync id
+
+``due`` is the date ordinal (``NO_DATE`` if missing), ``date_length`` is
+``NO_DATE_STRING`` for tasks without a date string and ``id_length`` is
+``NO_ID`` for tasks without a sync id (``Task.id``). Version 1 files, whose
+records end at ``date_length`` and carry no ids, are still read. Fixed-width records let
+a reader jump straight to any row, so opening a snapshot only reads the
+header and rows are decoded when they are accessed.
+"""
+
+import mmap
+import struct
+from typing import Iterable, Iterator, Optional
+
+from models import NO_DATE, Task, parse_date_ordinal
+
+
+# File extensions that hold a binary snapshot
+BINARY_EXTENSIONS = (".tskb",)
+
+MAGIC = b"TSKB"
+VERSION = 2
+
+# date_length value for tasks without a date string
+NO_DATE_STRING = 0xFFFFFFFF
+
+# id_length value for tasks without a sync id
+NO_ID = 0xFFFFFFFF
+
+_HEADER = struct.Struct("<4sHHQ")
+_RECORD = struct.Struct("<B3xiQIII")
+# Records by format version
+_RECORDS = {1: struct.Struct("<B3xiQII"), 2: _RECORD}
+
+
+class SnapshotError(ValueError):
+    """Raised when a file is not a valid binary task snapshot."""
+
+
+def is_binary_path(filename: str) -> bool:
+    """Return True if the file holds a binary snapshot."""
+    return filename.lower().endswith(BINARY_EXTENSIONS)
+
+
+def encode_snapshot(tasks: Iterable[Task]) -> bytes:
+    """
+    Serialize tasks to the binary snapshot format.
+
+    Args:
+        tasks: Task objects to encode (a list or a TaskStore)
+
+    Returns:
+        The complete snapshot contents
+    """
+    records = bytearray()
+    heap = bytearray()
+    count = 0
+
+    for task in tasks:
+        text = task.text.encode('utf-8')
+        date = task.date_str.encode('utf-8') if task.date_str else b""
+        remote_id = task.id.encode('utf-8') if task.id is not None else b""
+        records += _RECORD.pack(
+            1 if task.status else 0,
+            parse_date_ordinal(task.date_str) or NO_DATE,
+            len(heap),
+            len(text),
+            len(date) if task.date_str else NO_DATE_STRING,
+            len(remote_id) if task.id is not None else NO_ID,
+        )
+        heap += text
+        heap += date
+        heap += remote_id
+        count += 1
+
+    return _HEADER.pack(MAGIC, VERSION, 0, count) + bytes(records) + bytes(heap)
+
+
+class BinarySnapshot:
+    """
+    Read-only, memory-mapped view of a binary task snapshot.
+
+    Behaves like a sequence of tasks; each access decodes only the
+    requested row, and checks that its strings lie inside the file, so a
+    corrupt record raises ``SnapshotError`` on access instead of opening
+    taking time proportional to the task count. ``status`` and ``due`` read
+    a single field without touching the string heap. Use as a context
+    manager or call ``close``.
+    """
+
+    def __init__(self, filename: str):
+        """
+        Open and validate a snapshot.
+
+        Args:
+            filename: Path to the snapshot file
+
+        Raises:
+            SnapshotError: If the file is not a valid snapshot
+            OSError: If the file cannot be opened
+        """
+        self.filename = filename
+        self._file = open(filename, 'rb')
+        try:
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            # mmap refuses empty files
+            self._file.close()
+            raise SnapshotError("file is empty")
+
+        try:
+            if len(self._map) < _HEADER.size:
+                raise SnapshotError("file is truncated")
+            magic, version, _flags, count = _HEADER.unpack_from(self._map, 0)
+            if magic != MAGIC:
+                raise SnapshotError("bad magic number")
+            if version not in _RECORDS:
+                raise SnapshotError(f"unsupported version {version}")
+            self._record_format = _RECORDS[version]
+            self._count = count
+            self._heap = _HEADER.size + count * self._record_format.size
+            if len(self._map) < self._heap:
+                raise SnapshotError("file is truncated")
+        except SnapshotError:
+            self.close()
+            raise
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __getitem__(self, index: int) -> Task:
+        status, _due, offset, text_length, date_length, *rest = self._record(index)
+        id_length = rest[0] if rest else NO_ID
+        start = self._heap + offset
+        end = start + text_length
+        date_end = end if date_length == NO_DATE_STRING else end + date_length
+        stop = date_end if id_length == NO_ID else date_end + id_length
+        if stop > len(self._map):
+            raise SnapshotError(f"task {index} points past the end of the file")
+        text = self._map[start:end].decode('utf-8')
+        date_str = None
+        if date_length != NO_DATE_STRING:
+            date_str = self._map[end:date_end].decode('utf-8')
+        remote_id = None
+        if id_length != NO_ID:
+            remote_id = self._map[date_end:stop].decode('utf-8')
+        return Task(text=text, date_str=date_str, status=bool(status), id=remote_id)
+
+    def __iter__(self) -> Iterator[Task]:
+        for index in range(self._count):
+            yield self[index]
+
+    def status(self, index: int) -> bool:
+        """Completion status of a task, without decoding its text."""
+        return bool(self._record(index)[0])
+
+    def due(self, index: int) -> Optional[int]:
+        """Due date ordinal of a task, or None if it has no valid date."""
+        due = self._record(index)[1]
+        return due if due != NO_DATE else None
+
+    def _record(self, index: int) -> tuple:
+        """Unpack the fixed-width record of a task."""
+        if index < 0:
+            index += self._count
+        if not 0 <= index < self._count:
+            raise IndexError("task index out of range")
+        record = self._record_format
+        return record.unpack_from(self._map, _HEADER.size + index * record.size)
+
+    def close(self) -> None:
+        """Release the memory map and the file."""
+        if not self._map.closed:
+            self._map.close()
+        self._file.close()
+
+    def __enter__(self) -> 'BinarySnapshot':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
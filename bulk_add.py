@@ -0,0 +1,141 @@
+"""
+Bulk entry of tasks pasted as text, one per line.
+
+A line may end with a DD/MM/YYYY due date and may start with a list bullet
+or a checklist box (``- [ ]``, ``- [x]``, ``*``, ``•``, ``1.``), so lists
+copied from notes or Markdown paste as they are. Every line is parsed and
+validated in one pass before anything is added, so a 2,000-line checklist
+becomes a single edit: one save, one redraw and one undo step.
+"""
+
+import re
+import tkinter as tk
+from dataclasses import dataclass, field
+from datetime import date
+from typing import Callable, List, Optional
+
+from models import Task
+
+
+# Optional bullet or checklist box, the text, and an optional trailing date
+_LINE = re.compile(
+    r"""^\s*
+    (?:(?:[-*•+]|\d+[.)])\s+)?          # bullet or number
+    (?:\[(?P<done>[ xX])\]\s*)?         # checklist box
+    (?P<text>.*?)
+    (?:\s*[-|,;]?\s*(?<![^\s\-|,;])     # date only after a space or separator
+       (?P<day>\d{2})/(?P<month>\d{2})/(?P<year>\d{4}))?
+    \s*$""",
+    re.VERBOSE,
+)
+
+# Invalid lines listed in the error message
+MAX_REPORTED_ERRORS = 10
+
+
+@dataclass
+class ParsedLines:
+    """Tasks parsed from pasted text, or the lines that could not be."""
+    tasks: List[Task] = field(default_factory=list)
+    dues: List[Optional[int]] = field(default_factory=list)
+    # (line number, message) of every invalid line
+    errors: List[tuple] = field(default_factory=list)
+
+
+def parse_lines(text: str) -> ParsedLines:
+    """
+    Parse pasted text into tasks, one per non-empty line.
+
+    Args:
+        text: Lines of the form "[bullet] [checkbox] text [DD/MM/YYYY]"
+
+    Returns:
+        The tasks with their due date ordinals, and the invalid lines
+    """
+    parsed = ParsedLines()
+    for number, line in enumerate(text.splitlines(), start=1):
+        if not line.strip():
+            continue
+        match = _LINE.match(line)
+        task_text = match['text']
+        if not task_text:
+            parsed.errors.append((number, "sin texto"))
+            continue
+        due = date_str = None
+        if match['year']:
+            try:
+                due = date(int(match['year']), int(match['month']),
+                           int(match['day'])).toordinal()
+            except ValueError:
+                parsed.errors.append((number, "fecha inválida"))
+                continue
+            date_str = f"{match['day']}/{match['month']}/{match['year']}"
+        parsed.tasks.append(Task(text=task_text, date_str=date_str,
+                                 status=match['done'] in ('x', 'X')))
+        parsed.dues.append(due)
+    return parsed
+
+
+class BulkAddDialog(tk.Toplevel):
+    """
+    Window to paste several tasks at once.
+
+    ``on_submit`` receives the text and returns True once the tasks are
+    added, which closes the window; otherwise it stays open to fix the
+    reported lines.
+    """
+
+    def __init__(self, master: tk.Misc, on_submit: Callable[[str], bool]):
+        """
+        Open the dialog.
+
+        Args:
+            master: Parent window
+            on_submit: Called with the pasted text
+        """
+        super().__init__(master)
+        self.on_submit = on_submit
+
+        self.title("Agregar Varias Tareas")
+        self.configure(bg='#f0f0f0')
+        self.transient(master)
+        self._create_widgets()
+        self.text.focus_set()
+        self.grab_set()
+
+    def _create_widgets(self) -> None:
+        """Create the text area and the buttons."""
+        tk.Label(
+            self,
+            text="Una tarea por línea, con fecha opcional al final (DD/MM/YYYY):",
+            font=("Arial", 10, "bold"),
+            bg='#f0f0f0',
+            fg='#2c3e50'
+        ).pack(anchor='w', padx=10, pady=(10, 5))
+
+        text_frame = tk.Frame(self, bg='#f0f0f0')
+        text_frame.pack(fill='both', expand=True, padx=10)
+        scrollbar = tk.Scrollbar(text_frame)
+        scrollbar.pack(side='right', fill='y')
+        self.text = tk.Text(text_frame, width=60, height=15, font=("Arial", 10),
+                            relief='solid', borderwidth=2, undo=True,
+                            yscrollcommand=scrollbar.set)
+        self.text.pack(side='left', fill='both', expand=True)
+        scrollbar.config(command=self.text.yview)
+
+        footer = tk.Frame(self, bg='#f0f0f0')
+        footer.pack(pady=10)
+        tk.Button(footer, text="➕ Agregar todas", command=self._submit,
+                  bg="#27ae60", fg="white", font=("Arial", 10, "bold"),
+                  relief='raised', borderwidth=2, padx=15, pady=3).pack(side=tk.LEFT, padx=5)
+        tk.Button(footer, text="Cancelar", command=self.destroy,
+                  bg="#D32F2F", fg="white", font=("Arial", 10, "bold"),
+                  relief='raised', borderwidth=2, padx=15, pady=3).pack(side=tk.LEFT, padx=5)
+
+        self.bind('<Control-Return>', lambda e: self._submit())
+        self.bind('<Escape>', lambda e: self.destroy())
+
+    def _submit(self) -> None:
+        """Pass the text on and close if the tasks were added."""
+        if self.on_submit(self.text.get('1.0', 'end-1c')):
+            self.destroy()
@@ -0,0 +1,152 @@
+"""
+Month-grid calendar for picking task dates.
+
+Each day shows how many pending tasks are due on it (in red when they are
+overdue). Counts come from the task list's index of pending due dates, so
+opening the calendar or changing months costs a couple of binary searches
+per day and never scans the tasks.
+"""
+
+import tkinter as tk
+from datetime import date, timedelta
+from typing import Callable, List, Optional
+
+from models import DATE_FORMAT, ObservableTaskList
+
+
+MONTH_NAMES = ["Enero", "Febrero", "Marzo", "Abril", "Mayo", "Junio", "Julio",
+               "Agosto", "Septiembre", "Octubre", "Noviembre", "Diciembre"]
+WEEKDAY_NAMES = ["Lu", "Ma", "Mi", "Ju", "Vi", "Sá", "Do"]
+
+# Six weeks always fit a month
+GRID_DAYS = 42
+
+DAY_BG = 'white'
+OTHER_MONTH_FG = '#b0b0b0'
+PENDING_BG = '#e8f5e8'
+OVERDUE_BG = '#ffebee'
+SELECTED_BG = '#3498db'
+
+
+class MonthCalendar(tk.Toplevel):
+    """
+    Modal month calendar with per-day pending and overdue counts.
+
+    The 42 day buttons are created once and reconfigured when the month
+    changes. Clicking a day passes it (as DD/MM/YYYY) to ``on_select`` and
+    closes the window.
+    """
+
+    def __init__(self, master: tk.Misc, tasks: ObservableTaskList, today: int,
+                 on_select: Callable[[str], None], initial: Optional[int] = None):
+        """
+        Open the calendar.
+
+        Args:
+            master: Parent window
+            tasks: Tasks whose counts are shown
+            today: Date ordinal of the current day
+            on_select: Called with the chosen date string
+            initial: Date ordinal to show and highlight, defaults to today
+        """
+        super().__init__(master)
+        self.tasks = tasks
+        self.today = today
+        self.on_select = on_select
+        self.selected = initial if initial is not None else today
+        shown = date.fromordinal(self.selected)
+        self.year, self.month = shown.year, shown.month
+        self._days: List[date] = []
+
+        self.title("Seleccionar Fecha")
+        self.resizable(False, False)
+        self.configure(bg='#f0f0f0')
+        self.transient(master)
+        self._create_widgets()
+        self._show_month()
+        self.grab_set()
+
+    def _create_widgets(self) -> None:
+        """Create the header, the weekday row and the day grid."""
+        header = tk.Frame(self, bg='#f0f0f0')
+        header.pack(fill='x', padx=10, pady=(10, 5))
+
+        tk.Button(header, text="◀", command=lambda: self._change_month(-1),
+                  relief='flat', bg='#f0f0f0').pack(side='left')
+        tk.Button(header, text="▶", command=lambda: self._change_month(1),
+                  relief='flat', bg='#f0f0f0').pack(side='right')
+        self.month_label = tk.Label(header, font=("Arial", 12, "bold"),
+                                    bg='#f0f0f0', fg='#2c3e50')
+        self.month_label.pack(side='left', expand=True)
+
+        grid = tk.Frame(self, bg='#f0f0f0')
+        grid.pack(padx=10)
+        for column, name in enumerate(WEEKDAY_NAMES):
+            tk.Label(grid, text=name, font=("Arial", 9, "bold"), bg='#f0f0f0',
+                     fg='#2c3e50', width=5).grid(row=0, column=column)
+
+        self.day_buttons: List[tk.Button] = []
+        for cell in range(GRID_DAYS):
+            button = tk.Button(grid, width=5, height=2, font=("Arial", 9),
+                               relief='groove', borderwidth=1,
+                               command=lambda cell=cell: self._select(cell))
+            button.grid(row=1 + cell // 7, column=cell % 7, padx=1, pady=1)
+            self.day_buttons.append(button)
+
+        footer = tk.Frame(self, bg='#f0f0f0')
+        footer.pack(pady=10)
+        tk.Button(footer, text="Hoy", command=self._go_today,
+                  bg="#27ae60", fg="white", font=("Arial", 10, "bold"),
+                  relief='raised', borderwidth=2, padx=15, pady=3).pack(side=tk.LEFT, padx=5)
+        tk.Button(footer, text="Cancelar", command=self.destroy,
+                  bg="#D32F2F", fg="white", font=("Arial", 10, "bold"),
+                  relief='raised', borderwidth=2, padx=15, pady=3).pack(side=tk.LEFT, padx=5)
+
+        self.bind('<Prior>', lambda e: self._change_month(-1))
+        self.bind('<Next>', lambda e: self._change_month(1))
+        self.bind('<Escape>', lambda e: self.destroy())
+
+    def _show_month(self) -> None:
+        """Fill the grid with the days and counts of the current month."""
+        self.month_label.config(text=f"{MONTH_NAMES[self.month - 1]} {self.year}")
+        first = date(self.year, self.month, 1)
+        start = first - timedelta(days=first.weekday())
+        self._days = [start + timedelta(days=offset) for offset in range(GRID_DAYS)]
+
+        pending_due = self.tasks.pending_due
+        for button, day in zip(self.day_buttons, self._days):
+            ordinal = day.toordinal()
+            pending = pending_due.count_between(ordinal, ordinal)
+            text = str(day.day)
+            bg, fg = DAY_BG, '#2c3e50'
+            if pending:
+                text += f"\n{pending} ⏳"
+                if ordinal < self.today:
+                    text = f"{day.day}\n{pending} 🔴"
+                    bg, fg = OVERDUE_BG, '#d32f2f'
+                else:
+                    bg, fg = PENDING_BG, '#2e7d32'
+            if day.month != self.month:
+                fg = OTHER_MONTH_FG
+            if ordinal == self.selected:
+                bg, fg = SELECTED_BG, 'white'
+            font = ("Arial", 9, "bold") if ordinal == self.today else ("Arial", 9)
+            button.config(text=text, bg=bg, fg=fg, font=font)
+
+    def _change_month(self, step: int) -> None:
+        """Move the grid by a number of months."""
+        month = self.year * 12 + (self.month - 1) + step
+        self.year, self.month = divmod(month, 12)
+        self.month += 1
+        self._show_month()
+
+    def _go_today(self) -> None:
+        """Show the current month."""
+        today = date.fromordinal(self.today)
+        self.year, self.month = today.year, today.month
+        self._show_month()
+
+    def _select(self, cell: int) -> None:
+        """Choose a day and close the calendar."""
+        self.on_select(self._days[cell].strftime(DATE_FORMAT))
+        self.destroy()
@@ -0,0 +1,64 @@
+-- Script para calcular los contadores y estadísticas de tareas en Postgres
+-- Ejecuta este script en el SQL Editor de Supabase
+
+-- 1. Resumen de las tareas del usuario en una sola llamada (supabase.rpc):
+--    contadores, tareas por categoría, por día (entre p_desde y p_hasta) y
+--    por mes. Corre con los permisos del usuario, así RLS sigue aplicando.
+CREATE OR REPLACE FUNCTION resumen_tareas(
+    p_desde DATE,
+    p_hasta DATE,
+    p_hoy DATE DEFAULT CURRENT_DATE
+)
+RETURNS JSON AS $$
+    WITH mis_tareas AS (
+        SELECT fecha,
+               categoria,
+               COALESCE(completada, FALSE) AS completada,
+               COALESCE(urgente, FALSE) AS urgente
+        FROM tareas
+        WHERE user_id = auth.uid()
+    ),
+    contadores AS (
+        SELECT COUNT(*) AS total,
+               COUNT(*) FILTER (WHERE completada) AS completadas,
+               COUNT(*) FILTER (WHERE fecha < p_hoy AND NOT completada) AS vencidas,
+               COUNT(*) FILTER (WHERE urgente) AS urgentes,
+               COUNT(*) FILTER (WHERE urgente AND NOT completada) AS urgentes_pendientes
+        FROM mis_tareas
+    )
+    SELECT json_build_object(
+        'total', total,
+        'completadas', completadas,
+        'pendientes', total - completadas,
+        'vencidas', vencidas,
+        'urgentes', urgentes,
+        'urgentes_pendientes', urgentes_pendientes,
+        'por_categoria', COALESCE((
+            SELECT json_agg(json_build_object('categoria', categoria, 'total', n)
+                            ORDER BY n DESC, categoria)
+            FROM (SELECT categoria, COUNT(*) AS n FROM mis_tareas GROUP BY categoria) c
+        ), '[]'::json),
+        'por_dia', COALESCE((
+            SELECT json_agg(json_build_object('fecha', fecha, 'total', n, 'completadas', hechas)
+                            ORDER BY fecha)
+            FROM (SELECT fecha, COUNT(*) AS n, COUNT(*) FILTER (WHERE completada) AS hechas
+                  FROM mis_tareas
+                  WHERE fecha BETWEEN p_desde AND p_hasta
+                  GROUP BY fecha) d
+        ), '[]'::json),
+        'por_mes', COALESCE((
+            SELECT json_agg(json_build_object('mes', mes, 'completadas', hechas,
+                                              'pendientes', n - hechas)
+                            ORDER BY mes)
+            FROM (SELECT to_char(fecha, 'YYYY-MM') AS mes, COUNT(*) AS n,
+                         COUNT(*) FILTER (WHERE completada) AS hechas
+                  FROM mis_tareas
+                  WHERE fecha IS NOT NULL
+                  GROUP BY 1) m
+        ), '[]'::json)
+    )
+    FROM contadores;
+$$ language 'sql' STABLE;
+
+-- 2. Permitir llamarla a los usuarios autenticados
+GRANT EXECUTE ON FUNCTION resumen_tareas(DATE, DATE, DATE) TO authenticated;
@@ -0,0 +1,228 @@
+"""
+Undo/redo history for the desktop app.
+
+Changes are recorded as small edits (insert, update or delete of some
+positions) together with their inverse, never as copies of the task list,
+so memory grows with the number and size of the edits rather than with the
+number of tasks. Applying an edit returns the matching journal operations,
+so undo and redo are persisted like any other change, without reloading
+the file.
+"""
+
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Deque, List, Optional, Tuple
+
+from models import ObservableTaskList, Task
+
+
+# Kinds of edit
+INSERT_EDIT = "insert"
+UPDATE_EDIT = "update"
+DELETE_EDIT = "delete"
+
+# Memory budget of the whole history (undo and redo)
+DEFAULT_MAX_BYTES = 4 * 1024 * 1024
+
+# Rough per-task and per-position costs used to estimate an edit's size
+_TASK_BYTES = 120
+_INDEX_BYTES = 8
+
+
+@dataclass(slots=True)
+class Edit:
+    """
+    A change to some positions of a task list.
+
+    ``indices`` are ascending. Inserts give the positions the tasks will
+    have once inserted (and may carry their parsed due ordinals in
+    ``dues``); updates give the new tasks; deletes need no tasks.
+    """
+    kind: str
+    indices: List[int]
+    tasks: List[Task] = field(default_factory=list)
+    dues: Optional[List[Optional[int]]] = None
+
+    def size(self) -> int:
+        """Approximate memory held by the edit, in bytes."""
+        size = _INDEX_BYTES * len(self.indices)
+        for task in self.tasks:
+            size += _TASK_BYTES + len(task.text) + len(task.date_str or "")
+        return size
+
+
+@dataclass(slots=True)
+class Command:
+    """An edit, its inverse and a label for the user."""
+    label: str
+    edit: Edit
+    inverse: Edit
+    size: int
+
+
+def inverse_edit(tasks: ObservableTaskList, edit: Edit) -> Edit:
+    """
+    Build the edit that undoes another one.
+
+    Must be called before ``edit`` is applied.
+
+    Args:
+        tasks: List the edit will be applied to
+        edit: Edit to invert
+
+    Returns:
+        The inverse edit
+    """
+    if edit.kind == INSERT_EDIT:
+        return Edit(DELETE_EDIT, list(edit.indices))
+    previous = [tasks[i] for i in edit.indices]
+    if edit.kind == UPDATE_EDIT:
+        return Edit(UPDATE_EDIT, list(edit.indices), previous)
+    if edit.kind == DELETE_EDIT:
+        return Edit(INSERT_EDIT, list(edit.indices), previous,
+                    [tasks.due(i) for i in edit.indices])
+    raise ValueError(f"unknown edit '{edit.kind}'")
+
+
+def apply_edit(tasks: ObservableTaskList, edit: Edit) -> List[dict]:
+    """
+    Apply an edit to a task list.
+
+    Single-position edits use the list's single-row mutations, larger ones
+    its bulk mutations, so listeners see one change either way.
+
+    Args:
+        tasks: List to change
+        edit: Edit to apply
+
+    Returns:
+        Journal operations that persist the edit, in order
+    """
+    indices = edit.indices
+    single = len(indices) == 1
+
+    if edit.kind == INSERT_EDIT:
+        dues = edit.dues or [None] * len(indices)
+        start = len(tasks)
+        if single:
+            tasks.insert(indices[0], edit.tasks[0], dues[0])
+        else:
+            tasks.insert_many(indices, edit.tasks, edit.dues)
+        operations = []
+        # Inserting in ascending order of final positions replays correctly
+        for count, (index, task) in enumerate(zip(indices, edit.tasks)):
+            if index == start + count:
+                operations.append({'op': 'add', 'task': task.to_dict()})
+            else:
+                operations.append({'op': 'insert', 'index': index, 'task': task.to_dict()})
+        return operations
+
+    if edit.kind == UPDATE_EDIT:
+        if single:
+            tasks[indices[0]] = edit.tasks[0]
+        else:
+            tasks.update_many(indices, edit.tasks)
+        return [{'op': 'update', 'index': index, 'task': task.to_dict()}
+                for index, task in zip(indices, edit.tasks)]
+
+    if edit.kind == DELETE_EDIT:
+        if single:
+            del tasks[indices[0]]
+        else:
+            tasks.delete_many(indices)
+        # Delete from the end so the remaining positions stay valid
+        return [{'op': 'delete', 'index': index} for index in reversed(indices)]
+
+    raise ValueError(f"unknown edit '{edit.kind}'")
+
+
+class CommandHistory:
+    """
+    Undo and redo stacks of edits with a memory budget.
+
+    When the estimated size of the history exceeds ``max_bytes`` the
+    oldest commands are forgotten. A single command larger than the budget
+    is applied but cannot be undone.
+    """
+
+    def __init__(self, max_bytes: int = DEFAULT_MAX_BYTES):
+        """
+        Initialize an empty history.
+
+        Args:
+            max_bytes: Memory budget of the history
+        """
+        self.max_bytes = max_bytes
+        self._undo: Deque[Command] = deque()
+        self._redo: List[Command] = []
+        self._bytes = 0
+
+    def can_undo(self) -> bool:
+        """Return True if there is a command to undo."""
+        return bool(self._undo)
+
+    def can_redo(self) -> bool:
+        """Return True if there is an undone command to redo."""
+        return bool(self._redo)
+
+    def execute(self, tasks: ObservableTaskList, edit: Edit, label: str) -> List[dict]:
+        """
+        Apply an edit and remember how to undo it.
+
+        Args:
+            tasks: List to change
+            edit: Edit to apply
+            label: Description shown to the user
+
+        Returns:
+            Journal operations that persist the edit
+        """
+        inverse = inverse_edit(tasks, edit)
+        operations = apply_edit(tasks, edit)
+
+        while self._redo:
+            self._bytes -= self._redo.pop().size
+        command = Command(label, edit, inverse, edit.size() + inverse.size())
+        self._undo.append(command)
+        self._bytes += command.size
+        self._trim()
+        return operations
+
+    def undo(self, tasks: ObservableTaskList) -> Optional[Tuple[str, List[dict]]]:
+        """
+        Undo the last command.
+
+        Returns:
+            (label, journal operations), or None if there is nothing to undo
+        """
+        if not self._undo:
+            return None
+        command = self._undo.pop()
+        operations = apply_edit(tasks, command.inverse)
+        self._redo.append(command)
+        return command.label, operations
+
+    def redo(self, tasks: ObservableTaskList) -> Optional[Tuple[str, List[dict]]]:
+        """
+        Redo the last undone command.
+
+        Returns:
+            (label, journal operations), or None if there is nothing to redo
+        """
+        if not self._redo:
+            return None
+        command = self._redo.pop()
+        operations = apply_edit(tasks, command.edit)
+        self._undo.append(command)
+        return command.label, operations
+
+    def clear(self) -> None:
+        """Forget every command (e.g. after reloading the list)."""
+        self._undo.clear()
+        self._redo.clear()
+        self._bytes = 0
+
+    def _trim(self) -> None:
+        """Drop the oldest commands until the history fits its budget."""
+        while self._bytes > self.max_bytes and self._undo:
+            self._bytes -= self._undo.popleft().size
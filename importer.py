@@ -0,0 +1,341 @@
+"""
+Bulk importer from JSON task files into the Supabase ``tareas`` table.
+
+Reads either the desktop format (``text``/``date_str``/``status``, see
+``models.Task``) or the web export format (``texto``/``fecha``/
+``completada``/``urgente``, like ``tareas_web.json``), streaming the file
+so memory stays flat, and writes rows in batches instead of one insert per
+task. Row ids are derived from the user and the task itself (text, date
+and category, plus a counter for identical tasks), and batches are
+upserted on ``id``, so an interrupted import can be resumed (or simply
+re-run, even after moving or editing the file) without creating
+duplicates.
+
+Usage:
+    python importer.py tareas.json --email yo@correo.com --password ...
+    python importer.py tareas.json --postgrest-url http://localhost:3000 \\
+        --token <jwt> --user-id <uuid>
+"""
+
+import argparse
+import json
+import os
+import sys
+import uuid
+from datetime import date
+from itertools import islice
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from models import parse_date_ordinal
+from storage import InvalidFormatError, atomic_write, iter_json_array
+
+
+# Category used for tasks without one (desktop tasks have no category)
+DEFAULT_CATEGORIA = "⚡ Otro"
+
+DEFAULT_BATCH_SIZE = 500
+
+# Namespace for the deterministic ids of imported rows
+IMPORT_NAMESPACE = uuid.UUID("6f0c1f2e-3b8a-4d6e-9a51-2c7d0e4b8f13")
+
+FORMAT_DESKTOP = "desktop"
+FORMAT_WEB = "web"
+
+# Record field holding the due date, per format
+DATE_FIELDS = {FORMAT_DESKTOP: 'date_str', FORMAT_WEB: 'fecha'}
+
+
+def detect_format(record: Dict[str, Any]) -> str:
+    """
+    Tell which export format a record comes from.
+
+    Args:
+        record: First record of the file
+
+    Returns:
+        FORMAT_DESKTOP or FORMAT_WEB
+
+    Raises:
+        ValueError: If the record matches neither format
+    """
+    if isinstance(record, dict):
+        if 'texto' in record:
+            return FORMAT_WEB
+        if 'text' in record:
+            return FORMAT_DESKTOP
+    raise ValueError("unrecognized task format")
+
+
+def to_iso_date(value: Optional[str]) -> Optional[str]:
+    """
+    Normalize a DD/MM/YYYY (or already ISO) date to YYYY-MM-DD.
+
+    Args:
+        value: Date string, may be None or empty
+
+    Returns:
+        The ISO date, or None if missing or invalid
+    """
+    if not value:
+        return None
+    ordinal = parse_date_ordinal(value)
+    if ordinal is not None:
+        return date.fromordinal(ordinal).isoformat()
+    try:
+        return date.fromisoformat(value).isoformat()
+    except ValueError:
+        return None
+
+
+def to_row(record: Dict[str, Any], fmt: str, user_id: str,
+           categoria: str = DEFAULT_CATEGORIA) -> Dict[str, Any]:
+    """
+    Convert a file record to a ``tareas`` row (without its id).
+
+    Raises:
+        KeyError, TypeError: If the record is missing its text
+    """
+    if fmt == FORMAT_WEB:
+        texto = record['texto']
+        fecha = record.get(DATE_FIELDS[fmt])
+        completada = record.get('completada', False)
+        urgente = record.get('urgente', False)
+        categoria = record.get('categoria') or categoria
+    else:
+        texto = record['text']
+        fecha = record.get(DATE_FIELDS[fmt])
+        completada = record.get('status', False)
+        urgente = False
+
+    if not isinstance(texto, str) or not texto:
+        raise TypeError("task text must be a non-empty string")
+
+    return {
+        'user_id': user_id,
+        'texto': texto,
+        'categoria': categoria,
+        'fecha': to_iso_date(fecha),
+        'urgente': bool(urgente),
+        'completada': bool(completada),
+    }
+
+
+def row_id(row: Dict[str, Any], occurrence: int) -> str:
+    """
+    Deterministic id of an imported row.
+
+    Args:
+        row: Row from ``to_row``
+        occurrence: How many identical tasks came before it in the file
+
+    Returns:
+        A UUID that only depends on the owner and the task content
+    """
+    key = json.dumps([row['user_id'], row['texto'], row['fecha'], row['categoria'],
+                      occurrence], ensure_ascii=False)
+    return str(uuid.uuid5(IMPORT_NAMESPACE, key))
+
+
+def iter_rows(filename: str, user_id: str, categoria: str = DEFAULT_CATEGORIA,
+              start: int = 0) -> Iterator[Tuple[int, Dict[str, Any]]]:
+    """
+    Stream ``tareas`` rows from a task file, skipping invalid records.
+
+    Args:
+        filename: Path to the JSON file (either format)
+        user_id: Owner of the imported tasks
+        categoria: Category for records without one
+        start: Number of records to skip (already imported)
+
+    Yields:
+        (record index, row with a deterministic ``id``) pairs
+    """
+    records = iter_json_array(filename)
+    fmt = None
+    # Identical tasks seen so far, so each copy gets its own id; skipped
+    # records are counted too, so resumed runs number them the same way
+    occurrences: Dict[Tuple[str, Optional[str], str], int] = {}
+    for index, record in enumerate(records):
+        if fmt is None:
+            fmt = detect_format(record)
+        try:
+            row = to_row(record, fmt, user_id, categoria)
+        except (KeyError, TypeError, AttributeError) as e:
+            if index >= start:
+                print(f"Warning: Skipping invalid task at index {index}: {e}")
+            continue
+        fecha = record.get(DATE_FIELDS[fmt])
+        if fecha and row['fecha'] is None and index >= start:
+            print(f"Warning: Invalid date {fecha!r} at index {index}; importing the task without a date")
+        key = (row['texto'], row['fecha'], row['categoria'])
+        occurrence = occurrences.get(key, 0)
+        occurrences[key] = occurrence + 1
+        if index < start:
+            continue
+        row['id'] = row_id(row, occurrence)
+        yield index, row
+
+
+def state_path(filename: str) -> str:
+    """Return the checkpoint file used to resume an import."""
+    return filename + ".import.json"
+
+
+def _fingerprint(filename: str) -> List[int]:
+    """Size and modification time of a file, to notice edits between runs."""
+    stat = os.stat(filename)
+    return [stat.st_size, stat.st_mtime_ns]
+
+
+def _read_state(filename: str, user_id: str) -> int:
+    """
+    Return how many records of a file were already imported.
+
+    A checkpoint only holds while the file is unchanged: records inserted
+    before it would be skipped, so an edited file starts over (the rows
+    already sent are upserted onto their ids, not duplicated).
+    """
+    path = state_path(filename)
+    if not os.path.exists(path):
+        return 0
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            state = json.load(f)
+        if state.get('user_id') != user_id:
+            return 0
+        if state.get('file') != _fingerprint(filename):
+            print(f"Warning: {filename} changed since the interrupted import; starting over")
+            return 0
+        return int(state.get('imported', 0))
+    except (json.JSONDecodeError, ValueError, TypeError, OSError) as e:
+        print(f"Warning: Ignoring invalid import state {path}: {e}")
+        return 0
+
+
+def _write_state(filename: str, user_id: str, imported: int) -> None:
+    """Record import progress so a failed import can resume."""
+    state = {'user_id': user_id, 'file': _fingerprint(filename), 'imported': imported}
+    atomic_write(state_path(filename), json.dumps(state).encode('utf-8'))
+
+
+def import_tasks(client: Any, filename: str, user_id: str,
+                 batch_size: int = DEFAULT_BATCH_SIZE,
+                 categoria: str = DEFAULT_CATEGORIA,
+                 resume: bool = True) -> int:
+    """
+    Import a task file into the ``tareas`` table in batches.
+
+    Progress is checkpointed after every batch. With ``resume`` the import
+    continues after the last checkpoint; re-sent rows are upserted onto
+    their deterministic ids, so a crash between a batch and its checkpoint
+    does not duplicate tasks.
+
+    Args:
+        client: Supabase client or PostgREST client
+        filename: Path to the JSON file (either format)
+        user_id: Owner of the imported tasks
+        batch_size: Rows per request
+        categoria: Category for records without one
+        resume: Continue a previous, interrupted import of the same file
+
+    Returns:
+        Number of rows written by this run, or -1 if the import failed (it
+        can then be resumed)
+    """
+    start = _read_state(filename, user_id) if resume else 0
+    if start:
+        print(f"Resuming import of {filename} after {start} records")
+
+    written = 0
+    try:
+        rows = iter_rows(filename, user_id, categoria, start)
+        while True:
+            batch = list(islice(rows, batch_size))
+            if not batch:
+                break
+            client.table('tareas').upsert([row for _, row in batch],
+                                          on_conflict='id').execute()
+            written += len(batch)
+            _write_state(filename, user_id, batch[-1][0] + 1)
+            print(f"Imported {written} tasks...")
+
+    except (json.JSONDecodeError, InvalidFormatError, ValueError) as e:
+        print(f"Error: {filename} is not a valid task file: {e}")
+        return -1
+    except Exception as e:
+        print(f"Error: Import failed after {written} tasks: {e}")
+        return -1
+
+    if os.path.exists(state_path(filename)):
+        os.remove(state_path(filename))
+    return written
+
+
+def create_client(args: argparse.Namespace) -> Tuple[Any, str]:
+    """
+    Build the client and resolve the user from command line options.
+
+    Returns:
+        (client, user_id)
+    """
+    if args.postgrest_url:
+        from postgrest import SyncPostgrestClient
+
+        client = SyncPostgrestClient(args.postgrest_url)
+        if args.token:
+            client.auth(args.token)
+        if not args.user_id:
+            raise ValueError("--user-id is required with --postgrest-url")
+        return client, args.user_id
+
+    from supabase import create_client as create_supabase_client
+
+    url = args.url or os.environ.get("SUPABASE_URL", "")
+    key = args.key or os.environ.get("SUPABASE_KEY", "")
+    if not url or not key:
+        raise ValueError("missing Supabase credentials (--url/--key or SUPABASE_URL/SUPABASE_KEY)")
+    client = create_supabase_client(url, key)
+
+    if args.email and args.password:
+        response = client.auth.sign_in_with_password({
+            "email": args.email,
+            "password": args.password
+        })
+        return client, response.user.id
+    if not args.user_id:
+        raise ValueError("--user-id is required without --email/--password")
+    return client, args.user_id
+
+
+def main() -> None:
+    """Command line entry point."""
+    parser = argparse.ArgumentParser(description="Importa tareas desde JSON a Supabase")
+    parser.add_argument('filename', help="tareas.json o tareas_web.json")
+    parser.add_argument('--url', help="Supabase URL (default: $SUPABASE_URL)")
+    parser.add_argument('--key', help="Supabase key (default: $SUPABASE_KEY)")
+    parser.add_argument('--email', help="user email to sign in with")
+    parser.add_argument('--password', help="user password to sign in with")
+    parser.add_argument('--user-id', help="owner of the tasks (service key or PostgREST)")
+    parser.add_argument('--postgrest-url', help="talk to a plain PostgREST server instead")
+    parser.add_argument('--token', help="JWT for --postgrest-url")
+    parser.add_argument('--batch-size', type=int, default=DEFAULT_BATCH_SIZE)
+    parser.add_argument('--categoria', default=DEFAULT_CATEGORIA)
+    parser.add_argument('--restart', action='store_true',
+                        help="ignore a previous interrupted import")
+    args = parser.parse_args()
+
+    try:
+        client, user_id = create_client(args)
+    except Exception as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+
+    written = import_tasks(client, args.filename, user_id, args.batch_size,
+                           args.categoria, resume=not args.restart)
+    if written < 0:
+        sys.exit(1)
+    print(f"Done: {written} tasks imported from {args.filename}")
+
+
+if __name__ == "__main__":
+    main()
@@ -2,24 +2,54 @@
 Data models for the task list application.
 """
 
-from dataclasses import dataclass
-from typing import Optional
+from array import array
+from bisect import bisect_left, bisect_right, insort
+from dataclasses import dataclass, replace
+from datetime import datetime
+from itertools import compress
+from typing import Callable, Dict, Iterable, Iterator, List, Optional
 
 
-@dataclass
+# Format used for task due dates throughout the app
+DATE_FORMAT = "%d/%m/%Y"
+
+
+def parse_date_ordinal(date_str: Optional[str]) -> Optional[int]:
+    """
+    Parse a DD/MM/YYYY date into a proleptic Gregorian ordinal.
+    
+    Args:
+        date_str: Date string, may be None or empty
+        
+    Returns:
+        The date ordinal, or None if the date is missing or invalid
+    """
+    if not date_str:
+        return None
+    try:
+        return datetime.strptime(date_str, DATE_FORMAT).toordinal()
+    except ValueError:
+        return None
+
+
+@dataclass(slots=True)
 class Task:
     """Represents a single task in the application."""
     text: str
     date_str: Optional[str] = None
     status: bool = False  # False = pending, True = completed
+    id: Optional[str] = None  # Remote (Supabase) id once the task is synced
     
     def to_dict(self) -> dict:
         """Convert task to dictionary for JSON serialization."""
-        return {
+        data = {
             'text': self.text,
             'date_str': self.date_str,
             'status': self.status
         }
+        if self.id is not None:
+            data['id'] = self.id
+        return data
     
     @classmethod
     def from_dict(cls, data: dict) -> 'Task':
@@ -27,5 +57,535 @@ class Task:
         return cls(
             text=data['text'],
             date_str=data.get('date_str'),
-            status=data.get('status', False)
+            status=data.get('status', False),
+            id=data.get('id')
         )
+
+
+# Sentinel stored in TaskStore columns for tasks without a (valid) due date
+NO_DATE = 0
+
+
+class TaskStore:
+    """
+    Compact columnar storage for large task lists.
+    
+    Instead of one object per task, the store keeps parallel arrays: a
+    status byte, the due date ordinal (``NO_DATE`` if missing) and ids into
+    an interned string table for the text, the raw date string and the sync
+    id. Repeated texts and dates are stored once. ``Task`` objects are created on access,
+    so mutations must go through the store (e.g. ``set_status``) rather
+    than through a returned task.
+    
+    Iteration, ``len``, indexing, ``append`` and ``del`` behave like a list
+    of tasks, so ``storage.save_tasks`` accepts a store directly. The
+    ``status_column`` and ``due_column`` views can be wrapped with
+    ``numpy.frombuffer`` for vectorized filters.
+    """
+    
+    def __init__(self, tasks: Iterable[Task] = ()):
+        """
+        Initialize the store.
+        
+        Args:
+            tasks: Initial tasks, consumed one at a time
+        """
+        self._status = bytearray()
+        self._due = array('i')
+        self._text_ids = array('i')
+        self._date_ids = array('i')  # -1 = no date string
+        self._remote_ids = array('i')  # -1 = not synced (Task.id is None)
+        self._strings: List[str] = []
+        self._string_ids: Dict[str, int] = {}
+        self.extend(tasks)
+    
+    def _intern(self, value: str) -> int:
+        """Return the string table id of a value, adding it if needed."""
+        string_id = self._string_ids.get(value)
+        if string_id is None:
+            string_id = len(self._strings)
+            self._strings.append(value)
+            self._string_ids[value] = string_id
+        return string_id
+    
+    def _check_index(self, index: int) -> int:
+        """Normalize a (possibly negative) index like a list would."""
+        if index < 0:
+            index += len(self._status)
+        if not 0 <= index < len(self._status):
+            raise IndexError("task index out of range")
+        return index
+    
+    def __len__(self) -> int:
+        return len(self._status)
+    
+    def __iter__(self) -> Iterator[Task]:
+        strings = self._strings
+        for status, text_id, date_id, remote_id in zip(
+                self._status, self._text_ids, self._date_ids, self._remote_ids):
+            yield Task(
+                text=strings[text_id],
+                date_str=strings[date_id] if date_id >= 0 else None,
+                status=bool(status),
+                id=strings[remote_id] if remote_id >= 0 else None
+            )
+    
+    def __getitem__(self, index: int) -> Task:
+        index = self._check_index(index)
+        date_id = self._date_ids[index]
+        remote_id = self._remote_ids[index]
+        return Task(
+            text=self._strings[self._text_ids[index]],
+            date_str=self._strings[date_id] if date_id >= 0 else None,
+            status=bool(self._status[index]),
+            id=self._strings[remote_id] if remote_id >= 0 else None
+        )
+    
+    def __setitem__(self, index: int, task: Task) -> None:
+        index = self._check_index(index)
+        self._status[index] = 1 if task.status else 0
+        self._due[index] = parse_date_ordinal(task.date_str) or NO_DATE
+        self._text_ids[index] = self._intern(task.text)
+        self._date_ids[index] = self._intern(task.date_str) if task.date_str else -1
+        self._remote_ids[index] = self._intern(task.id) if task.id is not None else -1
+    
+    def __delitem__(self, index: int) -> None:
+        index = self._check_index(index)
+        del self._status[index]
+        del self._due[index]
+        del self._text_ids[index]
+        del self._date_ids[index]
+        del self._remote_ids[index]
+    
+    def append(self, task: Task) -> None:
+        """Add a task at the end of the store."""
+        self._status.append(1 if task.status else 0)
+        self._due.append(parse_date_ordinal(task.date_str) or NO_DATE)
+        self._text_ids.append(self._intern(task.text))
+        self._date_ids.append(self._intern(task.date_str) if task.date_str else -1)
+        self._remote_ids.append(self._intern(task.id) if task.id is not None else -1)
+    
+    def extend(self, tasks: Iterable[Task]) -> None:
+        """Add several tasks at the end of the store."""
+        for task in tasks:
+            self.append(task)
+    
+    def set_status(self, index: int, status: bool) -> None:
+        """Mark a task as completed (True) or pending (False)."""
+        self._status[self._check_index(index)] = 1 if status else 0
+    
+    def status_column(self) -> memoryview:
+        """Read-only view of the status bytes (1 = completed)."""
+        return memoryview(self._status).toreadonly()
+    
+    def due_column(self) -> memoryview:
+        """Read-only view of the due date ordinals (``NO_DATE`` if missing)."""
+        return memoryview(self._due).toreadonly()
+    
+    def completed_indices(self) -> List[int]:
+        """Indexes of completed tasks."""
+        return list(compress(range(len(self._status)), self._status))
+    
+    def pending_indices(self) -> List[int]:
+        """Indexes of pending tasks."""
+        pending = self._status.translate(_INVERT_STATUS)
+        return list(compress(range(len(pending)), pending))
+    
+    def due_between_indices(self, start: int, end: int) -> List[int]:
+        """
+        Indexes of tasks due between two date ordinals (inclusive).
+        
+        Args:
+            start: First date ordinal of the range
+            end: Last date ordinal of the range
+            
+        Returns:
+            Matching task indexes in list order
+        """
+        return [i for i, due in enumerate(self._due) if start <= due <= end]
+    
+    def overdue_indices(self, today: int) -> List[int]:
+        """
+        Indexes of pending tasks due before a given day.
+        
+        Args:
+            today: Date ordinal of the current day
+            
+        Returns:
+            Matching task indexes in list order
+        """
+        status = self._status
+        return [i for i, due in enumerate(self._due)
+                if NO_DATE < due < today and not status[i]]
+    
+    def compact(self) -> None:
+        """Drop strings that are no longer referenced by any task."""
+        self.__dict__.update(TaskStore(self).__dict__)
+
+
+# Translation table that turns status bytes into "is pending" bytes
+_INVERT_STATUS = bytes([1]) + bytes(255)
+
+
+# Kinds of change reported by ObservableTaskList
+INSERT = "insert"
+UPDATE = "update"
+REMOVE = "remove"
+RESET = "reset"
+# Bulk changes touching arbitrary positions at once
+INSERT_MANY = "insert_many"
+UPDATE_MANY = "update_many"
+REMOVE_MANY = "remove_many"
+
+
+@dataclass(slots=True)
+class TaskChange:
+    """
+    A change to an ObservableTaskList.
+    
+    ``index`` is the first affected position and ``count`` the number of
+    affected tasks (inserts from ``extend`` report several at once). For
+    updates and removals ``previous`` is the task as it was before the
+    change. Resets replace the whole list and carry no index.
+    
+    Bulk changes list their ascending positions in ``indices`` (positions
+    before the change for removals, after it for inserts) and, for updates
+    and removals, the previous tasks in the same order in
+    ``previous_tasks``.
+    """
+    kind: str
+    index: int = 0
+    count: int = 1
+    previous: Optional[Task] = None
+    indices: Optional[List[int]] = None
+    previous_tasks: Optional[List[Task]] = None
+
+
+class DueDateIndex:
+    """
+    Sorted multiset of due date ordinals.
+    
+    Answers "how many are due before / between" with a binary search
+    instead of a scan. ``NO_DATE`` values are ignored.
+    """
+    
+    def __init__(self, ordinals: Iterable[int] = ()):
+        """
+        Initialize the index.
+        
+        Args:
+            ordinals: Initial due date ordinals
+        """
+        self._ordinals = sorted(o for o in ordinals if o != NO_DATE)
+    
+    def __len__(self) -> int:
+        return len(self._ordinals)
+    
+    def add(self, ordinal: int) -> None:
+        """Add one due date."""
+        if ordinal != NO_DATE:
+            insort(self._ordinals, ordinal)
+    
+    def update(self, ordinals: Iterable[int]) -> None:
+        """Add many due dates at once (one merge instead of many inserts)."""
+        self._ordinals.extend(o for o in ordinals if o != NO_DATE)
+        self._ordinals.sort()
+    
+    def remove(self, ordinal: int) -> None:
+        """Remove one occurrence of a due date, if present."""
+        i = bisect_left(self._ordinals, ordinal)
+        if ordinal != NO_DATE and i < len(self._ordinals) and self._ordinals[i] == ordinal:
+            del self._ordinals[i]
+    
+    def count_before(self, ordinal: int) -> int:
+        """Number of due dates strictly before a date ordinal."""
+        return bisect_left(self._ordinals, ordinal)
+    
+    def count_between(self, start: int, end: int) -> int:
+        """Number of due dates between two date ordinals (inclusive)."""
+        return max(0, bisect_right(self._ordinals, end) - bisect_left(self._ordinals, start))
+
+
+class ObservableTaskList:
+    """
+    List of tasks that reports every mutation to its listeners.
+    
+    Views subscribe with ``subscribe`` and receive a ``TaskChange`` after
+    each insert, update or removal, so they can redraw only the affected
+    rows. Mutations must go through the list (e.g. ``set_status`` or item
+    assignment); changing a returned ``Task`` in place is not reported.
+    
+    Due dates are parsed once, when a task enters the list or its date
+    changes, and kept as ordinals (``due``). ``pending_due`` indexes the due
+    dates of pending tasks, so overdue counts need no scan.
+    """
+    
+    def __init__(self, tasks: Iterable[Task] = ()):
+        """
+        Initialize the list.
+        
+        Args:
+            tasks: Initial tasks
+        """
+        self._tasks: List[Task] = []
+        self._due = array('i')
+        self.pending_due = DueDateIndex()
+        self._listeners: List[Callable[[TaskChange], None]] = []
+        self._load(tasks)
+    
+    def _load(self, tasks: Iterable[Task]) -> None:
+        """Replace the tasks and rebuild the due date caches."""
+        self._tasks = list(tasks)
+        self._due = array('i', (parse_date_ordinal(task.date_str) or NO_DATE
+                                for task in self._tasks))
+        self.pending_due = DueDateIndex(due for task, due in zip(self._tasks, self._due)
+                                        if not task.status)
+    
+    def subscribe(self, listener: Callable[[TaskChange], None]) -> None:
+        """Register a callback for changes."""
+        self._listeners.append(listener)
+    
+    def unsubscribe(self, listener: Callable[[TaskChange], None]) -> None:
+        """Remove a callback registered with ``subscribe``."""
+        self._listeners.remove(listener)
+    
+    def _notify(self, change: TaskChange) -> None:
+        for listener in list(self._listeners):
+            listener(change)
+    
+    def __len__(self) -> int:
+        return len(self._tasks)
+    
+    def __iter__(self) -> Iterator[Task]:
+        return iter(self._tasks)
+    
+    def __getitem__(self, index: int) -> Task:
+        return self._tasks[index]
+    
+    def __setitem__(self, index: int, task: Task) -> None:
+        index = self._check_index(index)
+        previous = self._tasks[index]
+        due = self._due[index]
+        if task.date_str != previous.date_str:
+            due = parse_date_ordinal(task.date_str) or NO_DATE
+        if not previous.status:
+            self.pending_due.remove(self._due[index])
+        if not task.status:
+            self.pending_due.add(due)
+        self._tasks[index] = task
+        self._due[index] = due
+        self._notify(TaskChange(UPDATE, index, previous=previous))
+    
+    def __delitem__(self, index: int) -> None:
+        index = self._check_index(index)
+        previous = self._tasks.pop(index)
+        if not previous.status:
+            self.pending_due.remove(self._due[index])
+        del self._due[index]
+        self._notify(TaskChange(REMOVE, index, previous=previous))
+    
+    def _check_index(self, index: int) -> int:
+        """Normalize a (possibly negative) index like a list would."""
+        if index < 0:
+            index += len(self._tasks)
+        if not 0 <= index < len(self._tasks):
+            raise IndexError("task index out of range")
+        return index
+    
+    def due(self, index: int) -> Optional[int]:
+        """Due date ordinal of a task, or None if it has no valid date."""
+        due = self._due[index]
+        return due if due != NO_DATE else None
+    
+    def is_overdue(self, index: int, today: int) -> bool:
+        """
+        Tell whether a task is pending and due before a given day.
+        
+        Args:
+            index: Index of the task
+            today: Date ordinal of the current day
+        """
+        return NO_DATE < self._due[index] < today and not self._tasks[index].status
+    
+    def overdue_count(self, today: int) -> int:
+        """Number of pending tasks due before a given day."""
+        return self.pending_due.count_before(today)
+    
+    def append(self, task: Task, due: Optional[int] = None) -> None:
+        """
+        Add a task at the end of the list.
+        
+        Args:
+            task: Task to add
+            due: Its already parsed due date ordinal, if known
+        """
+        self.insert(len(self._tasks), task, due)
+    
+    def insert(self, index: int, task: Task, due: Optional[int] = None) -> None:
+        """Insert a task before a position (see ``append``)."""
+        index = max(0, min(index if index >= 0 else index + len(self._tasks),
+                           len(self._tasks)))
+        if due is None:
+            due = parse_date_ordinal(task.date_str)
+        due = due or NO_DATE
+        self._tasks.insert(index, task)
+        self._due.insert(index, due)
+        if not task.status:
+            self.pending_due.add(due)
+        self._notify(TaskChange(INSERT, index))
+    
+    def extend(self, tasks: Iterable[Task],
+               dues: Optional[Iterable[Optional[int]]] = None) -> None:
+        """
+        Add several tasks at the end, reported as a single change.
+        
+        Args:
+            tasks: Tasks to add
+            dues: Their already parsed due date ordinals, if known
+        """
+        start = len(self._tasks)
+        if dues is None:
+            pairs = ((task, parse_date_ordinal(task.date_str)) for task in tasks)
+        else:
+            pairs = zip(tasks, dues)
+        pending = []
+        for task, due in pairs:
+            due = due or NO_DATE
+            self._tasks.append(task)
+            self._due.append(due)
+            if not task.status:
+                pending.append(due)
+        self.pending_due.update(pending)
+        if len(self._tasks) > start:
+            self._notify(TaskChange(INSERT, start, len(self._tasks) - start))
+    
+    def set_status(self, index: int, status: bool) -> None:
+        """Mark a task as completed (True) or pending (False)."""
+        task = self._tasks[self._check_index(index)]
+        self[index] = replace(task, status=status)
+    
+    def set_status_many(self, indices: Iterable[int], status: bool) -> List[int]:
+        """
+        Set the status of several tasks, reported as a single change.
+        
+        Args:
+            indices: Positions of the tasks
+            status: New status
+            
+        Returns:
+            Positions whose status actually changed, ascending
+        """
+        changed = sorted(i for i in {self._check_index(i) for i in indices}
+                         if self._tasks[i].status != status)
+        self.update_many(changed, [replace(self._tasks[i], status=status) for i in changed])
+        return changed
+    
+    def update_many(self, indices: List[int], tasks: List[Task]) -> None:
+        """
+        Replace several tasks, reported as a single change.
+        
+        Args:
+            indices: Ascending positions of the tasks
+            tasks: New tasks, in the same order
+        """
+        if not indices:
+            return
+        previous_tasks = []
+        for i, task in zip(indices, tasks):
+            i = self._check_index(i)
+            previous = self._tasks[i]
+            due = self._due[i]
+            if task.date_str != previous.date_str:
+                due = parse_date_ordinal(task.date_str) or NO_DATE
+            if not previous.status:
+                self.pending_due.remove(self._due[i])
+            if not task.status:
+                self.pending_due.add(due)
+            previous_tasks.append(previous)
+            self._tasks[i] = task
+            self._due[i] = due
+        self._notify(TaskChange(UPDATE_MANY, indices[0], len(indices),
+                                indices=list(indices), previous_tasks=previous_tasks))
+    
+    def insert_many(self, indices: List[int], tasks: List[Task],
+                    dues: Optional[List[Optional[int]]] = None) -> None:
+        """
+        Insert several tasks in one pass, reported as a single change.
+        
+        This is the inverse of ``delete_many``: ``indices`` are the
+        ascending positions the tasks will have once inserted.
+        
+        Args:
+            indices: Final positions of the new tasks, ascending
+            tasks: Tasks to insert, in the same order
+            dues: Their already parsed due date ordinals, if known
+        """
+        if not indices:
+            return
+        if dues is None:
+            dues = [parse_date_ordinal(task.date_str) for task in tasks]
+        total = len(self._tasks) + len(indices)
+        if indices[-1] >= total:
+            raise IndexError("task index out of range")
+        
+        new_tasks: List[Task] = []
+        new_due = array('i')
+        old = 0
+        pending = []
+        for i, task, due in zip(indices, tasks, dues):
+            take = i - len(new_tasks)
+            new_tasks.extend(self._tasks[old:old + take])
+            new_due.extend(self._due[old:old + take])
+            old += take
+            new_tasks.append(task)
+            new_due.append(due or NO_DATE)
+            if not task.status:
+                pending.append(due or NO_DATE)
+        new_tasks.extend(self._tasks[old:])
+        new_due.extend(self._due[old:])
+        
+        self._tasks = new_tasks
+        self._due = new_due
+        if len(pending) > 64:
+            self.pending_due.update(pending)
+        else:
+            for due in pending:
+                self.pending_due.add(due)
+        self._notify(TaskChange(INSERT_MANY, indices[0], len(indices),
+                                indices=list(indices)))
+    
+    def delete_many(self, indices: Iterable[int]) -> List[int]:
+        """
+        Remove several tasks in one pass, reported as a single change.
+        
+        Args:
+            indices: Positions of the tasks
+            
+        Returns:
+            Removed positions (before removal), ascending
+        """
+        removed = sorted({self._check_index(i) for i in indices})
+        if not removed:
+            return []
+        
+        previous_tasks = [self._tasks[i] for i in removed]
+        previous_dues = [self._due[i] for i in removed]
+        doomed = set(removed)
+        keep = [i not in doomed for i in range(len(self._tasks))]
+        self._tasks = list(compress(self._tasks, keep))
+        self._due = array('i', compress(self._due, keep))
+        if len(removed) > 64:
+            self.pending_due = DueDateIndex(due for task, due in zip(self._tasks, self._due)
+                                            if not task.status)
+        else:
+            for task, due in zip(previous_tasks, previous_dues):
+                if not task.status:
+                    self.pending_due.remove(due)
+        self._notify(TaskChange(REMOVE_MANY, removed[0], len(removed),
+                                indices=removed, previous_tasks=previous_tasks))
+        return removed
+    
+    def reset(self, tasks: Iterable[Task]) -> None:
+        """Replace every task (e.g. after loading)."""
+        self._load(tasks)
+        self._notify(TaskChange(RESET, 0, len(self._tasks)))
@@ -0,0 +1,15 @@
+-- Script para paginar la lista de tareas por cursor (ver app_web.py)
+-- Ejecuta este script en el SQL Editor de Supabase
+
+-- 1. Texto en minúsculas para ordenar alfabéticamente con índice
+ALTER TABLE tareas
+ADD COLUMN IF NOT EXISTS texto_lower TEXT GENERATED ALWAYS AS (lower(texto)) STORED;
+
+-- 2. Índices compuestos: uno por criterio de orden, con el id como desempate.
+-- Cada página se lee en orden desde el cursor sin recorrer las anteriores.
+CREATE INDEX IF NOT EXISTS idx_tareas_user_fecha_id ON tareas(user_id, fecha, id);
+CREATE INDEX IF NOT EXISTS idx_tareas_user_texto_id ON tareas(user_id, texto_lower, id);
+CREATE INDEX IF NOT EXISTS idx_tareas_user_completada_id ON tareas(user_id, completada, id);
+CREATE INDEX IF NOT EXISTS idx_tareas_user_urgente_id ON tareas(user_id, urgente, id);
+
+COMMENT ON COLUMN tareas.texto_lower IS 'Texto en minúsculas, para ordenar y paginar alfabéticamente';
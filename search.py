@@ -0,0 +1,250 @@
+"""
+Incremental text search over an ObservableTaskList.
+
+Task texts are normalized (accents removed, case folded, so "Reunión"
+matches "reunion") and split into tokens. The index keeps a posting set per
+token and a sorted vocabulary, so every query word is matched as a prefix
+with a binary search instead of scanning the tasks. It also keeps the
+completed tasks and the due dates of pending ones, so the quick filters
+are set intersections too. The index follows the list's change events,
+so it never needs a full rebuild after a load.
+"""
+
+import re
+import unicodedata
+from bisect import bisect_left, insort
+from functools import lru_cache
+from typing import Dict, List, Optional, Set
+
+from models import (INSERT, INSERT_MANY, REMOVE, REMOVE_MANY, RESET, UPDATE,
+                    UPDATE_MANY, ObservableTaskList, Task, TaskChange)
+
+
+_TOKEN = re.compile(r"\w+")
+
+
+def normalize(text: str) -> str:
+    """
+    Fold a text for accent- and case-insensitive matching.
+
+    Args:
+        text: Text to normalize
+
+    Returns:
+        The text without combining marks, case folded
+    """
+    if text.isascii():
+        return text.casefold()
+    decomposed = unicodedata.normalize('NFKD', text)
+    return "".join(c for c in decomposed if not unicodedata.combining(c)).casefold()
+
+
+# Words repeat a lot across tasks, so folded tokens are cached
+_fold_token = lru_cache(maxsize=65536)(normalize)
+
+
+def tokenize(text: str) -> List[str]:
+    """Split a text into normalized word tokens."""
+    return [_fold_token(token) for token in _TOKEN.findall(text)]
+
+
+class TaskSearchIndex:
+    """
+    Token/prefix index over the texts of an ObservableTaskList.
+
+    Each task gets a stable key when it enters the list; postings refer to
+    keys, so inserts and removals elsewhere in the list do not touch them.
+    Keys are mapped back to positions when a query runs.
+
+    Completed tasks and the due dates of pending ones are kept by key as
+    well, so filtering by status or overdue intersects sets instead of
+    reading every task.
+    """
+
+    def __init__(self, tasks: ObservableTaskList):
+        """
+        Build the index and follow the list's changes.
+
+        Args:
+            tasks: List to index
+        """
+        self.tasks = tasks
+        self._keys: List[int] = []
+        self._next_key = 0
+        self._postings: Dict[str, Set[int]] = {}
+        self._vocabulary: List[str] = []
+        self._completed: Set[int] = set()
+        # key -> due date ordinal, for pending tasks with a date
+        self._pending_due: Dict[int, int] = {}
+        # key -> position, rebuilt lazily after inserts/removals in the middle
+        self._positions: Optional[Dict[int, int]] = {}
+        self._rebuild()
+        tasks.subscribe(self._on_change)
+
+    def _rebuild(self) -> None:
+        self._keys = []
+        self._postings = {}
+        self._vocabulary = []
+        self._completed = set()
+        self._pending_due = {}
+        self._positions = {}
+        self._insert(0, len(self.tasks))
+
+    def _add_tokens(self, key: int, text: str) -> None:
+        for token in set(tokenize(text)):
+            posting = self._postings.get(token)
+            if posting is None:
+                posting = self._postings[token] = set()
+                insort(self._vocabulary, token)
+            posting.add(key)
+
+    def _remove_tokens(self, key: int, text: str) -> None:
+        for token in set(tokenize(text)):
+            posting = self._postings.get(token)
+            if posting is None:
+                continue
+            posting.discard(key)
+            if not posting:
+                del self._postings[token]
+                del self._vocabulary[bisect_left(self._vocabulary, token)]
+
+    def _add_state(self, key: int, index: int) -> None:
+        """Record the status and due date of the task at a position."""
+        if self.tasks[index].status:
+            self._completed.add(key)
+        else:
+            due = self.tasks.due(index)
+            if due is not None:
+                self._pending_due[key] = due
+
+    def _remove_state(self, key: int) -> None:
+        self._completed.discard(key)
+        self._pending_due.pop(key, None)
+
+    def _new_key(self, index: int) -> int:
+        """Give a key to the task at a position and index it."""
+        key = self._next_key
+        self._next_key += 1
+        self._add_tokens(key, self.tasks[index].text)
+        self._add_state(key, index)
+        return key
+
+    def _update(self, index: int, previous: Task) -> None:
+        """Reindex the task at a position after it changed."""
+        key = self._keys[index]
+        text = self.tasks[index].text
+        if text != previous.text:
+            self._remove_tokens(key, previous.text)
+            self._add_tokens(key, text)
+        self._remove_state(key)
+        self._add_state(key, index)
+
+    def _insert(self, index: int, count: int) -> None:
+        """Give new keys to tasks inserted at a position and index them."""
+        keys = [self._new_key(i) for i in range(index, index + count)]
+
+        appended = index == len(self._keys)
+        self._keys[index:index] = keys
+        if appended and self._positions is not None:
+            for offset, key in enumerate(keys):
+                self._positions[key] = index + offset
+        else:
+            self._positions = None
+
+    def _on_change(self, change: TaskChange) -> None:
+        if change.kind == INSERT:
+            self._insert(change.index, change.count)
+        elif change.kind == UPDATE:
+            self._update(change.index, change.previous)
+        elif change.kind == REMOVE:
+            key = self._keys.pop(change.index)
+            self._remove_tokens(key, change.previous.text)
+            self._remove_state(key)
+            self._positions = None
+        elif change.kind == INSERT_MANY:
+            keys = [self._new_key(index) for index in change.indices]
+            merged = []
+            old = 0
+            for index, key in zip(change.indices, keys):
+                take = index - len(merged)
+                merged.extend(self._keys[old:old + take])
+                old += take
+                merged.append(key)
+            merged.extend(self._keys[old:])
+            self._keys = merged
+            self._positions = None
+        elif change.kind == UPDATE_MANY:
+            for index, previous in zip(change.indices, change.previous_tasks):
+                self._update(index, previous)
+        elif change.kind == REMOVE_MANY:
+            doomed = set(change.indices)
+            for index, previous in zip(change.indices, change.previous_tasks):
+                key = self._keys[index]
+                self._remove_tokens(key, previous.text)
+                self._remove_state(key)
+            self._keys = [key for i, key in enumerate(self._keys) if i not in doomed]
+            self._positions = None
+        elif change.kind == RESET:
+            self._rebuild()
+
+    def _prefix_matches(self, prefix: str) -> Set[int]:
+        """Keys of tasks with a token starting with a prefix."""
+        vocabulary = self._vocabulary
+        i = bisect_left(vocabulary, prefix)
+        matches: Set[int] = set()
+        while i < len(vocabulary) and vocabulary[i].startswith(prefix):
+            matches |= self._postings[vocabulary[i]]
+            i += 1
+        return matches
+
+    def search(self, query: str, completed: Optional[bool] = None,
+               overdue_before: Optional[int] = None) -> Optional[List[int]]:
+        """
+        Find the tasks matching every word of a query and a quick filter.
+
+        Each query word matches tokens it is a prefix of, so results
+        update as the user types.
+
+        Args:
+            query: Words to look for
+            completed: Keep only completed (True) or pending (False) tasks
+            overdue_before: Keep only pending tasks due before this date
+                ordinal
+
+        Returns:
+            Matching task positions in list order, or None if nothing is
+            filtered (no query words and no filter)
+        """
+        terms = sorted(set(tokenize(query)), key=len, reverse=True)
+        matches: Optional[Set[int]] = None
+        for term in terms:
+            found = self._prefix_matches(term)
+            matches = found if matches is None else matches & found
+            if not matches:
+                return []
+
+        if overdue_before is not None:
+            candidates = self._pending_due.keys() if matches is None else matches
+            pending_due = self._pending_due
+            matches = {key for key in candidates
+                       if pending_due.get(key, overdue_before) < overdue_before}
+        elif completed:
+            matches = self._completed if matches is None else matches & self._completed
+        elif completed is not None:
+            if matches is None:
+                done = self._completed
+                return [i for i, key in enumerate(self._keys) if key not in done]
+            matches = matches - self._completed
+        elif matches is None:
+            return None
+        return self._to_positions(matches)
+
+    def _to_positions(self, keys: Set[int]) -> List[int]:
+        """Positions of a set of keys, in list order."""
+        if len(keys) * 8 > len(self._keys):
+            # Most of the list: one ordered pass beats sorting
+            return [i for i, key in enumerate(self._keys) if key in keys]
+        if self._positions is None:
+            self._positions = {key: i for i, key in enumerate(self._keys)}
+        positions = self._positions
+        return sorted(positions[key] for key in keys)
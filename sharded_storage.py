@@ -0,0 +1,293 @@
+"""
+Time-sharded task storage.
+
+Tasks are split into one JSON file per month of their due date
+(``2025-09.json``) plus an ``undated.json`` shard, with a small
+``manifest.json`` listing the shards and their task counts. Views load
+only the shards they need, and a storage that follows the app's task list
+(``track``) learns which shards each change touches, so saves rewrite only
+those and old months are never touched by day-to-day use.
+"""
+
+import json
+import os
+import sys
+from datetime import date
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional, Set
+
+from models import (INSERT, INSERT_MANY, REMOVE, REMOVE_MANY, RESET, UPDATE,
+                    UPDATE_MANY, ObservableTaskList, Task, TaskChange,
+                    parse_date_ordinal)
+from storage import atomic_write, load_tasks, save_tasks
+
+
+MANIFEST_NAME = "manifest.json"
+MANIFEST_VERSION = 1
+
+# Shard holding tasks without a (valid) due date
+UNDATED = "undated"
+
+
+@lru_cache(maxsize=8192)
+def _date_shard(date_str: Optional[str]) -> str:
+    ordinal = parse_date_ordinal(date_str)
+    if ordinal is None:
+        return UNDATED
+    due = date.fromordinal(ordinal)
+    return f"{due.year:04d}-{due.month:02d}"
+
+
+def shard_key(task: Task) -> str:
+    """Return the shard a task belongs to ('YYYY-MM' or 'undated')."""
+    # Dates repeat a lot across tasks, so the month of each is cached
+    return _date_shard(task.date_str)
+
+
+class ShardedStorage:
+    """
+    Task storage split into monthly shards under a directory.
+
+    ``load`` returns the tasks of the requested shards, ordered by shard
+    (months ascending, undated last) and by position within each shard.
+    ``save`` takes the caller's current view of the loaded tasks and
+    writes back the shards that changed: with ``track`` these are the
+    shards touched by the list's changes since the last save, without it
+    every loaded shard. Shards that were not loaded are left alone, except
+    when a task is moved into one of them, in which case the task is
+    appended to that shard's existing contents.
+    """
+
+    def __init__(self, directory: str = "tareas"):
+        """
+        Initialize the storage.
+
+        Args:
+            directory: Directory holding the manifest and shard files
+        """
+        self.directory = directory
+        self._manifest = self._read_manifest()
+        self._loaded: set = set()
+        # Existing contents of unloaded shards that received new tasks
+        self._hidden: Dict[str, List[Task]] = {}
+        # Shards changed since the last save; None until ``track`` is used
+        self._dirty: Optional[Set[str]] = None
+
+    def _path(self, name: str) -> str:
+        return os.path.join(self.directory, name)
+
+    def _read_manifest(self) -> dict:
+        """Read the manifest, starting fresh if it is missing or invalid."""
+        path = self._path(MANIFEST_NAME)
+        empty = {'version': MANIFEST_VERSION, 'shards': {}}
+        if not os.path.exists(path):
+            return empty
+
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                manifest = json.load(f)
+            if not isinstance(manifest, dict) or not isinstance(manifest.get('shards'), dict):
+                print(f"Warning: {path} contains invalid data format. Starting with empty manifest.")
+                return empty
+            return manifest
+        except json.JSONDecodeError as e:
+            print(f"Warning: {path} is corrupted (invalid JSON). Starting with empty manifest.")
+            print(f"JSON Error: {e}")
+            return empty
+        except Exception as e:
+            print(f"Unexpected error loading {path}: {e}")
+            return empty
+
+    def available_shards(self) -> List[str]:
+        """Shard keys present in the manifest, in load order."""
+        return sorted(self._manifest['shards'], key=_shard_order)
+
+    def shards_between(self, start: date, end: date,
+                       include_undated: bool = True) -> List[str]:
+        """
+        Shard keys needed to show tasks due in a date range.
+
+        Args:
+            start: First day of the range
+            end: Last day of the range
+            include_undated: Whether to include the undated shard
+
+        Returns:
+            Existing shard keys overlapping the range, in load order
+        """
+        first = f"{start.year:04d}-{start.month:02d}"
+        last = f"{end.year:04d}-{end.month:02d}"
+        return [key for key in self.available_shards()
+                if (key == UNDATED and include_undated)
+                or (key != UNDATED and first <= key <= last)]
+
+    def task_count(self, key: str) -> int:
+        """Number of tasks in a shard according to the manifest."""
+        entry = self._manifest['shards'].get(key)
+        return entry['count'] if entry else 0
+
+    def load(self, shards: Optional[Iterable[str]] = None) -> List[Task]:
+        """
+        Load the tasks of some or all shards.
+
+        Args:
+            shards: Shard keys to load, or None for every shard
+
+        Returns:
+            List of Task objects
+        """
+        keys = self.available_shards() if shards is None else sorted(set(shards), key=_shard_order)
+        tasks: List[Task] = []
+        for key in keys:
+            self._hidden.pop(key, None)
+            self._loaded.add(key)
+            entry = self._manifest['shards'].get(key)
+            if entry:
+                tasks.extend(load_tasks(self._path(entry['file'])))
+        return tasks
+
+    def track(self, tasks: ObservableTaskList) -> None:
+        """
+        Follow a task list holding the loaded shards, to save only what changed.
+
+        Args:
+            tasks: List filled with the result of ``load``
+        """
+        self._dirty = set()
+        tasks.subscribe(lambda change: self._on_change(tasks, change))
+
+    def _on_change(self, tasks: ObservableTaskList, change: TaskChange) -> None:
+        """Mark the shards a change to the tracked list touched."""
+        dirty = self._dirty
+        if change.kind == RESET:
+            dirty.update(self._loaded)
+            dirty.update(shard_key(task) for task in tasks)
+            return
+        if change.previous is not None:
+            dirty.add(shard_key(change.previous))
+        if change.previous_tasks:
+            dirty.update(shard_key(task) for task in change.previous_tasks)
+        if change.kind in (INSERT, UPDATE):
+            dirty.update(shard_key(tasks[i])
+                         for i in range(change.index, change.index + change.count))
+        elif change.kind in (INSERT_MANY, UPDATE_MANY):
+            dirty.update(shard_key(tasks[i]) for i in change.indices)
+
+    def save(self, tasks: Iterable[Task]) -> bool:
+        """
+        Write back the shards affected by the given tasks.
+
+        Args:
+            tasks: Current tasks of every loaded shard (e.g. the list
+                returned by ``load`` after the user's changes)
+
+        Returns:
+            True if successful, False otherwise
+        """
+        if self._dirty is None:
+            groups: Dict[str, List[Task]] = {key: [] for key in self._loaded | set(self._hidden)}
+            for task in tasks:
+                groups.setdefault(shard_key(task), []).append(task)
+        else:
+            # Clean shards are neither serialized nor compared
+            groups = {key: [] for key in self._dirty}
+            if not groups:
+                return True
+            for task in tasks:
+                group = groups.get(shard_key(task))
+                if group is not None:
+                    group.append(task)
+
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+        except OSError as e:
+            print(f"Error: Cannot create {self.directory}: {e}")
+            return False
+
+        shards = self._manifest['shards']
+        changed = False
+        for key, group in groups.items():
+            if key not in self._loaded and key in shards:
+                if key not in self._hidden:
+                    self._hidden[key] = load_tasks(self._path(shards[key]['file']))
+                group = self._hidden[key] + group
+
+            entry = shards.get(key)
+            filename = f"{key}.json"
+            if not group:
+                if entry:
+                    path = self._path(entry['file'])
+                    try:
+                        if os.path.exists(path):
+                            os.remove(path)
+                    except OSError as e:
+                        print(f"Error: Cannot remove {path}: {e}")
+                        return False
+                    del shards[key]
+                    changed = True
+                continue
+
+            if not save_tasks(group, self._path(filename)):
+                return False
+            shards[key] = {'file': filename, 'count': len(group)}
+            changed = True
+
+        if changed and not self._write_manifest():
+            return False
+        if self._dirty is not None:
+            self._dirty.clear()
+        return True
+
+    def _write_manifest(self) -> bool:
+        """Atomically write the manifest."""
+        path = self._path(MANIFEST_NAME)
+        try:
+            data = json.dumps(self._manifest, ensure_ascii=False, indent=2)
+            atomic_write(path, data.encode('utf-8'))
+            return True
+        except PermissionError:
+            print(f"Error: Permission denied writing to {path}")
+            return False
+        except OSError as e:
+            print(f"Error: Cannot write to {path}: {e}")
+            return False
+
+
+def _shard_order(key: str) -> tuple:
+    """Sort months ascending with the undated shard last."""
+    return (key == UNDATED, key)
+
+
+def migrate_json_to_shards(json_filename: str = "tareas.json",
+                           directory: str = "tareas") -> int:
+    """
+    Split a single JSON task file into monthly shards.
+
+    Args:
+        json_filename: Path to the existing JSON file
+        directory: Directory for the sharded layout
+
+    Returns:
+        Number of migrated tasks, or -1 on failure
+    """
+    tasks = load_tasks(json_filename)
+    sharded = ShardedStorage(directory)
+    sharded.load()
+    if not sharded.save(tasks):
+        return -1
+    return len(tasks)
+
+
+def main() -> None:
+    """Migrate a JSON task file: python sharded_storage.py [tareas.json] [tareas]"""
+    json_filename = sys.argv[1] if len(sys.argv) > 1 else "tareas.json"
+    directory = sys.argv[2] if len(sys.argv) > 2 else "tareas"
+
+    count = migrate_json_to_shards(json_filename, directory)
+    if count < 0:
+        sys.exit(1)
+    print(f"Migrated {count} tasks from {json_filename} to {directory}/")
+
+
+if __name__ == "__main__":
+    main()
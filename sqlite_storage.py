@@ -0,0 +1,431 @@
+"""
+SQLite storage backend for tasks.
+
+Provides the same ``load_tasks``/``save_tasks`` contract as ``storage`` plus
+indexed queries (pending, overdue, due within a range), so views can fetch
+only the rows they need instead of scanning the whole list. Journal
+operations are applied in place, so a change writes only the rows it
+touches instead of the whole list. ``storage`` dispatches to this module
+for files ending in one of ``SQLITE_EXTENSIONS``.
+"""
+
+import os
+import sqlite3
+import sys
+import threading
+from datetime import date
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from models import Task, parse_date_ordinal
+
+
+# File extensions handled by this backend
+SQLITE_EXTENSIONS = (".db", ".sqlite", ".sqlite3")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS tasks (
+    id INTEGER PRIMARY KEY,
+    text TEXT NOT NULL,
+    date_str TEXT,
+    due INTEGER,
+    status INTEGER NOT NULL DEFAULT 0,
+    position INTEGER,
+    remote_id TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_tasks_due ON tasks(due);
+CREATE INDEX IF NOT EXISTS idx_tasks_status_due ON tasks(status, due);
+"""
+
+# Sort key of the list order. Keys are spaced POSITION_STEP apart so a
+# row can be inserted between two others without renumbering the rest
+_POSITION_INDEX = "CREATE INDEX IF NOT EXISTS idx_tasks_position ON tasks(position)"
+POSITION_STEP = 1 << 20
+
+_COLUMNS = "text, date_str, status, remote_id"
+
+class _RowOrder:
+    """Row ids and position keys of a database, in list order."""
+
+    def __init__(self, rows: Iterable[Tuple[int, int]] = ()):
+        self.ids: List[int] = []
+        self.positions: List[int] = []
+        for row_id, position in rows:
+            self.ids.append(row_id)
+            self.positions.append(position)
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+
+# Row order per database, with the file signature it was read at, so list
+# positions resolve to rows without an OFFSET scan
+_row_ids: Dict[str, Tuple[Tuple[int, int], _RowOrder]] = {}
+_row_ids_lock = threading.Lock()
+
+
+class InvalidOperationError(ValueError):
+    """
+    Some operations of a batch could not be applied and were dropped.
+
+    Unlike an I/O error this is permanent: writing the same operations
+    again would fail the same way, so they must not be retried.
+    """
+
+    def __init__(self, operations: List[dict], reasons: List[str]):
+        super().__init__(f"{len(operations)} invalid operation(s): {'; '.join(reasons)}")
+        self.operations = operations
+        self.reasons = reasons
+
+
+def is_sqlite_path(filename: str) -> bool:
+    """Return True if the file should be handled by the SQLite backend."""
+    return filename.lower().endswith(SQLITE_EXTENSIONS)
+
+
+def connect(filename: str = "tareas.db") -> sqlite3.Connection:
+    """
+    Open a task database, creating the schema if needed.
+
+    Args:
+        filename: Path to the SQLite database
+
+    Returns:
+        An open connection
+    """
+    conn = sqlite3.connect(filename)
+    conn.executescript(_SCHEMA)
+    columns = [name for _, name, *_ in conn.execute("PRAGMA table_info(tasks)")]
+    if 'position' not in columns:
+        # Databases from before position keys were ordered by id
+        with conn:
+            conn.execute("ALTER TABLE tasks ADD COLUMN position INTEGER")
+            conn.execute("UPDATE tasks SET position = id * ?", (POSITION_STEP,))
+    if 'remote_id' not in columns:
+        # Databases from before tasks carried their sync id (Task.id)
+        with conn:
+            conn.execute("ALTER TABLE tasks ADD COLUMN remote_id TEXT")
+    conn.execute(_POSITION_INDEX)
+    return conn
+
+
+def _row_values(task: Task) -> Tuple[str, Optional[str], Optional[int], int, Optional[str]]:
+    """Convert a task to the values of an INSERT/UPDATE statement."""
+    return (task.text, task.date_str, parse_date_ordinal(task.date_str),
+            1 if task.status else 0, task.id)
+
+
+def _row_task(text: str, date_str: Optional[str], status: int,
+              remote_id: Optional[str]) -> Task:
+    """Convert a row selected with ``_COLUMNS`` to a task."""
+    return Task(text=text, date_str=date_str, status=bool(status), id=remote_id)
+
+
+def _query(filename: str, where: str = "", params: tuple = ()) -> List[Task]:
+    """Run a task query in list order, with the usual error handling."""
+    if not os.path.exists(filename):
+        return []
+
+    try:
+        conn = connect(filename)
+        try:
+            rows = conn.execute(
+                f"SELECT {_COLUMNS} FROM tasks {where} ORDER BY position", params
+            ).fetchall()
+        finally:
+            conn.close()
+        return [_row_task(*row) for row in rows]
+
+    except sqlite3.DatabaseError as e:
+        print(f"Warning: {filename} is not a valid task database. Starting with empty task list.")
+        print(f"SQLite Error: {e}")
+        return []
+    except Exception as e:
+        print(f"Unexpected error loading {filename}: {e}")
+        return []
+
+
+def load_tasks(filename: str = "tareas.db") -> List[Task]:
+    """
+    Load all tasks from a SQLite database.
+
+    Args:
+        filename: Path to the SQLite database
+
+    Returns:
+        List of Task objects
+    """
+    return _query(filename)
+
+
+def iter_tasks(filename: str = "tareas.db") -> Iterator[Task]:
+    """
+    Yield all tasks from a SQLite database one row at a time.
+
+    Args:
+        filename: Path to the SQLite database
+
+    Yields:
+        Task objects in list order
+    """
+    if not os.path.exists(filename):
+        return
+
+    try:
+        conn = connect(filename)
+        try:
+            for row in conn.execute(f"SELECT {_COLUMNS} FROM tasks ORDER BY position"):
+                yield _row_task(*row)
+        finally:
+            conn.close()
+
+    except sqlite3.DatabaseError as e:
+        print(f"Warning: {filename} is not a valid task database.")
+        print(f"SQLite Error: {e}")
+    except Exception as e:
+        print(f"Unexpected error loading {filename}: {e}")
+
+
+def load_pending_tasks(filename: str = "tareas.db") -> List[Task]:
+    """Load tasks that are not completed."""
+    return _query(filename, "WHERE status = 0")
+
+
+def load_overdue_tasks(filename: str = "tareas.db",
+                       today: Optional[date] = None) -> List[Task]:
+    """
+    Load pending tasks whose due date is before today.
+
+    Args:
+        filename: Path to the SQLite database
+        today: Reference date, defaults to the current date
+
+    Returns:
+        List of overdue Task objects
+    """
+    today = today or date.today()
+    return _query(filename, "WHERE status = 0 AND due < ?", (today.toordinal(),))
+
+
+def load_tasks_between(start: date, end: date,
+                       filename: str = "tareas.db") -> List[Task]:
+    """
+    Load tasks due within a date range (inclusive).
+
+    Args:
+        start: First day of the range
+        end: Last day of the range
+        filename: Path to the SQLite database
+
+    Returns:
+        List of Task objects due in the range
+    """
+    return _query(filename, "WHERE due BETWEEN ? AND ?",
+                  (start.toordinal(), end.toordinal()))
+
+
+def save_tasks(tasks: Iterable[Task], filename: str = "tareas.db") -> bool:
+    """
+    Replace the contents of a SQLite database with the given tasks.
+
+    Args:
+        tasks: Task objects to save (a list or a TaskStore)
+        filename: Path to the SQLite database
+
+    Returns:
+        True if successful, False otherwise
+    """
+    try:
+        with _row_ids_lock:
+            _row_ids.pop(os.path.abspath(filename), None)
+        conn = connect(filename)
+        try:
+            with conn:
+                conn.execute("DELETE FROM tasks")
+                conn.executemany(
+                    "INSERT INTO tasks (text, date_str, due, status, remote_id, position) "
+                    "VALUES (?, ?, ?, ?, ?, ?)",
+                    (_row_values(task) + ((number + 1) * POSITION_STEP,)
+                     for number, task in enumerate(tasks)),
+                )
+        finally:
+            conn.close()
+        return True
+
+    except sqlite3.DatabaseError as e:
+        print(f"Error: Cannot write to {filename}: {e}")
+        return False
+    except Exception as e:
+        print(f"Unexpected error saving to {filename}: {e}")
+        return False
+
+
+def apply_operations(operations: List[dict], filename: str = "tareas.db") -> bool:
+    """
+    Apply journal-style operations directly to the database.
+
+    Accepts the same operation records as ``storage.append_operations``,
+    so the app can use either backend. Positions are resolved against the
+    current row order, and all operations commit in one transaction.
+    Invalid operations (unknown op, bad task, index out of range) are
+    skipped and the rest are committed.
+
+    Args:
+        operations: Operation records, in the order they were applied
+        filename: Path to the SQLite database
+
+    Returns:
+        True if successful, False on a (retryable) database or I/O error
+
+    Raises:
+        InvalidOperationError: After committing the valid operations, if
+            some were dropped
+    """
+    dropped: List[dict] = []
+    reasons: List[str] = []
+    key = os.path.abspath(filename)
+    try:
+        with _row_ids_lock:
+            conn = connect(filename)
+            try:
+                order = _load_row_ids(conn, filename)
+                # Any failure leaves the map unknown; it is re-read next time
+                _row_ids.pop(key, None)
+                with conn:
+                    for operation in operations:
+                        try:
+                            _apply_operation(conn, operation, order)
+                        except (KeyError, ValueError, TypeError, IndexError) as e:
+                            dropped.append(operation)
+                            reasons.append(f"{type(e).__name__}: {e}")
+            finally:
+                conn.close()
+            _row_ids[key] = (_file_signature(filename), order)
+
+    except sqlite3.DatabaseError as e:
+        print(f"Error: Cannot write to {filename}: {e}")
+        return False
+    except Exception as e:
+        print(f"Unexpected error saving to {filename}: {e}")
+        return False
+
+    if dropped:
+        print(f"Error: Dropped invalid operations for {filename}: {'; '.join(reasons)}")
+        raise InvalidOperationError(dropped, reasons)
+    return True
+
+
+def _file_signature(filename: str) -> Tuple[int, int]:
+    """Modification time and size, to tell if another writer changed the file."""
+    st = os.stat(filename)
+    return st.st_mtime_ns, st.st_size
+
+
+def _load_row_ids(conn: sqlite3.Connection, filename: str) -> _RowOrder:
+    """Row order of a database, from the cache if the file is unchanged."""
+    cached = _row_ids.get(os.path.abspath(filename))
+    if cached is not None and cached[0] == _file_signature(filename):
+        return cached[1]
+    return _RowOrder(conn.execute("SELECT id, position FROM tasks ORDER BY position"))
+
+
+def _insert_row(conn: sqlite3.Connection, order: _RowOrder, index: int,
+                values: Tuple) -> None:
+    """Insert a row at a list position, giving it a key between its neighbours."""
+    positions = order.positions
+    if index == len(positions):
+        position = (positions[-1] if positions else 0) + POSITION_STEP
+    else:
+        low = positions[index - 1] if index else positions[0] - 2 * POSITION_STEP
+        if positions[index] - low < 2:
+            _renumber(conn, order)
+            low = positions[index - 1] if index else 0
+        position = (low + positions[index]) // 2
+    cursor = conn.execute(
+        "INSERT INTO tasks (text, date_str, due, status, remote_id, position) "
+        "VALUES (?, ?, ?, ?, ?, ?)",
+        values + (position,))
+    order.ids.insert(index, cursor.lastrowid)
+    positions.insert(index, position)
+
+
+def _renumber(conn: sqlite3.Connection, order: _RowOrder) -> None:
+    """Spread the position keys out again once a gap is used up (rare)."""
+    order.positions[:] = [(number + 1) * POSITION_STEP for number in range(len(order))]
+    conn.executemany("UPDATE tasks SET position = ? WHERE id = ?",
+                     zip(order.positions, order.ids))
+
+
+def _apply_operation(conn: sqlite3.Connection, operation: dict,
+                     order: _RowOrder) -> None:
+    """
+    Apply a single operation inside an open transaction.
+
+    Operations are validated before anything is written, and ``order``
+    (the row id and key at each list position) is kept in step with the
+    table. An insert writes one row unless its gap of keys is used up.
+    """
+    op = operation['op']
+    if op == 'add':
+        _insert_row(conn, order, len(order), _row_values(Task.from_dict(operation['task'])))
+    elif op == 'insert':
+        index = operation['index']
+        if not isinstance(index, int) or not 0 <= index <= len(order):
+            raise IndexError(f"task index {index} out of range")
+        _insert_row(conn, order, index, _row_values(Task.from_dict(operation['task'])))
+    elif op == 'update':
+        values = _row_values(Task.from_dict(operation['task']))
+        conn.execute(
+            "UPDATE tasks SET text = ?, date_str = ?, due = ?, status = ?, remote_id = ? "
+            "WHERE id = ?",
+            values + (order.ids[_checked_index(order, operation['index'])],),
+        )
+    elif op == 'delete':
+        index = _checked_index(order, operation['index'])
+        conn.execute("DELETE FROM tasks WHERE id = ?", (order.ids[index],))
+        del order.ids[index]
+        del order.positions[index]
+    else:
+        raise ValueError(f"unknown operation '{op}'")
+
+
+def _checked_index(order: _RowOrder, index: int) -> int:
+    """Validate a list position against the current rows."""
+    if not isinstance(index, int) or not 0 <= index < len(order):
+        raise IndexError(f"task index {index} out of range")
+    return index
+
+
+def migrate_json_to_sqlite(json_filename: str = "tareas.json",
+                           db_filename: str = "tareas.db") -> int:
+    """
+    Copy the tasks of a JSON task file (including its journal) into SQLite.
+
+    Args:
+        json_filename: Path to the existing JSON file
+        db_filename: Path to the SQLite database to create or replace
+
+    Returns:
+        Number of migrated tasks, or -1 on failure
+    """
+    # Imported here because storage dispatches to this module
+    from storage import load_tasks as load_json_tasks
+
+    tasks = load_json_tasks(json_filename)
+    if not save_tasks(tasks, db_filename):
+        return -1
+    return len(tasks)
+
+
+def main() -> None:
+    """Migrate a JSON task file: python sqlite_storage.py [tareas.json] [tareas.db]"""
+    json_filename = sys.argv[1] if len(sys.argv) > 1 else "tareas.json"
+    db_filename = sys.argv[2] if len(sys.argv) > 2 else "tareas.db"
+
+    count = migrate_json_to_sqlite(json_filename, db_filename)
+    if count < 0:
+        sys.exit(1)
+    print(f"Migrated {count} tasks from {json_filename} to {db_filename}")
+
+
+if __name__ == "__main__":
+    main()
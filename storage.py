@@ -1,52 +1,335 @@
 """
 Storage module for handling task persistence with JSON.
+
+Tasks are kept in a JSON snapshot (``tareas.json``) plus an optional
+append-only journal (``tareas.json.journal``). Each mutation made by the
+app is appended to the journal as one small JSON line, ``load_tasks``
+replays the journal over the snapshot, and once the journal grows past
+``JOURNAL_COMPACT_BYTES`` it is folded back into a fresh snapshot.
+
+Paths ending in ``.tskb`` use the binary snapshot format from
+``binary_storage`` instead of JSON (with the same journal), and
+``open_tasks`` maps them lazily. Paths ending in ``.db``/``.sqlite``/
+``.sqlite3`` are delegated to the SQLite backend in ``sqlite_storage``,
+which applies operations directly.
 """
 
 import json
 import os
-from typing import List
-from models import Task
+import re
+import tempfile
+import threading
+from contextlib import closing
+from itertools import islice
+from typing import (Any, Callable, Dict, Iterable, Iterator, List, Optional,
+                    Sequence, Tuple)
+from models import Task, TaskStore
+import binary_storage
+import sqlite_storage
+from sqlite_storage import InvalidOperationError
+
+
+# Suffix appended to the snapshot filename to get its journal
+JOURNAL_SUFFIX = ".journal"
+
+# Journal size (in bytes) after which it is compacted into the snapshot
+JOURNAL_COMPACT_BYTES = 256 * 1024
+
+# Characters read per chunk when streaming a snapshot
+STREAM_CHUNK_SIZE = 64 * 1024
+
+_JSON_WHITESPACE = re.compile(r"[ \t\n\r]*")
 
+# Results of load_tasks by absolute path: (file signature, tasks)
+_load_cache: Dict[str, Tuple[tuple, Tuple[Task, ...]]] = {}
+_cache_lock = threading.Lock()
 
-def load_tasks(filename: str = "tareas.json") -> List[Task]:
+
+def journal_path(filename: str) -> str:
+    """Return the journal path that belongs to a snapshot file."""
+    return filename + JOURNAL_SUFFIX
+
+
+def load_tasks(filename: str = "tareas.json", use_cache: bool = True) -> List[Task]:
     """
     Load tasks from JSON file with robust error handling.
-    
+
+    Any pending journal operations are replayed over the snapshot. Results
+    are cached per path and reused while the files' size, mtime and inode
+    are unchanged; the returned list is new, but the Task objects in it are
+    shared with the cache, so changes to them must be saved.
+
     Args:
         filename: Path to the JSON file
-        
+        use_cache: Reuse a previous load if the file has not changed
+
     Returns:
         List of Task objects
     """
+    if not use_cache:
+        return _load_uncached(filename)
+
+    key = os.path.abspath(filename)
+    signature = _file_signature(filename)
+    with _cache_lock:
+        cached = _load_cache.get(key)
+    if cached is not None and cached[0] == signature:
+        return list(cached[1])
+
+    tasks = _load_uncached(filename)
+    # Only cache if nothing changed while loading
+    if _file_signature(filename) == signature:
+        with _cache_lock:
+            _load_cache[key] = (signature, tuple(tasks))
+    return tasks
+
+
+def invalidate_cache(filename: Optional[str] = None) -> None:
+    """
+    Drop cached loads.
+
+    Args:
+        filename: Path whose cache entry to drop, or None to clear all
+    """
+    with _cache_lock:
+        if filename is None:
+            _load_cache.clear()
+        else:
+            _load_cache.pop(os.path.abspath(filename), None)
+
+
+def _file_signature(filename: str) -> tuple:
+    """Size, mtime and inode of a task file and its journal."""
+    signature = []
+    for path in (filename, journal_path(filename)):
+        try:
+            stat = os.stat(path)
+        except OSError:
+            signature.append(None)
+            continue
+        signature.append((stat.st_size, stat.st_mtime_ns, stat.st_ino))
+    return tuple(signature)
+
+
+class TaskFileWatcher:
+    """
+    Poll a task file and react when it changes on disk.
+
+    Each change invalidates the load cache for the file and calls
+    ``callback(filename)``. The callback runs on the watcher thread, so UI
+    code should hand the work over to its own thread (e.g. Tk's ``after``).
+    """
+
+    def __init__(self, filename: str, callback: Callable[[str], None],
+                 interval: float = 1.0):
+        """
+        Initialize and start watching.
+
+        Args:
+            filename: Path to the task file
+            callback: Function called with the filename after each change
+            interval: Seconds between checks
+        """
+        self.filename = filename
+        self.callback = callback
+        self.interval = interval
+        self._stop = threading.Event()
+        self._signature = _file_signature(filename)
+        self._thread = threading.Thread(target=self._run, name="task-watcher",
+                                        daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop watching."""
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self) -> None:
+        """Watcher thread main loop."""
+        while not self._stop.wait(self.interval):
+            signature = _file_signature(self.filename)
+            if signature == self._signature:
+                continue
+            self._signature = signature
+            invalidate_cache(self.filename)
+            try:
+                self.callback(self.filename)
+            except Exception as e:
+                print(f"Unexpected error in watcher callback for {self.filename}: {e}")
+
+
+def _load_uncached(filename: str) -> List[Task]:
+    """Load tasks from disk, replaying the journal."""
+    if sqlite_storage.is_sqlite_path(filename):
+        return sqlite_storage.load_tasks(filename)
+
+    tasks = _load_snapshot(filename)
+    _replay_journal(tasks, filename)
+    return tasks
+
+
+def iter_tasks(filename: str = "tareas.json", strict: bool = False) -> Iterator[Task]:
+    """
+    Yield tasks one at a time without loading the whole file.
+
+    The JSON array is parsed incrementally, so memory stays flat no matter
+    how large the file is, and consumers can stop early (e.g. with
+    ``itertools.islice`` for paged views). Invalid entries are skipped like
+    in ``load_tasks``; if the file turns out to be corrupted, a warning is
+    printed and iteration ends. When a journal is pending the tasks are
+    loaded with ``load_tasks``, since journal positions refer to the
+    complete list.
+
+    Callers that go on to change the file must not treat the readable part
+    of a corrupted file as the whole list (journal positions would not match
+    and the next save would drop the rest), so they pass ``strict``.
+
+    Args:
+        filename: Path to the JSON file
+        strict: Raise ``CorruptTaskFileError`` instead of ending quietly
+
+    Yields:
+        Task objects in list order
+
+    Raises:
+        CorruptTaskFileError: If ``strict`` and the file cannot be read
+    """
+    if sqlite_storage.is_sqlite_path(filename):
+        yield from sqlite_storage.iter_tasks(filename)
+        return
+    if os.path.exists(journal_path(filename)):
+        if strict:
+            tasks = _load_snapshot(filename, strict=True)
+            _replay_journal(tasks, filename)
+            yield from tasks
+        else:
+            yield from load_tasks(filename)
+        return
+    if not os.path.exists(filename):
+        return
+
+    try:
+        if binary_storage.is_binary_path(filename):
+            with binary_storage.BinarySnapshot(filename) as snapshot:
+                yield from snapshot
+        else:
+            yield from _tasks_from_items(iter_json_array(filename))
+    except Exception as e:
+        if strict:
+            raise CorruptTaskFileError(filename, e) from e
+        _warn_unreadable(filename, e)
+
+
+def _warn_unreadable(filename: str, e: Exception) -> None:
+    """Print the warning for a task file that iteration had to stop on."""
+    if isinstance(e, json.JSONDecodeError):
+        print(f"Warning: {filename} is corrupted (invalid JSON).")
+        print(f"JSON Error: {e}")
+    elif isinstance(e, InvalidFormatError):
+        print(f"Warning: {filename} contains invalid data format.")
+    elif isinstance(e, binary_storage.SnapshotError):
+        print(f"Warning: {filename} is not a valid task snapshot ({e}).")
+    elif isinstance(e, PermissionError):
+        print(f"Error: Permission denied reading {filename}")
+    else:
+        print(f"Unexpected error loading {filename}: {e}")
+
+
+def load_tasks_page(offset: int, limit: int,
+                    filename: str = "tareas.json") -> List[Task]:
+    """
+    Load one page of tasks, stopping as soon as the page is complete.
+
+    Args:
+        offset: Number of tasks to skip
+        limit: Maximum number of tasks to return
+        filename: Path to the JSON file
+
+    Returns:
+        List of at most ``limit`` Task objects
+    """
+    with closing(iter_tasks(filename)) as tasks:
+        return list(islice(tasks, offset, offset + limit))
+
+
+def load_task_store(filename: str = "tareas.json") -> TaskStore:
+    """
+    Load tasks into a compact columnar ``TaskStore``.
+
+    Tasks are streamed straight into the store's columns, so no list of
+    Task objects is ever built.
+
+    Args:
+        filename: Path to the JSON file
+
+    Returns:
+        A TaskStore with the file's tasks
+    """
+    return TaskStore(iter_tasks(filename))
+
+
+def open_tasks(filename: str = "tareas.json") -> Sequence[Task]:
+    """
+    Open a task file for random access, decoding tasks only when used.
+
+    Binary snapshots without a pending journal are memory-mapped and
+    returned as a ``BinarySnapshot``, so opening is near-instant regardless
+    of size; call ``close()`` on it when done. Reading a corrupt record
+    from it raises ``SnapshotError``. Other files are loaded with
+    ``load_tasks``.
+
+    Args:
+        filename: Path to the task file
+
+    Returns:
+        A sequence of Task objects
+    """
+    if (binary_storage.is_binary_path(filename)
+            and os.path.exists(filename)
+            and not os.path.exists(journal_path(filename))):
+        try:
+            return binary_storage.BinarySnapshot(filename)
+        except binary_storage.SnapshotError as e:
+            print(f"Warning: {filename} is not a valid task snapshot ({e}). Starting with empty task list.")
+            return []
+        except OSError as e:
+            print(f"Error: Cannot read {filename}: {e}")
+            return []
+    return load_tasks(filename)
+
+
+def _load_snapshot(filename: str, strict: bool = False) -> List[Task]:
+    """
+    Load the snapshot part of a task file (without the journal).
+
+    Args:
+        filename: Path to the snapshot file
+        strict: Raise ``CorruptTaskFileError`` instead of returning an
+            empty list for an unreadable file
+    """
     # If file doesn't exist, start with empty list
     if not os.path.exists(filename):
         return []
-    
+
+    if strict:
+        try:
+            return _load_snapshot_items(filename)
+        except Exception as e:
+            raise CorruptTaskFileError(filename, e) from e
+
     try:
-        with open(filename, 'r', encoding='utf-8') as f:
-            data = json.load(f)
-            
-        # Validate that data is a list
-        if not isinstance(data, list):
-            print(f"Warning: {filename} contains invalid data format. Starting with empty task list.")
-            return []
-            
-        # Convert each task data to Task object
-        tasks = []
-        for i, task_data in enumerate(data):
-            try:
-                task = Task.from_dict(task_data)
-                tasks.append(task)
-            except (KeyError, ValueError, TypeError) as e:
-                print(f"Warning: Skipping invalid task at index {i}: {e}")
-                continue
-                
-        return tasks
-        
+        return _load_snapshot_items(filename)
+
+    except InvalidFormatError:
+        print(f"Warning: {filename} contains invalid data format. Starting with empty task list.")
+        return []
     except json.JSONDecodeError as e:
         print(f"Warning: {filename} is corrupted (invalid JSON). Starting with empty task list.")
         print(f"JSON Error: {e}")
         return []
+    except binary_storage.SnapshotError as e:
+        print(f"Warning: {filename} is not a valid task snapshot ({e}). Starting with empty task list.")
+        return []
     except PermissionError:
         print(f"Error: Permission denied reading {filename}")
         return []
@@ -55,27 +338,374 @@ def load_tasks(filename: str = "tareas.json") -> List[Task]:
         return []
 
 
-def save_tasks(tasks: List[Task], filename: str = "tareas.json") -> bool:
+def _load_snapshot_items(filename: str) -> List[Task]:
+    """Read a JSON or binary snapshot, letting errors propagate."""
+    if binary_storage.is_binary_path(filename):
+        with binary_storage.BinarySnapshot(filename) as snapshot:
+            return list(snapshot)
+
+    # Items are converted while parsing, so the raw dicts of the whole
+    # file are never held in memory at the same time as the tasks
+    return list(_tasks_from_items(iter_json_array(filename)))
+
+
+def _tasks_from_items(items: Iterable[Any]) -> Iterator[Task]:
+    """Convert raw JSON items to tasks, skipping invalid ones."""
+    for i, task_data in enumerate(items):
+        try:
+            yield Task.from_dict(task_data)
+        except (KeyError, ValueError, TypeError) as e:
+            print(f"Warning: Skipping invalid task at index {i}: {e}")
+            continue
+
+
+class InvalidFormatError(Exception):
+    """Raised when a task file is valid JSON but not a JSON array."""
+
+
+class CorruptTaskFileError(Exception):
+    """Raised by strict loads when a task file exists but cannot be read."""
+
+    def __init__(self, filename: str, cause: Exception):
+        super().__init__(f"{filename}: {cause}")
+        self.filename = filename
+        self.cause = cause
+
+
+def iter_json_array(filename: str, chunk_size: int = STREAM_CHUNK_SIZE) -> Iterator[Any]:
+    """
+    Incrementally parse a top-level JSON array, yielding its items.
+
+    Args:
+        filename: Path to the JSON file
+        chunk_size: Number of characters read per chunk
+
+    Yields:
+        Decoded array items
+
+    Raises:
+        json.JSONDecodeError: If the file is not valid JSON
+        InvalidFormatError: If the file holds a JSON value other than an array
+    """
+    decoder = json.JSONDecoder()
+
+    with open(filename, 'r', encoding='utf-8') as f:
+        buf = ""
+        pos = 0
+        eof = False
+
+        def read_more() -> bool:
+            """Append the next chunk, dropping what was already consumed."""
+            nonlocal buf, pos, eof
+            chunk = f.read(chunk_size)
+            if not chunk:
+                eof = True
+                return False
+            buf = buf[pos:] + chunk
+            pos = 0
+            return True
+
+        def peek() -> str:
+            """Skip whitespace and return the next character ('' at EOF)."""
+            nonlocal pos
+            while True:
+                pos = _JSON_WHITESPACE.match(buf, pos).end()
+                if pos < len(buf):
+                    return buf[pos]
+                if not read_more():
+                    return ""
+
+        first = peek()
+        if first != "[":
+            # Not an array: classify the rest like json.load would
+            rest = buf[pos:] + f.read()
+            json.loads(rest)
+            raise InvalidFormatError()
+        pos += 1
+
+        if peek() == "]":
+            pos += 1
+        else:
+            while True:
+                if peek() == "":
+                    raise json.JSONDecodeError("Expecting value", buf, pos)
+
+                # Decode one item, reading more until it is complete. A
+                # scalar cut at the chunk boundary can decode as a valid
+                # prefix (e.g. "-1." of "-1.5"), so an item is only accepted
+                # once the separator after it is in the buffer, or at EOF.
+                while True:
+                    try:
+                        value, end = decoder.raw_decode(buf, pos)
+                    except json.JSONDecodeError:
+                        if eof:
+                            raise
+                        read_more()
+                        continue
+                    if eof:
+                        break
+                    after = _JSON_WHITESPACE.match(buf, end).end()
+                    if after < len(buf) and buf[after] in ",]":
+                        break
+                    read_more()
+
+                pos = end
+                yield value
+
+                separator = peek()
+                if separator == ",":
+                    pos += 1
+                elif separator == "]":
+                    pos += 1
+                    break
+                else:
+                    raise json.JSONDecodeError("Expecting ',' delimiter", buf, pos)
+
+        if peek() != "":
+            raise json.JSONDecodeError("Extra data", buf, pos)
+
+
+def _replay_journal(tasks: List[Task], snapshot: str) -> None:
+    """
+    Apply journal operations to a task list in place.
+
+    A torn last line (e.g. from a crash mid-append) and invalid operations
+    are skipped with a warning, mirroring how invalid snapshot entries are
+    handled. A journal whose ``base`` record does not match the snapshot
+    on disk is ignored.
+
+    Args:
+        tasks: Task list loaded from the snapshot
+        snapshot: Path to the JSON snapshot file
+    """
+    journal = journal_path(snapshot)
+    if not os.path.exists(journal):
+        return
+
+    try:
+        with open(journal, 'r', encoding='utf-8') as f:
+            for line_number, line in enumerate(f, start=1):
+                if not line.strip():
+                    continue
+                try:
+                    operation = json.loads(line)
+                    if operation.get('op') == 'base':
+                        if operation.get('snapshot') != _snapshot_signature(snapshot):
+                            # Left over from a compaction interrupted after
+                            # the new snapshot was already in place
+                            print(f"Warning: Ignoring stale journal {journal}")
+                            return
+                        continue
+                    _apply_operation(tasks, operation)
+                except (json.JSONDecodeError, KeyError, ValueError,
+                        TypeError, IndexError) as e:
+                    print(f"Warning: Skipping invalid journal entry at line {line_number}: {e}")
+                    continue
+    except PermissionError:
+        print(f"Error: Permission denied reading {journal}")
+    except Exception as e:
+        print(f"Unexpected error loading {journal}: {e}")
+
+
+def _apply_operation(tasks: List[Task], operation: dict) -> None:
+    """
+    Apply a single journal operation to a task list.
+
+    Supported operations:
+        {"op": "add", "task": {...}}
+        {"op": "insert", "index": i, "task": {...}}
+        {"op": "update", "index": i, "task": {...}}
+        {"op": "delete", "index": i}
+
+    Every journal starts with a ``{"op": "base", "snapshot": ...}`` record
+    that ties it to the snapshot it applies to.
+    """
+    op = operation['op']
+    if op == 'add':
+        tasks.append(Task.from_dict(operation['task']))
+    elif op == 'insert':
+        index = operation['index']
+        if not isinstance(index, int) or not 0 <= index <= len(tasks):
+            raise IndexError(f"task index {index} out of range")
+        tasks.insert(index, Task.from_dict(operation['task']))
+    elif op == 'update':
+        index = _checked_index(tasks, operation['index'])
+        tasks[index] = Task.from_dict(operation['task'])
+    elif op == 'delete':
+        index = _checked_index(tasks, operation['index'])
+        del tasks[index]
+    else:
+        raise ValueError(f"unknown operation '{op}'")
+
+
+def _snapshot_signature(filename: str) -> Optional[List[int]]:
+    """Return a (size, mtime) signature of a snapshot, or None if missing."""
+    try:
+        stat = os.stat(filename)
+    except FileNotFoundError:
+        return None
+    return [stat.st_size, stat.st_mtime_ns]
+
+
+def _checked_index(tasks: List[Task], index: int) -> int:
+    """Validate a journal index against the current task list."""
+    if not isinstance(index, int) or not 0 <= index < len(tasks):
+        raise IndexError(f"task index {index} out of range")
+    return index
+
+
+def append_operation(operation: dict, filename: str = "tareas.json") -> bool:
+    """
+    Append one mutation to the journal, compacting it when it gets large.
+
+    Args:
+        operation: Operation record (see ``_apply_operation``)
+        filename: Path to the JSON snapshot file
+
+    Returns:
+        True if successful, False otherwise
+    """
+    return append_operations([operation], filename)
+
+
+def append_operations(operations: List[dict], filename: str = "tareas.json") -> bool:
+    """
+    Append a batch of mutations to the journal with a single write.
+
+    The journal is fsynced before returning so acknowledged operations
+    survive a crash, and it is compacted once it gets large.
+
+    Args:
+        operations: Operation records, in the order they were applied
+        filename: Path to the JSON snapshot file
+
+    Returns:
+        True if successful, False otherwise (the write may be retried)
+
+    Raises:
+        InvalidOperationError: If the SQLite backend dropped operations it
+            cannot apply; the valid ones are saved and none should be retried
+    """
+    if not operations:
+        return True
+    try:
+        if sqlite_storage.is_sqlite_path(filename):
+            return sqlite_storage.apply_operations(operations, filename)
+        return _append_to_journal(operations, filename)
+    finally:
+        invalidate_cache(filename)
+
+
+def _append_to_journal(operations: List[dict], filename: str) -> bool:
+    """Write operations to the journal of a snapshot file."""
+    journal = journal_path(filename)
+    try:
+        lines = "".join(json.dumps(op, ensure_ascii=False) + "\n" for op in operations)
+        data = lines.encode('utf-8')
+        with open(journal, 'ab+') as f:
+            # Start on a fresh line if a previous append was torn by a crash
+            if f.tell() > 0:
+                f.seek(-1, os.SEEK_END)
+                if f.read(1) != b"\n":
+                    data = b"\n" + data
+            else:
+                base = {'op': 'base', 'snapshot': _snapshot_signature(filename)}
+                data = (json.dumps(base) + "\n").encode('utf-8') + data
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+            size = f.tell()
+
+    except PermissionError:
+        print(f"Error: Permission denied writing to {journal}")
+        return False
+    except OSError as e:
+        print(f"Error: Cannot write to {journal}: {e}")
+        return False
+    except Exception as e:
+        print(f"Unexpected error saving to {journal}: {e}")
+        return False
+
+    # The operations are durable now. Compaction is best effort and is
+    # retried on a later append: reporting its failure as a failed append
+    # would make the caller write the same operations twice.
+    if size >= JOURNAL_COMPACT_BYTES:
+        try:
+            compacted = compact_journal(filename)
+        except Exception as e:
+            print(f"Unexpected error compacting {journal}: {e}")
+            compacted = False
+        if not compacted:
+            print(f"Warning: Cannot compact {journal}; will retry on the next save.")
+    return True
+
+
+def compact_journal(filename: str = "tareas.json") -> bool:
+    """
+    Fold the journal into a new snapshot and remove it.
+
+    Args:
+        filename: Path to the JSON snapshot file
+
+    Returns:
+        True if successful, False otherwise
+    """
+    if not os.path.exists(journal_path(filename)):
+        return True
+    try:
+        # Never fold the journal into whatever part of a corrupt snapshot
+        # could be read; that would overwrite the rest of it
+        tasks = _load_snapshot(filename, strict=True)
+    except CorruptTaskFileError as e:
+        print(f"Error: Cannot compact {journal_path(filename)}; {e.cause}")
+        return False
+    _replay_journal(tasks, filename)
+    return save_tasks(tasks, filename)
+
+
+def save_tasks(tasks: Iterable[Task], filename: str = "tareas.json") -> bool:
     """
     Save tasks to JSON file with robust error handling.
-    
+
+    The snapshot is written to a temporary file, fsynced and atomically
+    renamed over the target, so a crash never leaves a truncated file.
+    Writing a full snapshot supersedes the journal, so it is removed, and
+    the load cache entry for the file is invalidated.
+
     Args:
-        tasks: List of Task objects to save
+        tasks: Task objects to save (a list or a TaskStore)
         filename: Path to the JSON file
-        
+
     Returns:
         True if successful, False otherwise
     """
     try:
-        # Convert tasks to dictionary format
-        data = [task.to_dict() for task in tasks]
-        
-        # Write to file with UTF-8 encoding and proper formatting
-        with open(filename, 'w', encoding='utf-8') as f:
-            json.dump(data, f, ensure_ascii=False, indent=2)
-        
+        if sqlite_storage.is_sqlite_path(filename):
+            return sqlite_storage.save_tasks(tasks, filename)
+        return _write_snapshot(tasks, filename)
+    finally:
+        invalidate_cache(filename)
+
+
+def _write_snapshot(tasks: Iterable[Task], filename: str) -> bool:
+    """Write a JSON or binary snapshot and drop the journal it supersedes."""
+    try:
+        if binary_storage.is_binary_path(filename):
+            atomic_write(filename, binary_storage.encode_snapshot(tasks))
+        else:
+            # Convert tasks to dictionary format
+            data = [task.to_dict() for task in tasks]
+
+            # Write to file with UTF-8 encoding and proper formatting
+            atomic_write(filename, json.dumps(data, ensure_ascii=False, indent=2).encode('utf-8'))
+
+        # The snapshot now contains every journaled operation
+        journal = journal_path(filename)
+        if os.path.exists(journal):
+            os.remove(journal)
+
         return True
-        
+
     except PermissionError:
         print(f"Error: Permission denied writing to {filename}")
         return False
@@ -85,3 +715,41 @@ def save_tasks(tasks: List[Task], filename: str = "tareas.json") -> bool:
     except Exception as e:
         print(f"Unexpected error saving to {filename}: {e}")
         return False
+
+
+def atomic_write(filename: str, data: bytes) -> None:
+    """
+    Replace a file's contents atomically.
+
+    Args:
+        filename: Destination path
+        data: Complete new contents
+
+    Raises:
+        OSError: If the temporary file cannot be written or renamed
+    """
+    directory = os.path.dirname(os.path.abspath(filename))
+    fd, tmp_path = tempfile.mkstemp(prefix=os.path.basename(filename) + ".",
+                                    suffix=".tmp", dir=directory)
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, filename)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+    # Persist the rename itself (not supported on every platform)
+    try:
+        dir_fd = os.open(directory, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(dir_fd)
+    except OSError:
+        pass
+    finally:
+        os.close(dir_fd)
@@ -0,0 +1,461 @@
+"""
+Offline-first sync between the desktop task list and the Supabase
+``tareas`` table.
+
+Local changes are queued while the app runs (online or not) and pushed on
+the next sync; remote changes are pulled with ``updated_at`` watermarks, so
+every sync only transfers rows changed since the previous one. Remote
+deletions are read from the ``tareas_eliminadas`` tombstone table filled by
+a trigger (see ``sync_tareas.sql``).
+
+Conflicts are resolved per task by last writer wins: a local change made
+after the server's ``updated_at`` (or deletion) of the same task wins and
+is pushed, otherwise the server version replaces the local one. Ties go to
+the server.
+
+State lives next to the task file: ``<file>.sync.json`` holds the
+watermarks and the pending queue, and ``<file>.sync.log`` gets one line per
+local change until the next sync folds it in. Only the JSON backend keeps
+task ids, so sync is not available for ``.db`` / ``.tskb`` files.
+
+The network steps (``fetch`` and ``send``) touch no shared state and can
+run on a worker thread; ``apply``, ``prepare_push`` and ``commit`` must run
+where the task list is owned (the Tk thread).
+"""
+
+import json
+import os
+import uuid
+from dataclasses import dataclass, field, replace
+from datetime import date, datetime, timezone
+from typing import Any, Dict, List, Optional, Tuple
+
+import binary_storage
+import sqlite_storage
+from history import DELETE_EDIT, INSERT_EDIT, UPDATE_EDIT, Edit, apply_edit
+from importer import to_iso_date
+from models import (DATE_FORMAT, INSERT, INSERT_MANY, REMOVE, REMOVE_MANY,
+                    UPDATE, UPDATE_MANY, ObservableTaskList, Task, TaskChange)
+from storage import atomic_write
+
+
+SYNC_STATE_SUFFIX = ".sync.json"
+SYNC_LOG_SUFFIX = ".sync.log"
+
+TASKS_TABLE = "tareas"
+TOMBSTONES_TABLE = "tareas_eliminadas"
+
+# Rows per request when pulling and pushing
+PAGE_SIZE = 500
+
+# Columns the desktop app reads; categoria, urgente and hora are left to the
+# web app (new rows get the column defaults)
+ROW_COLUMNS = "id,texto,fecha,completada,updated_at"
+
+
+def now_iso() -> str:
+    """Current UTC time as an ISO timestamp."""
+    return datetime.now(timezone.utc).isoformat()
+
+
+def _timestamp(value: str) -> datetime:
+    """Parse an ISO timestamp from PostgREST or from the pending queue."""
+    return datetime.fromisoformat(value.replace("Z", "+00:00"))
+
+
+def task_to_row(task: Task, user_id: str) -> Dict[str, Any]:
+    """Convert a local task to the ``tareas`` columns it owns."""
+    return {
+        'id': task.id,
+        'user_id': user_id,
+        'texto': task.text,
+        'fecha': to_iso_date(task.date_str),
+        'completada': bool(task.status),
+    }
+
+
+def row_to_task(row: Dict[str, Any]) -> Task:
+    """Convert a ``tareas`` row to a local task."""
+    date_str = None
+    if row.get('fecha'):
+        date_str = date.fromisoformat(row['fecha']).strftime(DATE_FORMAT)
+    return Task(text=row['texto'], date_str=date_str,
+                status=bool(row.get('completada')), id=row['id'])
+
+
+def sync_supported(filename: str) -> bool:
+    """Return True if the task file keeps the task ids sync relies on."""
+    return not (sqlite_storage.is_sqlite_path(filename)
+                or binary_storage.is_binary_path(filename))
+
+
+@dataclass
+class RemoteChanges:
+    """Rows and tombstones pulled from the server since the watermarks."""
+    rows: List[Dict[str, Any]] = field(default_factory=list)
+    tombstones: List[Dict[str, Any]] = field(default_factory=list)
+
+
+@dataclass
+class PushBatch:
+    """Local changes captured for one push."""
+    rows: List[Dict[str, Any]] = field(default_factory=list)
+    deleted: List[str] = field(default_factory=list)
+    # Pending timestamp of every pushed id, to tell if it changed meanwhile
+    stamps: Dict[str, str] = field(default_factory=dict)
+
+
+@dataclass
+class SyncResult:
+    """Summary of a sync, and the journal operations for local changes."""
+    pulled: int = 0
+    pushed: int = 0
+    conflicts: int = 0
+    operations: List[dict] = field(default_factory=list)
+
+
+class TaskSync:
+    """
+    Sync state and steps for one task file.
+
+    Call ``track`` so local changes get queued (no network needed), then
+    ``attach`` a signed-in client and run ``sync`` (or the individual steps
+    from a UI) whenever the network is available.
+    """
+
+    def __init__(self, filename: str = "tareas.json", client: Any = None,
+                 user_id: Optional[str] = None, page_size: int = PAGE_SIZE):
+        """
+        Initialize the sync and read its saved state.
+
+        Args:
+            filename: Path to the local JSON task file
+            client: Supabase client or PostgREST client (``table()`` API)
+            user_id: Owner of the synced tasks, required with ``client``
+            page_size: Rows per request
+        """
+        self.filename = filename
+        self.client = None
+        self.user_id: Optional[str] = None
+        self.page_size = page_size
+        self.tracking = False
+        self.watermarks: Dict[str, Optional[List[str]]] = {
+            TASKS_TABLE: None,
+            TOMBSTONES_TABLE: None,
+        }
+        # id -> {'changed_at': iso timestamp, 'deleted': bool}
+        self.pending: Dict[str, Dict[str, Any]] = {}
+        # User the saved watermarks belong to
+        self._state_user: Optional[str] = None
+        self._load_state()
+        if client is not None:
+            self.attach(client, user_id)
+
+    def attach(self, client: Any, user_id: str) -> None:
+        """
+        Set the client and the signed-in user to sync with.
+
+        Watermarks saved for another user are dropped, so the next pull
+        starts from scratch; queued local changes are kept.
+        """
+        if self._state_user is not None and self._state_user != user_id:
+            print(f"Warning: {self.state_path} belongs to another user. Starting a full sync.")
+            self.watermarks = {TASKS_TABLE: None, TOMBSTONES_TABLE: None}
+        self.client = client
+        self.user_id = user_id
+        self._state_user = user_id
+
+    # -- local state ---------------------------------------------------
+
+    @property
+    def state_path(self) -> str:
+        return self.filename + SYNC_STATE_SUFFIX
+
+    @property
+    def log_path(self) -> str:
+        return self.filename + SYNC_LOG_SUFFIX
+
+    def _load_state(self) -> None:
+        """Read the saved state and the changes logged since."""
+        try:
+            if os.path.exists(self.state_path):
+                with open(self.state_path, 'r', encoding='utf-8') as f:
+                    state = json.load(f)
+                self._state_user = state.get('user_id')
+                self.watermarks.update(state.get('watermarks', {}))
+                self.pending = state.get('pending', {})
+        except (json.JSONDecodeError, OSError, AttributeError) as e:
+            print(f"Warning: Ignoring invalid sync state {self.state_path}: {e}")
+
+        if not os.path.exists(self.log_path):
+            return
+        try:
+            with open(self.log_path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except json.JSONDecodeError:
+                        continue  # torn last line
+                    self.pending[entry['id']] = {'changed_at': entry['changed_at'],
+                                                 'deleted': entry['deleted']}
+        except OSError as e:
+            print(f"Warning: Cannot read sync log {self.log_path}: {e}")
+
+    def _save_state(self) -> None:
+        """Write the state and empty the change log."""
+        state = {
+            'user_id': self._state_user,
+            'watermarks': self.watermarks,
+            'pending': self.pending,
+        }
+        atomic_write(self.state_path, json.dumps(state).encode('utf-8'))
+        if os.path.exists(self.log_path):
+            os.remove(self.log_path)
+
+    def mark(self, task_ids: List[str], deleted: bool = False) -> None:
+        """
+        Queue local changes for the next push.
+
+        Args:
+            task_ids: Ids of the changed tasks
+            deleted: Whether the tasks were deleted
+        """
+        if not task_ids:
+            return
+        changed_at = now_iso()
+        lines = []
+        for task_id in task_ids:
+            self.pending[task_id] = {'changed_at': changed_at, 'deleted': deleted}
+            lines.append(json.dumps({'id': task_id, 'changed_at': changed_at,
+                                     'deleted': deleted}))
+        try:
+            with open(self.log_path, 'a', encoding='utf-8') as f:
+                f.write("\n".join(lines) + "\n")
+        except OSError as e:
+            print(f"Warning: Cannot write sync log {self.log_path}: {e}")
+
+    def track(self, tasks: ObservableTaskList) -> None:
+        """Queue every later change of a task list while ``tracking`` is set."""
+        self.tracking = True
+        tasks.subscribe(lambda change: self._on_change(tasks, change))
+
+    def _on_change(self, tasks: ObservableTaskList, change: TaskChange) -> None:
+        if not self.tracking:
+            return
+        if change.kind in (INSERT, UPDATE):
+            indices = range(change.index, change.index + change.count)
+            self.mark([tasks[i].id for i in indices if tasks[i].id])
+        elif change.kind in (INSERT_MANY, UPDATE_MANY):
+            self.mark([tasks[i].id for i in change.indices if tasks[i].id])
+        elif change.kind == REMOVE:
+            if change.previous.id:
+                self.mark([change.previous.id], deleted=True)
+        elif change.kind == REMOVE_MANY:
+            self.mark([task.id for task in change.previous_tasks if task.id], deleted=True)
+
+    # -- network -------------------------------------------------------
+
+    def _fetch_since(self, table: str, columns: str, time_column: str) -> List[Dict[str, Any]]:
+        """Page through the user's rows changed after a table's watermark."""
+        rows: List[Dict[str, Any]] = []
+        watermark = self.watermarks.get(table)
+        while True:
+            query = self.client.table(table).select(columns).eq('user_id', self.user_id)
+            if watermark:
+                after, after_id = watermark
+                # Keyset on (time, id) so equal timestamps are not skipped
+                query = query.or_(f'{time_column}.gt."{after}",'
+                                  f'and({time_column}.eq."{after}",id.gt.{after_id})')
+            page = (query.order(time_column).order('id')
+                    .limit(self.page_size).execute().data)
+            rows.extend(page)
+            if len(page) < self.page_size:
+                return rows
+            watermark = [page[-1][time_column], page[-1]['id']]
+
+    def fetch(self) -> RemoteChanges:
+        """Pull rows and tombstones changed since the last sync (network only)."""
+        return RemoteChanges(
+            rows=self._fetch_since(TASKS_TABLE, ROW_COLUMNS, 'updated_at'),
+            tombstones=self._fetch_since(TOMBSTONES_TABLE, "id,deleted_at", 'deleted_at'),
+        )
+
+    def send(self, batch: PushBatch) -> None:
+        """Upsert changed rows and delete removed ones (network only)."""
+        for start in range(0, len(batch.rows), self.page_size):
+            self.client.table(TASKS_TABLE).upsert(
+                batch.rows[start:start + self.page_size], on_conflict='id').execute()
+        for start in range(0, len(batch.deleted), self.page_size):
+            self.client.table(TASKS_TABLE).delete().in_(
+                'id', batch.deleted[start:start + self.page_size]).execute()
+
+    # -- local steps ---------------------------------------------------
+
+    def ensure_ids(self, tasks: ObservableTaskList) -> List[dict]:
+        """
+        Give an id to every task that has none (tasks from before sync).
+
+        Returns:
+            Journal operations persisting the new ids
+        """
+        missing = [i for i, task in enumerate(tasks) if task.id is None]
+        if not missing:
+            return []
+        updated = [replace(tasks[i], id=str(uuid.uuid4())) for i in missing]
+        return apply_edit(tasks, Edit(UPDATE_EDIT, missing, updated))
+
+    def _local_wins(self, task_id: str, remote_time: str) -> bool:
+        """Tell whether a pending local change is newer than a remote one."""
+        entry = self.pending.get(task_id)
+        if entry is None:
+            return False
+        return _timestamp(entry['changed_at']) > _timestamp(remote_time)
+
+    def apply(self, tasks: ObservableTaskList, remote: RemoteChanges) -> SyncResult:
+        """
+        Merge pulled changes into the task list and advance the watermarks.
+
+        Args:
+            tasks: Local task list
+            remote: Result of ``fetch``
+
+        Returns:
+            Counts and the journal operations of the local changes made
+        """
+        result = SyncResult()
+        positions = {task.id: i for i, task in enumerate(tasks) if task.id}
+        updates: Dict[int, Task] = {}
+        deletes = set()
+        inserts: List[Task] = []
+
+        # Latest event per id, rows and tombstones together
+        latest: Dict[str, Tuple[str, Optional[Dict[str, Any]]]] = {}
+        for row in remote.rows:
+            latest[row['id']] = (row['updated_at'], row)
+        for tombstone in remote.tombstones:
+            previous = latest.get(tombstone['id'])
+            if previous is None or _timestamp(tombstone['deleted_at']) >= _timestamp(previous[0]):
+                latest[tombstone['id']] = (tombstone['deleted_at'], None)
+
+        # Everything that can fail on a bad row runs before any state changes
+        merged = []
+        for task_id, (remote_time, row) in latest.items():
+            if self._local_wins(task_id, remote_time):
+                result.conflicts += 1
+                continue
+            merged.append(task_id)
+            position = positions.get(task_id)
+            # Rows pushed by this device come back unchanged and are skipped
+            if row is None:
+                if position is not None:
+                    deletes.add(position)
+            else:
+                task = row_to_task(row)
+                if position is None:
+                    inserts.append(task)
+                elif tasks[position] != task:
+                    updates[position] = task
+        result.pulled = len(updates) + len(deletes) + len(inserts)
+        watermarks = {}
+        for table, rows, time_column in ((TASKS_TABLE, remote.rows, 'updated_at'),
+                                         (TOMBSTONES_TABLE, remote.tombstones, 'deleted_at')):
+            if rows:
+                last = max(rows, key=lambda r: (_timestamp(r[time_column]), r['id']))
+                watermarks[table] = [last[time_column], last['id']]
+
+        for task_id in merged:
+            self.pending.pop(task_id, None)
+
+        self.tracking, tracking = False, self.tracking
+        try:
+            if updates:
+                indices = sorted(updates)
+                result.operations += apply_edit(
+                    tasks, Edit(UPDATE_EDIT, indices, [updates[i] for i in indices]))
+            if deletes:
+                result.operations += apply_edit(tasks, Edit(DELETE_EDIT, sorted(deletes)))
+            if inserts:
+                start = len(tasks)
+                result.operations += apply_edit(
+                    tasks, Edit(INSERT_EDIT, list(range(start, start + len(inserts))), inserts))
+        finally:
+            self.tracking = tracking
+
+        self.watermarks.update(watermarks)
+        return result
+
+    def prepare_push(self, tasks: ObservableTaskList) -> PushBatch:
+        """
+        Capture the pending local changes to push.
+
+        Pending ids that are neither in the list nor deleted (e.g. a task
+        added and then undone before syncing) are pushed as deletions.
+        """
+        batch = PushBatch()
+        if not self.pending:
+            return batch
+        by_id = {task.id: task for task in tasks if task.id in self.pending}
+        for task_id, entry in self.pending.items():
+            batch.stamps[task_id] = entry['changed_at']
+            task = by_id.get(task_id)
+            if task is None or entry['deleted']:
+                batch.deleted.append(task_id)
+            else:
+                batch.rows.append(task_to_row(task, self.user_id))
+        return batch
+
+    def commit(self, batch: PushBatch) -> None:
+        """Drop pushed changes from the queue and save the state."""
+        for task_id, stamp in batch.stamps.items():
+            entry = self.pending.get(task_id)
+            if entry is not None and entry['changed_at'] == stamp:
+                del self.pending[task_id]
+        self._save_state()
+
+    def sync(self, tasks: ObservableTaskList) -> SyncResult:
+        """
+        Run a complete sync: pull, merge, push.
+
+        Args:
+            tasks: Local task list
+
+        Returns:
+            Counts and the journal operations of the local changes made
+        """
+        operations = self.ensure_ids(tasks)
+        result = self.apply(tasks, self.fetch())
+        result.operations = operations + result.operations
+        batch = self.prepare_push(tasks)
+        self.send(batch)
+        result.pushed = len(batch.rows) + len(batch.deleted)
+        self.commit(batch)
+        return result
+
+
+def connect(url: str, key: str, email: str, password: str) -> Tuple[Any, str]:
+    """
+    Sign in to Supabase.
+
+    Returns:
+        (client, user_id)
+    """
+    from supabase import create_client
+
+    client = create_client(url, key)
+    response = client.auth.sign_in_with_password({"email": email, "password": password})
+    return client, response.user.id
+
+
+def config_from_env() -> Optional[Dict[str, str]]:
+    """
+    Read the sync settings from the environment.
+
+    Uses SUPABASE_URL, SUPABASE_KEY, SUPABASE_EMAIL and SUPABASE_PASSWORD.
+
+    Returns:
+        The settings, or None if sync is not configured
+    """
+    names = {'url': "SUPABASE_URL", 'key': "SUPABASE_KEY",
+             'email': "SUPABASE_EMAIL", 'password': "SUPABASE_PASSWORD"}
+    config = {name: os.environ.get(var, "") for name, var in names.items()}
+    return config if all(config.values()) else None
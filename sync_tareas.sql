@@ -0,0 +1,49 @@
+-- Script para sincronizar la app de escritorio con la tabla tareas (ver sync.py)
+-- Ejecuta este script en el SQL Editor de Supabase
+
+-- 1. Categoría por defecto para las tareas creadas desde el escritorio
+ALTER TABLE tareas ALTER COLUMN categoria SET DEFAULT '⚡ Otro';
+
+-- 2. Tabla de tareas eliminadas, para que los demás dispositivos se enteren
+CREATE TABLE IF NOT EXISTS tareas_eliminadas (
+    id UUID PRIMARY KEY,
+    user_id UUID REFERENCES auth.users(id) ON DELETE CASCADE NOT NULL,
+    deleted_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()
+);
+
+ALTER TABLE tareas_eliminadas ENABLE ROW LEVEL SECURITY;
+
+CREATE POLICY "Users can view own deleted tasks" ON tareas_eliminadas
+    FOR SELECT USING (auth.uid() = user_id);
+
+-- 3. Registrar cada tarea eliminada (y olvidarla si vuelve a crearse)
+CREATE OR REPLACE FUNCTION registrar_tarea_eliminada()
+RETURNS TRIGGER AS $$
+BEGIN
+    INSERT INTO tareas_eliminadas (id, user_id, deleted_at)
+    VALUES (OLD.id, OLD.user_id, NOW())
+    ON CONFLICT (id) DO UPDATE SET deleted_at = EXCLUDED.deleted_at;
+    RETURN OLD;
+END;
+$$ language 'plpgsql' SECURITY DEFINER;
+
+CREATE OR REPLACE FUNCTION olvidar_tarea_eliminada()
+RETURNS TRIGGER AS $$
+BEGIN
+    DELETE FROM tareas_eliminadas WHERE id = NEW.id;
+    RETURN NEW;
+END;
+$$ language 'plpgsql' SECURITY DEFINER;
+
+CREATE TRIGGER registrar_tareas_eliminadas
+    AFTER DELETE ON tareas
+    FOR EACH ROW EXECUTE FUNCTION registrar_tarea_eliminada();
+
+CREATE TRIGGER olvidar_tareas_eliminadas
+    AFTER INSERT ON tareas
+    FOR EACH ROW EXECUTE FUNCTION olvidar_tarea_eliminada();
+
+-- 4. Índices para leer solo lo que cambió desde la última sincronización
+CREATE INDEX IF NOT EXISTS idx_tareas_user_updated ON tareas(user_id, updated_at, id);
+CREATE INDEX IF NOT EXISTS idx_tareas_eliminadas_user_deleted
+    ON tareas_eliminadas(user_id, deleted_at, id);
@@ -0,0 +1,288 @@
+"""
+Virtualized list widget for large task lists.
+
+Only the rows that fit in the viewport exist as widgets. Scrolling moves a
+window over the data and re-renders the same pool of rows, so drawing costs
+O(visible rows) no matter how many tasks there are.
+"""
+
+import math
+import tkinter as tk
+import tkinter.font as tkfont
+from typing import Callable, Optional, Set, Tuple
+
+
+# (text, background, foreground) of one row
+RowStyle = Tuple[str, str, str]
+
+SELECT_BG = '#3498db'
+SELECT_FG = 'white'
+EMPTY_BG = 'white'
+
+
+class VirtualTaskList(tk.Frame):
+    """
+    Scrollable list that renders rows on demand.
+
+    Rows are produced by a ``render(index)`` callback returning the row's
+    text and colors. Call ``set_count`` when the number of rows changes and
+    ``refresh`` or ``refresh_row`` when their contents change. Double-click
+    (or Return) on a row generates ``<<RowActivated>>``; the row is the
+    current selection.
+
+    With ``selectmode='extended'`` Ctrl+click toggles rows, Shift+click
+    selects a range and Ctrl+A selects every row, like an extended
+    ``Listbox``.
+    """
+
+    def __init__(self, master: tk.Misc, render: Callable[[int], RowStyle],
+                 height: int = 12, font: tuple = ("Arial", 10),
+                 selectmode: str = 'browse', **kwargs):
+        """
+        Initialize the list.
+
+        Args:
+            master: Parent widget
+            render: Callback returning (text, bg, fg) for a row index
+            height: Initial height in rows
+            font: Font of the rows
+            selectmode: 'browse' (single row) or 'extended'
+            **kwargs: Frame options (relief, borderwidth, ...)
+        """
+        super().__init__(master, **kwargs)
+        self._render = render
+        self._font = font
+        self._row_height = tkfont.Font(font=font).metrics('linespace') + 4
+        self._count = 0
+        self._top = 0
+        self._visible = height
+        self._extended = selectmode == 'extended'
+        self._selected: Set[int] = set()
+        # Row that keyboard moves and Shift+click ranges start from
+        self._anchor: Optional[int] = None
+        self._rows: list = []
+
+        self._scrollbar = tk.Scrollbar(self, command=self._on_scrollbar)
+        self._scrollbar.pack(side='right', fill='y')
+        self._body = tk.Frame(self, bg=EMPTY_BG, height=height * self._row_height,
+                              takefocus=1)
+        self._body.pack(side='left', fill='both', expand=True)
+
+        self._body.bind('<Configure>', self._on_resize)
+        self._bind_row_events(self._body)
+        self._body.bind('<Up>', lambda e: self._move_selection(-1))
+        self._body.bind('<Down>', lambda e: self._move_selection(1))
+        self._body.bind('<Return>', lambda e: self._activate())
+        if self._extended:
+            self._body.bind('<Control-a>', lambda e: self.selection_all())
+
+    def _bind_row_events(self, widget: tk.Misc) -> None:
+        """Route clicks and the mouse wheel of a widget to the list."""
+        widget.bind('<Button-1>', self._on_click)
+        widget.bind('<Double-Button-1>', lambda e: self._activate())
+        if self._extended:
+            widget.bind('<Control-Button-1>', lambda e: self._on_click(e, toggle=True))
+            widget.bind('<Shift-Button-1>', lambda e: self._on_click(e, extend=True))
+        widget.bind('<MouseWheel>', self._on_mousewheel)
+        widget.bind('<Button-4>', lambda e: self.scroll(-3))
+        widget.bind('<Button-5>', lambda e: self.scroll(3))
+
+    def _ensure_rows(self) -> None:
+        """Grow the pool of row widgets to cover the viewport."""
+        while len(self._rows) < self._visible:
+            label = tk.Label(self._body, anchor='w', font=self._font,
+                             padx=4, bg=EMPTY_BG)
+            label.place(x=0, y=len(self._rows) * self._row_height,
+                        relwidth=1, height=self._row_height)
+            self._bind_row_events(label)
+            self._rows.append(label)
+
+    def _on_resize(self, event: tk.Event) -> None:
+        visible = max(1, math.ceil(event.height / self._row_height))
+        if visible != self._visible or not self._rows:
+            self._visible = visible
+            self._ensure_rows()
+            self._set_top(self._top)
+            self.refresh()
+
+    def set_count(self, count: int) -> None:
+        """
+        Set the number of rows and redraw the visible ones.
+
+        Args:
+            count: Total number of rows
+        """
+        self._count = count
+        self._selected = {row for row in self._selected if row < count}
+        if self._anchor is not None and self._anchor >= count:
+            self._anchor = None
+        self._set_top(self._top)
+        self.refresh()
+
+    def refresh(self) -> None:
+        """Re-render every visible row."""
+        for slot in range(len(self._rows)):
+            self._draw(slot)
+        self._update_scrollbar()
+
+    def refresh_row(self, index: int) -> None:
+        """Re-render one row if it is visible."""
+        slot = index - self._top
+        if 0 <= slot < len(self._rows):
+            self._draw(slot)
+
+    def rows_inserted(self, index: int, count: int = 1) -> None:
+        """
+        Account for rows inserted at a position.
+
+        Only rows from ``index`` down to the end of the viewport are
+        redrawn; inserts below the viewport just update the scrollbar.
+        """
+        self._count += count
+        self._selected = {row + count if row >= index else row for row in self._selected}
+        if self._anchor is not None and self._anchor >= index:
+            self._anchor += count
+        self._redraw_from(index)
+
+    def rows_removed(self, index: int, count: int = 1) -> None:
+        """Account for rows removed at a position, like ``rows_inserted``."""
+        self._count -= count
+        self._selected = {row - count if row >= index + count else row
+                          for row in self._selected if not index <= row < index + count}
+        if self._anchor is not None and self._anchor >= index:
+            self._anchor = (None if self._anchor < index + count
+                            else self._anchor - count)
+        top = self._top
+        self._set_top(self._top)
+        self._redraw_from(index if self._top == top else self._top)
+
+    def _redraw_from(self, index: int) -> None:
+        """Redraw the visible rows at or after an index."""
+        for slot in range(max(0, index - self._top), len(self._rows)):
+            self._draw(slot)
+        self._update_scrollbar()
+
+    def _draw(self, slot: int) -> None:
+        label = self._rows[slot]
+        index = self._top + slot
+        if index >= self._count:
+            label.configure(text="", bg=EMPTY_BG)
+            return
+        text, bg, fg = self._render(index)
+        if index in self._selected:
+            bg, fg = SELECT_BG, SELECT_FG
+        label.configure(text=text, bg=bg, fg=fg)
+
+    def _full_rows(self) -> int:
+        """Rows entirely visible in the viewport."""
+        height = self._body.winfo_height()
+        if height <= 1:
+            return self._visible
+        return max(1, height // self._row_height)
+
+    def _set_top(self, top: int) -> None:
+        self._top = max(0, min(top, self._count - self._full_rows()))
+
+    def _update_scrollbar(self) -> None:
+        if self._count == 0:
+            self._scrollbar.set(0, 1)
+            return
+        first = self._top / self._count
+        last = min(1.0, (self._top + self._full_rows()) / self._count)
+        self._scrollbar.set(first, last)
+
+    def scroll(self, rows: int) -> None:
+        """Scroll by a number of rows (negative scrolls up)."""
+        top = self._top
+        self._set_top(self._top + rows)
+        if self._top != top:
+            self.refresh()
+
+    def see(self, index: int) -> None:
+        """Scroll so that a row is visible."""
+        full = self._full_rows()
+        if index < self._top:
+            self.scroll(index - self._top)
+        elif index >= self._top + full:
+            self.scroll(index - self._top - full + 1)
+
+    def _on_scrollbar(self, action: str, *args) -> None:
+        if action == 'moveto':
+            top = self._top
+            self._set_top(int(float(args[0]) * self._count))
+            if self._top != top:
+                self.refresh()
+        elif action == 'scroll':
+            amount = int(args[0])
+            if args[1] == 'pages':
+                amount *= self._full_rows()
+            self.scroll(amount)
+
+    def _on_mousewheel(self, event: tk.Event) -> None:
+        # Windows reports multiples of 120, macOS small deltas
+        step = event.delta // 120 if abs(event.delta) >= 120 else event.delta
+        self.scroll(-3 * step if step else 0)
+
+    def _on_click(self, event: tk.Event, toggle: bool = False,
+                  extend: bool = False) -> str:
+        self._body.focus_set()
+        if event.widget is self._body:
+            return "break"
+        index = self._top + self._rows.index(event.widget)
+        if index >= self._count:
+            return "break"
+        if toggle:
+            self._selected ^= {index}
+            self._anchor = index
+            self.refresh_row(index)
+        elif extend and self._anchor is not None:
+            low, high = sorted((self._anchor, index))
+            self._selected = set(range(low, high + 1))
+            self.refresh()
+        else:
+            self.selection_set(index)
+        # Keep the plain <Button-1> binding from running after a modified click
+        return "break"
+
+    def _move_selection(self, step: int) -> None:
+        if not self._count:
+            return
+        index = 0 if self._anchor is None else self._anchor + step
+        self.selection_set(max(0, min(index, self._count - 1)))
+        self.see(self._anchor)
+
+    def _activate(self) -> None:
+        if self._selected:
+            self.event_generate('<<RowActivated>>')
+
+    def curselection(self) -> Tuple[int, ...]:
+        """Selected row indices in ascending order, like ``Listbox.curselection``."""
+        return tuple(sorted(self._selected))
+
+    def selection_set(self, index: int) -> None:
+        """Select a single row."""
+        previous = self._selected
+        self._selected = {index}
+        self._anchor = index
+        if len(previous) > 1:
+            self.refresh()
+            return
+        for row in previous:
+            self.refresh_row(row)
+        self.refresh_row(index)
+
+    def selection_all(self) -> None:
+        """Select every row."""
+        self._selected = set(range(self._count))
+        self.refresh()
+
+    def selection_clear(self) -> None:
+        """Clear the selection."""
+        previous = self._selected
+        self._selected = set()
+        self._anchor = None
+        if len(previous) > 1:
+            self.refresh()
+            return
+        for row in previous:
+            self.refresh_row(row)
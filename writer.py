@@ -0,0 +1,180 @@
+"""
+Background writer that persists task mutations off the UI thread.
+"""
+
+import queue
+import threading
+import time
+from typing import List, Optional
+
+from storage import InvalidOperationError, append_operations
+
+
+class BackgroundWriter:
+    """
+    Coalesce journal operations and write them on a worker thread.
+
+    Operations submitted within ``delay`` seconds of each other are written
+    together with a single append, so a burst of clicks produces one write.
+    A continuous stream of submissions is still flushed at least every
+    ``max_delay`` seconds. Failures are queued and can be collected from
+    the UI thread with ``poll_errors``.
+    """
+
+    def __init__(self, filename: str = "tareas.json", delay: float = 0.3,
+                 max_delay: float = 2.0):
+        """
+        Initialize and start the writer thread.
+
+        Args:
+            filename: Path to the JSON snapshot file
+            delay: Quiet period (seconds) that ends a burst of mutations
+            max_delay: Longest time (seconds) an operation may stay queued
+        """
+        self.filename = filename
+        self.delay = delay
+        self.max_delay = max_delay
+
+        self._pending: List[dict] = []
+        self._first_pending_at = 0.0
+        self._last_pending_at = 0.0
+        self._writing = False
+        self._closed = False
+        self._flush_requested = False
+        self._retry_blocked = False
+        self._condition = threading.Condition()
+        self._errors: "queue.Queue[str]" = queue.Queue()
+
+        self._thread = threading.Thread(target=self._run, name="task-writer",
+                                        daemon=True)
+        self._thread.start()
+
+    def submit(self, operation: dict) -> None:
+        """Queue one journal operation for writing."""
+        self.submit_many([operation])
+
+    def submit_many(self, operations: List[dict]) -> None:
+        """Queue several journal operations, preserving their order."""
+        if not operations:
+            return
+        with self._condition:
+            if self._closed:
+                raise RuntimeError("writer is closed")
+            now = time.monotonic()
+            if not self._pending:
+                self._first_pending_at = now
+            self._last_pending_at = now
+            self._retry_blocked = False
+            self._pending.extend(operations)
+            self._condition.notify_all()
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """
+        Write queued operations now and wait until they are on disk.
+
+        Args:
+            timeout: Maximum seconds to wait, or None to wait indefinitely
+
+        Returns:
+            True if nothing is left queued or being written
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._condition:
+            self._flush_requested = True
+            self._retry_blocked = False
+            self._condition.notify_all()
+            while self._pending or self._writing:
+                if self._retry_blocked and not self._writing:
+                    break
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._condition.wait(remaining)
+                if not self._thread.is_alive():
+                    break
+            return not (self._pending or self._writing)
+
+    def close(self, timeout: Optional[float] = None) -> bool:
+        """
+        Flush queued operations and stop the writer thread.
+
+        Args:
+            timeout: Maximum seconds to wait, or None to wait indefinitely
+
+        Returns:
+            True if every queued operation was written
+        """
+        flushed = self.flush(timeout)
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+        self._thread.join(timeout)
+        return flushed
+
+    def poll_errors(self) -> List[str]:
+        """Return (and clear) the error messages reported since the last call."""
+        errors = []
+        while True:
+            try:
+                errors.append(self._errors.get_nowait())
+            except queue.Empty:
+                return errors
+
+    def _run(self) -> None:
+        """Writer thread main loop."""
+        while True:
+            with self._condition:
+                batch = self._wait_for_batch()
+                if batch is None:
+                    return
+                self._writing = True
+
+            invalid = None
+            try:
+                ok = append_operations(batch, self.filename)
+            except InvalidOperationError as e:
+                # Permanent: the valid operations are saved and the invalid
+                # ones would fail again, so nothing is requeued
+                ok, invalid = True, e
+
+            with self._condition:
+                self._writing = False
+                if invalid is not None:
+                    self._errors.put(f"Se descartaron {len(invalid.operations)} cambios inválidos "
+                                     f"al guardar en {self.filename}.")
+                if not ok:
+                    # Keep the operations; they are retried with the next
+                    # submission or flush instead of in a tight loop
+                    self._pending[:0] = batch
+                    self._retry_blocked = True
+                    self._errors.put(f"No se pudieron guardar las tareas en {self.filename}.")
+                self._condition.notify_all()
+
+    def _wait_for_batch(self) -> Optional[List[dict]]:
+        """
+        Block until a batch is due; must be called with the lock held.
+
+        Returns:
+            The operations to write, or None when the writer is shutting down
+        """
+        while True:
+            if self._closed and (not self._pending or self._retry_blocked):
+                return None
+
+            if self._pending and (self._flush_requested or self._closed):
+                break
+
+            if self._pending and not self._retry_blocked:
+                now = time.monotonic()
+                due = min(self._last_pending_at + self.delay,
+                          self._first_pending_at + self.max_delay)
+                if now >= due:
+                    break
+                self._condition.wait(due - now)
+            else:
+                self._condition.wait()
+
+        self._flush_requested = False
+        batch, self._pending = self._pending, []
+        return batch
+